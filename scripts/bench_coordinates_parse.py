@@ -0,0 +1,92 @@
+"""Measure peak memory of parsing coordinates responses for one sweep.
+
+Usage:
+    PYTHONPATH=src python scripts/bench_coordinates_parse.py [--tiles 20] [--hits 10000]
+
+Compares the previous path (``json.loads`` of the whole body, a list of
+tuples per tile, then a dict of every id) with ``CoordinateHitDecoder``
+feeding 64 KB chunks into ``CoordinateColumns``. Peak is the tracemalloc
+high-water mark above the raw response bytes, which both paths share.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+import tracemalloc
+from collections.abc import Callable
+
+from rpaquintoandar.infrastructure.api.coordinates_stream import CoordinateHitDecoder
+from rpaquintoandar.shared.coordinate_columns import CoordinateColumns
+
+CHUNK_SIZE = 65536
+
+
+def make_body(tile: int, hits: int) -> bytes:
+    return json.dumps(
+        {
+            "hits": {
+                "total": {"value": hits, "relation": "eq"},
+                "hits": [
+                    {
+                        "_id": str(890_000_000 + tile * hits + i),
+                        "_source": {"location": {"lat": -23.5 - i * 1e-5, "lon": -46.6 - i * 1e-5}},
+                    }
+                    for i in range(hits)
+                ],
+            }
+        }
+    ).encode()
+
+
+def parse_whole(bodies: list[bytes]) -> object:
+    seen: dict[str, tuple[float, float]] = {}
+    for body in bodies:
+        data = json.loads(body)
+        result = []
+        for hit in data["hits"]["hits"]:
+            location = hit["_source"]["location"]
+            result.append((str(hit["_id"]), location["lat"], location["lon"]))
+        for source_id, lat, lon in result:
+            seen.setdefault(source_id, (lat, lon))
+    return [(sid, lat, lon) for sid, (lat, lon) in seen.items()]
+
+
+def parse_streaming(bodies: list[bytes]) -> object:
+    columns = CoordinateColumns()
+    for body in bodies:
+        decoder = CoordinateHitDecoder(columns.add)
+        for start in range(0, len(body), CHUNK_SIZE):
+            decoder.feed(body[start : start + CHUNK_SIZE])
+        decoder.close()
+    return columns
+
+
+def measure(name: str, parse: Callable[[list[bytes]], object], bodies: list[bytes]) -> None:
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = parse(bodies)
+    elapsed = time.perf_counter() - started
+    held, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    ids = len(result)  # type: ignore[arg-type]
+    print(
+        f"{name:>22}: peak {peak / 1e6:7.1f} MB, held {held / ids:6.1f} B/id, "
+        f"{elapsed:5.2f}s for {ids} ids"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tiles", type=int, default=20)
+    parser.add_argument("--hits", type=int, default=10_000)
+    args = parser.parse_args()
+
+    bodies = [make_body(tile, args.hits) for tile in range(args.tiles)]
+    measure("json.loads + dict", parse_whole, bodies)
+    measure("streamed columns", parse_streaming, bodies)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""Measure memory and lookup cost of duplicate-check structures for 1M hashes.
+
+Usage:
+    PYTHONPATH=src python scripts/bench_hash_index.py [--hashes 1000000]
+
+Compares a set of hex strings (what ``ContentHash`` holds), a set of
+32-byte digests, and ``ContentHashIndex`` (sorted 64-bit prefixes).
+Memory is the tracemalloc delta while building each structure.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import time
+import tracemalloc
+from collections.abc import Callable
+
+from rpaquintoandar.infrastructure.persistence.content_hash_index import (
+    ContentHashIndex,
+    hash_key,
+)
+
+
+def measure(name: str, build: Callable[[], object], contains: Callable[[object, str], bool],
+            probes: list[str]) -> None:
+    tracemalloc.start()
+    structure = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    started = time.perf_counter()
+    for probe in probes:
+        contains(structure, probe)
+    per_lookup = (time.perf_counter() - started) / len(probes)
+    print(f"{name:>22}: {size / 1e6:8.1f} MB, {per_lookup * 1e6:6.2f} us/lookup")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--hashes", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    hexes = [hashlib.sha256(str(i).encode()).hexdigest() for i in range(args.hashes)]
+    probes = hexes[:50_000] + [hashlib.sha256(f"x{i}".encode()).hexdigest() for i in range(50_000)]
+
+    def build_index() -> ContentHashIndex:
+        index = ContentHashIndex()
+        index.load(hash_key(h) for h in hexes)
+        return index
+
+    measure("set[str] (hex)", lambda: {h.encode().decode() for h in hexes},
+            lambda s, p: p in s, probes)
+    measure("set[bytes] (digest)", lambda: {bytes.fromhex(h) for h in hexes},
+            lambda s, p: bytes.fromhex(p) in s, probes)
+    measure("ContentHashIndex", build_index, lambda s, p: s.might_contain(p), probes)
+
+
+if __name__ == "__main__":
+    main()
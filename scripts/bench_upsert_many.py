@@ -0,0 +1,74 @@
+"""Benchmark SqliteListingRepo.upsert_many against the old per-row loop.
+
+Usage:
+    PYTHONPATH=src python scripts/bench_upsert_many.py [--rows 10000]
+
+Each variant inserts ``--rows`` new listings into a fresh WAL database,
+then re-submits the same batch (all conflicts), and reports rows/second
+for both passes.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+
+from rpaquintoandar.domain.entities import Listing
+from rpaquintoandar.infrastructure.persistence.database_manager import DatabaseManager
+from rpaquintoandar.infrastructure.persistence.sqlite_listing_repo import SqliteListingRepo
+
+
+async def legacy_upsert_many(repo: SqliteListingRepo, listings: list[Listing]) -> int:
+    """The pre-bulk implementation: SELECT, then upsert (SELECT + INSERT + commit) per row."""
+    created = 0
+    for listing in listings:
+        existing = await repo.get_by_source_id(listing.source_id)
+        if not existing:
+            await repo.upsert(listing)
+            created += 1
+    return created
+
+
+def make_listings(count: int) -> list[Listing]:
+    return [
+        Listing(
+            source_id=str(890000000 + i),
+            source_url=f"https://www.quintoandar.com.br/imovel/{890000000 + i}",
+        )
+        for i in range(count)
+    ]
+
+
+async def run_variant(name: str, rows: int, workdir: Path) -> None:
+    db = DatabaseManager(str(workdir / f"{name}.db"))
+    await db.initialize()
+    repo = SqliteListingRepo(db)
+    upsert = repo.upsert_many if name == "bulk" else (lambda ls: legacy_upsert_many(repo, ls))
+
+    for label in ("insert", "conflict"):
+        listings = make_listings(rows)
+        started = time.perf_counter()
+        created = await upsert(listings)
+        elapsed = time.perf_counter() - started
+        print(
+            f"{name:>7} {label:>8}: {rows} rows, {created} new, "
+            f"{elapsed:8.3f}s, {rows / elapsed:10.0f} rows/s"
+        )
+    await db.close()
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in ("legacy", "bulk"):
+            await run_variant(name, args.rows, Path(tmp))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -4,6 +4,8 @@
 # Usage:
 #   bash scripts/run.sh --mode full-crawl --target 1000
 #   bash scripts/run.sh --mode resume
+#   bash scripts/run.sh --mode refresh
+#   bash scripts/run.sh --mode reprocess
 #   bash scripts/run.sh --mode test-search
 #   bash scripts/run.sh --mode test-listing --listing-id 893456789
 #   bash scripts/run.sh --mode full-crawl --city "Rio de Janeiro" --no-headless
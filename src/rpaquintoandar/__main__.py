@@ -11,9 +11,12 @@ from rpaquintoandar.shared.di_container import Container
 from rpaquintoandar.shared.logging_config import setup_logging
 from rpaquintoandar.works import (
     FullCrawlWork,
+    RefreshWork,
+    ReprocessWork,
     ResumeWork,
     SingleListingTestWork,
     SinglePageTestWork,
+    StatsWork,
 )
 
 logger = logging.getLogger(__name__)
@@ -26,7 +29,15 @@ def parse_args() -> argparse.Namespace:
     )
     parser.add_argument(
         "--mode",
-        choices=["full-crawl", "resume", "test-search", "test-listing"],
+        choices=[
+            "full-crawl",
+            "resume",
+            "refresh",
+            "reprocess",
+            "stats",
+            "test-search",
+            "test-listing",
+        ],
         default="full-crawl",
         help="Execution mode (default: full-crawl)",
     )
@@ -68,6 +79,23 @@ def parse_args() -> argparse.Namespace:
         default=None,
         help="Target number of listings for segmented search (enables neighborhood segmentation)",
     )
+    parser.add_argument(
+        "--runs",
+        type=int,
+        default=5,
+        help="Number of recent runs compared by stats mode (default: 5)",
+    )
+    parser.add_argument(
+        "--profile",
+        choices=["cprofile", "sampling", "tracemalloc"],
+        default=None,
+        help="Profile each pipeline step into data/profiles/<run_id>/ (overrides config)",
+    )
+    parser.add_argument(
+        "--streaming",
+        action="store_true",
+        help="full-crawl: extract and export listings while search is still running",
+    )
     return parser.parse_args()
 
 
@@ -93,10 +121,12 @@ async def run(args: argparse.Namespace) -> None:
 
     if args.no_headless:
         settings.browser.headless = False
+    if args.profile:
+        settings.profiling.mode = args.profile
 
     container = Container(settings)
 
-    needs_db = args.mode in ("full-crawl", "resume")
+    needs_db = args.mode in ("full-crawl", "resume", "refresh", "reprocess", "stats")
     if needs_db:
         await container.initialize()
 
@@ -113,12 +143,19 @@ async def run(args: argparse.Namespace) -> None:
             work = SingleListingTestWork(container, args.listing_id)
         elif args.mode == "resume":
             work = ResumeWork(container)
+        elif args.mode == "refresh":
+            work = RefreshWork(container)
+        elif args.mode == "reprocess":
+            work = ReprocessWork(container)
+        elif args.mode == "stats":
+            work = StatsWork(container, runs=args.runs)
         else:
             target = args.target or settings.search.target_count
             work = FullCrawlWork(
                 container, criteria,
                 max_pages=args.max_pages,
                 target_count=target if target > 0 else None,
+                streaming=args.streaming or settings.scraping.streaming,
             )
 
         await work.execute()
@@ -1,4 +1,4 @@
-from .extract_result import ExtractResult
+from .extract_result import ExtractResult, WorkerStats
 from .search_result import SearchResult
 
-__all__ = ["ExtractResult", "SearchResult"]
+__all__ = ["ExtractResult", "SearchResult", "WorkerStats"]
@@ -1,6 +1,19 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+
+
+@dataclass(slots=True)
+class WorkerStats:
+    worker_id: int
+    processed: int = 0
+    elapsed_seconds: float = 0.0
+
+    @property
+    def items_per_second(self) -> float:
+        if self.elapsed_seconds <= 0:
+            return 0.0
+        return self.processed / self.elapsed_seconds
 
 
 @dataclass(slots=True)
@@ -8,4 +21,6 @@ class ExtractResult:
     total_processed: int = 0
     enriched: int = 0
     duplicates: int = 0
+    unchanged: int = 0
     failed: int = 0
+    workers: list[WorkerStats] = field(default_factory=list)
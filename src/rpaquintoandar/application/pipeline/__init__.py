@@ -1,6 +1,13 @@
 from .pipeline_context import PipelineContext
 from .pipeline_runner import PipelineRunner
 from .step_options import StepOptions
-from .step_protocol import IStep
+from .step_protocol import IStep, IStreamingStep, iter_queue
 
-__all__ = ["IStep", "PipelineContext", "PipelineRunner", "StepOptions"]
+__all__ = [
+    "IStep",
+    "IStreamingStep",
+    "PipelineContext",
+    "PipelineRunner",
+    "StepOptions",
+    "iter_queue",
+]
@@ -1,75 +1,223 @@
 from __future__ import annotations
 
+import asyncio
 import logging
-from typing import TYPE_CHECKING
+from contextlib import AbstractContextManager, nullcontext
+from typing import TYPE_CHECKING, Any
 
 from rpaquintoandar.domain.entities import ExecutionRun, StepRecord
 from rpaquintoandar.domain.enums import StepStatus
+from rpaquintoandar.shared.perf_metrics import PhaseRecorder, recording
+from rpaquintoandar.shared.profiling import ProfileSession
 
 if TYPE_CHECKING:
     from rpaquintoandar.application.pipeline.pipeline_context import PipelineContext
-    from rpaquintoandar.application.pipeline.step_protocol import IStep
+    from rpaquintoandar.application.pipeline.step_protocol import IStep, IStreamingStep
+    from rpaquintoandar.domain.interfaces import IExecutionRepository
+    from rpaquintoandar.domain.value_objects import StepResult
 
 logger = logging.getLogger(__name__)
 
 
 class PipelineRunner:
-    def __init__(self, steps: list[IStep]) -> None:
+    """Runs steps one after another, or all at once when ``streaming``.
+
+    In streaming mode consecutive steps are connected by bounded queues
+    (``queue_size`` items) and every step runs its ``stream`` method
+    concurrently, so a slow consumer blocks its producer instead of
+    letting items pile up. Each stage still gets its own step record,
+    finished when that stage completes. A failing stage cancels the
+    stages still running, as a failing step ends a sequential run.
+
+    Timings recorded with ``shared.perf_metrics.phase`` while a step runs
+    are summarized into ``step_metrics`` rows when it finishes.
+
+    With ``settings.profiling.mode`` set, each step is profiled into
+    ``<profiling.output_dir>/<run_id>/``. Streaming stages interleave on
+    one event loop, so a streaming run is profiled as a whole.
+    """
+
+    def __init__(
+        self,
+        steps: list[IStep],
+        streaming: bool = False,
+        queue_size: int = 64,
+    ) -> None:
         self._steps = steps
+        self._streaming = streaming
+        self._queue_size = max(1, queue_size)
+        self._profiler: ProfileSession | None = None
 
     async def run(self, context: PipelineContext) -> None:
         execution_repo = context.container.execution_repo()
         run = ExecutionRun(mode=context.metadata.get("mode", "pipeline"))
         run = await execution_repo.create_run(run)
         assert run.id is not None
+        self._profiler = ProfileSession.from_settings(
+            context.container.settings.profiling, run.id
+        )
 
+        if self._streaming:
+            with self._profiled("streaming"):
+                overall_status = await self._run_streaming(context, run.id, execution_repo)
+        else:
+            overall_status = await self._run_sequential(context, run.id, execution_repo)
+
+        run.finish(overall_status)
+        await execution_repo.update_run(run)
+        logger.info("Pipeline finished with status: %s", overall_status)
+
+    async def _run_sequential(
+        self, context: PipelineContext, run_id: int, execution_repo: IExecutionRepository
+    ) -> StepStatus:
         overall_status = StepStatus.SUCCEEDED
 
         for step in self._steps:
             logger.info("Starting step: %s", step.name)
             step_record = StepRecord(
-                execution_run_id=run.id,
+                execution_run_id=run_id,
                 step_name=step.name,
             )
             step_record = await execution_repo.create_step(step_record)
+            recorder = PhaseRecorder()
 
             try:
-                result = await step.execute(context)
-                context.add_result(step.name, result)
-
-                step_record.items_processed = result.items_processed
-                step_record.items_created = result.items_created
-                step_record.items_failed = result.items_failed
-
-                if result.has_errors:
-                    step_record.error_message = "; ".join(
-                        e.message for e in result.errors
-                    )
-                    step_record.finish(StepStatus.FAILED)
-                    overall_status = StepStatus.FAILED
-                    logger.error(
-                        "Step %s failed: %s", step.name, step_record.error_message
-                    )
-                else:
-                    step_record.finish(StepStatus.SUCCEEDED)
-                    logger.info(
-                        "Step %s completed: processed=%d created=%d",
-                        step.name,
-                        result.items_processed,
-                        result.items_created,
-                    )
-
+                with recording(recorder), self._profiled(step.name):
+                    result = await step.execute(context)
+                self._record_result(context, step.name, step_record, result)
             except Exception as exc:
                 step_record.error_message = str(exc)
                 step_record.finish(StepStatus.FAILED)
-                overall_status = StepStatus.FAILED
                 logger.exception("Step %s raised an exception", step.name)
 
             await execution_repo.update_step(step_record)
+            await self._save_metrics(execution_repo, recorder, step_record)
 
             if step_record.status == StepStatus.FAILED:
+                overall_status = StepStatus.FAILED
                 break
 
-        run.finish(overall_status)
-        await execution_repo.update_run(run)
-        logger.info("Pipeline finished with status: %s", overall_status)
+        return overall_status
+
+    async def _run_streaming(
+        self, context: PipelineContext, run_id: int, execution_repo: IExecutionRepository
+    ) -> StepStatus:
+        steps: list[IStreamingStep] = []
+        for step in self._steps:
+            if not hasattr(step, "stream"):
+                raise TypeError(f"Step {step.name} does not support streaming")
+            steps.append(step)  # type: ignore[arg-type]
+
+        records = [
+            await execution_repo.create_step(StepRecord(execution_run_id=run_id, step_name=s.name))
+            for s in steps
+        ]
+        recorders = [PhaseRecorder() for _ in steps]
+        queues: list[asyncio.Queue[Any]] = [
+            asyncio.Queue(maxsize=self._queue_size) for _ in steps[1:]
+        ]
+
+        tasks: dict[asyncio.Task[StepResult], int] = {}
+        for i, step in enumerate(steps):
+            inbox = queues[i - 1] if i > 0 else None
+            outbox = queues[i] if i < len(queues) else None
+            task = asyncio.create_task(
+                self._run_stage(step, context, inbox, outbox, recorders[i]),
+                name=f"stage-{step.name}",
+            )
+            tasks[task] = i
+        logger.info("Streaming steps: %s", " -> ".join(s.name for s in steps))
+
+        overall_status = StepStatus.SUCCEEDED
+        failed_stage = ""
+        pending = set(tasks)
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                step, step_record = steps[tasks[task]], records[tasks[task]]
+                if task.cancelled():
+                    step_record.error_message = f"cancelled after {failed_stage} failed"
+                    step_record.finish(StepStatus.FAILED)
+                elif (exc := task.exception()) is not None:
+                    step_record.error_message = str(exc)
+                    step_record.finish(StepStatus.FAILED)
+                    logger.error("Step %s raised an exception", step.name, exc_info=exc)
+                else:
+                    self._record_result(context, step.name, step_record, task.result())
+                await execution_repo.update_step(step_record)
+                await self._save_metrics(execution_repo, recorders[tasks[task]], step_record)
+
+                if step_record.status == StepStatus.FAILED and not failed_stage:
+                    overall_status = StepStatus.FAILED
+                    failed_stage = step.name
+                    for other in pending:
+                        other.cancel()
+
+        return overall_status
+
+    def _profiled(self, name: str) -> AbstractContextManager[None]:
+        if self._profiler is None:
+            return nullcontext()
+        return self._profiler.profile(name)
+
+    @staticmethod
+    async def _run_stage(
+        step: IStreamingStep,
+        context: PipelineContext,
+        inbox: asyncio.Queue[Any] | None,
+        outbox: asyncio.Queue[Any] | None,
+        recorder: PhaseRecorder,
+    ) -> StepResult:
+        logger.info("Starting step: %s (streaming)", step.name)
+        with recording(recorder):
+            result = await step.stream(context, inbox, outbox)
+        if outbox is not None:
+            # End of stream for the next stage
+            await outbox.put(None)
+        return result
+
+    @staticmethod
+    def _record_result(
+        context: PipelineContext, name: str, step_record: StepRecord, result: StepResult
+    ) -> None:
+        context.add_result(name, result)
+
+        step_record.items_processed = result.items_processed
+        step_record.items_created = result.items_created
+        step_record.items_failed = result.items_failed
+
+        if result.has_errors:
+            step_record.error_message = "; ".join(e.message for e in result.errors)
+            step_record.finish(StepStatus.FAILED)
+            logger.error("Step %s failed: %s", name, step_record.error_message)
+        else:
+            step_record.finish(StepStatus.SUCCEEDED)
+            assert step_record.finished_at is not None
+            wall = (step_record.finished_at - step_record.started_at).total_seconds()
+            logger.info(
+                "Step %s completed: processed=%d created=%d wall=%.1fs (%.2f items/s)",
+                name,
+                result.items_processed,
+                result.items_created,
+                wall,
+                result.items_processed / wall if wall > 0 else 0.0,
+            )
+
+    @staticmethod
+    async def _save_metrics(
+        execution_repo: IExecutionRepository, recorder: PhaseRecorder, step_record: StepRecord
+    ) -> None:
+        metrics = recorder.summarize(
+            step_record.execution_run_id, step_record.step_name, step_record.id
+        )
+        for m in metrics:
+            logger.info(
+                "Step %s phase %s: n=%d p50=%.0fms p95=%.0fms p99=%.0fms",
+                m.step_name,
+                m.phase,
+                m.samples,
+                m.p50_ms,
+                m.p95_ms,
+                m.p99_ms,
+            )
+        await execution_repo.save_step_metrics(metrics)
@@ -1,14 +1,40 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Protocol
+import asyncio
+from collections.abc import AsyncIterator
+from typing import TYPE_CHECKING, Any, Protocol, TypeVar
 
 if TYPE_CHECKING:
     from rpaquintoandar.application.pipeline.pipeline_context import PipelineContext
     from rpaquintoandar.domain.value_objects import StepResult
 
+T = TypeVar("T")
+
 
 class IStep(Protocol):
     @property
     def name(self) -> str: ...
 
     async def execute(self, context: PipelineContext) -> StepResult: ...
+
+
+class IStreamingStep(IStep, Protocol):
+    async def stream(
+        self,
+        context: PipelineContext,
+        inbox: asyncio.Queue[Any] | None,
+        outbox: asyncio.Queue[Any] | None,
+    ) -> StepResult:
+        """Consume ``inbox`` until its ``None`` end marker, feeding ``outbox``.
+
+        The runner puts the end marker on ``outbox`` once this returns.
+        """
+        ...
+
+
+async def iter_queue(queue: asyncio.Queue[T | None] | None) -> AsyncIterator[T]:
+    """Yield items from an upstream stage until its ``None`` end marker."""
+    if queue is None:
+        return
+    while (item := await queue.get()) is not None:
+        yield item
@@ -1,5 +1,7 @@
 from .export_step import ExportStep
 from .extract_step import ExtractStep
+from .refresh_step import RefreshStep
+from .reprocess_step import ReprocessStep
 from .search_step import SearchStep
 
-__all__ = ["ExportStep", "ExtractStep", "SearchStep"]
+__all__ = ["ExportStep", "ExtractStep", "RefreshStep", "ReprocessStep", "SearchStep"]
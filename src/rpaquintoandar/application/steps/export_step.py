@@ -1,99 +1,214 @@
 from __future__ import annotations
 
+import asyncio
 import csv
 import json
 import logging
+import textwrap
 from pathlib import Path
+from typing import Any, TextIO
 
-from rpaquintoandar.application.pipeline import PipelineContext
-from rpaquintoandar.domain.enums import ErrorCategory, StepStatus
+from rpaquintoandar.application.pipeline import PipelineContext, iter_queue
+from rpaquintoandar.domain.entities import Listing
+from rpaquintoandar.domain.enums import ErrorCategory, ProcessingStatus, StepStatus
 from rpaquintoandar.domain.value_objects import ErrorInfo, StepResult
+from rpaquintoandar.shared.known_ids import KnownIdIndex
 
 logger = logging.getLogger(__name__)
 
 
+class _JsonArrayWriter:
+    """Writes the document ``json.dump(records, f, indent=2)`` would, one record at a time."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._tmp = path.with_suffix(path.suffix + ".tmp")
+        self._file: TextIO = open(self._tmp, "w", encoding="utf-8")
+        self._count = 0
+
+    def write(self, record: dict[str, Any]) -> None:
+        body = textwrap.indent(json.dumps(record, ensure_ascii=False, indent=2), "  ")
+        self._file.write(("[\n" if self._count == 0 else ",\n") + body)
+        self._count += 1
+
+    def close(self, commit: bool) -> None:
+        self._file.write("\n]" if self._count else "[]")
+        self._file.close()
+        if commit:
+            self._tmp.replace(self.path)
+        else:
+            self._tmp.unlink(missing_ok=True)
+
+
+class _CsvWriter:
+    LIST_FIELDS = ("amenities", "building_amenities", "unit_amenities", "images")
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._tmp = path.with_suffix(path.suffix + ".tmp")
+        self._file: TextIO = open(self._tmp, "w", encoding="utf-8", newline="")
+        self._writer: csv.DictWriter[str] | None = None
+
+    def write(self, record: dict[str, Any]) -> None:
+        flat = {**record}
+        for key in self.LIST_FIELDS:
+            flat[key] = json.dumps(flat[key])
+        if self._writer is None:
+            self._writer = csv.DictWriter(self._file, fieldnames=flat.keys())
+            self._writer.writeheader()
+        self._writer.writerow(flat)
+
+    def close(self, commit: bool) -> None:
+        self._file.close()
+        if commit:
+            self._tmp.replace(self.path)
+        else:
+            self._tmp.unlink(missing_ok=True)
+
+
+class _ExportSession:
+    """Writers for one export, opened on the first record."""
+
+    def __init__(self, output_dir: Path, formats: list[str]) -> None:
+        self._output_dir = output_dir
+        self._formats = formats
+        self._writers: list[_JsonArrayWriter | _CsvWriter] | None = None
+        self.exported = 0
+
+    def write(self, listing: Listing) -> None:
+        if self._writers is None:
+            self._output_dir.mkdir(parents=True, exist_ok=True)
+            self._writers = ExportStep._open_writers(self._output_dir, self._formats)
+        record = ExportStep._to_record(listing)
+        for writer in self._writers:
+            writer.write(record)
+        self.exported += 1
+
+    def close(self, commit: bool) -> None:
+        for writer in self._writers or []:
+            writer.close(commit=commit)
+        self._writers = None
+
+
 class ExportStep:
+    """Streams ENRICHED listings to the configured formats, one DB page at a time.
+
+    Output goes to ``<name>.tmp`` and is renamed into place only once the
+    export completes, so a failed run never leaves a truncated file.
+    """
+
     @property
     def name(self) -> str:
         return "export"
 
     async def execute(self, context: PipelineContext) -> StepResult:
+        return await self._export(context, inbox=None)
+
+    async def stream(
+        self,
+        context: PipelineContext,
+        inbox: asyncio.Queue[Any] | None,
+        outbox: asyncio.Queue[Any] | None,
+    ) -> StepResult:
+        """Write listings from ``inbox`` as they are enriched, then the rest from the DB."""
+        return await self._export(context, inbox)
+
+    async def _export(
+        self, context: PipelineContext, inbox: asyncio.Queue[Any] | None
+    ) -> StepResult:
         result = StepResult()
+        export_settings = context.container.settings.export
+        output_dir = Path(export_settings.output_dir)
+        session = _ExportSession(output_dir, export_settings.formats)
+        committed = False
         try:
             repo = context.container.listing_repo()
-            listings = await repo.get_enriched()
-            result.items_processed = len(listings)
 
-            if not listings:
+            streamed = KnownIdIndex()
+            async for listing in iter_queue(inbox):
+                session.write(listing)
+                streamed.add(listing.source_id)
+            if inbox is not None:
+                logger.info("Exported %d listings as they were enriched", session.exported)
+
+            # Everything else ENRICHED, e.g. from earlier runs
+            async for batch in repo.iter_by_status(
+                ProcessingStatus.ENRICHED, export_settings.batch_size
+            ):
+                for listing in batch:
+                    if listing.source_id not in streamed:
+                        session.write(listing)
+
+            session.close(commit=True)
+            committed = True
+
+            exported = session.exported
+            result.items_processed = exported
+            if not exported:
                 logger.info("No listings to export")
                 return result
-
-            output_dir = Path(context.container.settings.export.output_dir)
-            output_dir.mkdir(parents=True, exist_ok=True)
-            formats = context.container.settings.export.formats
-
-            records = [
-                {
-                    "source_id": l.source_id,
-                    "source_url": l.source_url,
-                    "property_type": l.property_type.value,
-                    "street": l.address.street,
-                    "number": l.address.number,
-                    "neighborhood": l.address.neighborhood,
-                    "city": l.address.city,
-                    "state": l.address.state,
-                    "zip_code": l.address.zip_code,
-                    "sale_price": l.price.sale_price,
-                    "condo_fee": l.price.condo_fee,
-                    "iptu": l.price.iptu,
-                    "area_m2": l.area_m2,
-                    "bedrooms": l.bedrooms,
-                    "bathrooms": l.bathrooms,
-                    "parking_spaces": l.parking_spaces,
-                    "latitude": l.coordinates.latitude if l.coordinates else None,
-                    "longitude": l.coordinates.longitude if l.coordinates else None,
-                    "description": l.description,
-                    "amenities": l.amenities,
-                    "building_amenities": l.building_amenities,
-                    "unit_amenities": l.unit_amenities,
-                    "floor_number": l.floor_number,
-                    "total_floors": l.total_floors,
-                    "year_built": l.year_built,
-                    "furnished": l.furnished.value,
-                    "pet_friendly": l.pet_friendly,
-                    "images": l.images,
-                    "content_hash": str(l.content_hash) if l.content_hash else "",
-                }
-                for l in listings
-            ]
-
-            if "json" in formats:
-                json_path = output_dir / "listings.json"
-                with open(json_path, "w", encoding="utf-8") as f:
-                    json.dump(records, f, ensure_ascii=False, indent=2)
-                logger.info("Exported %d listings to %s", len(records), json_path)
-
-            if "csv" in formats:
-                csv_path = output_dir / "listings.csv"
-                flat_records = []
-                for rec in records:
-                    flat = {**rec}
-                    flat["amenities"] = json.dumps(flat["amenities"])
-                    flat["building_amenities"] = json.dumps(flat["building_amenities"])
-                    flat["unit_amenities"] = json.dumps(flat["unit_amenities"])
-                    flat["images"] = json.dumps(flat["images"])
-                    flat_records.append(flat)
-                with open(csv_path, "w", encoding="utf-8", newline="") as f:
-                    writer = csv.DictWriter(f, fieldnames=flat_records[0].keys())
-                    writer.writeheader()
-                    writer.writerows(flat_records)
-                logger.info("Exported %d listings to %s", len(records), csv_path)
-
-            result.items_created = len(records)
+            for path in self._paths(output_dir, export_settings.formats):
+                logger.info("Exported %d listings to %s", exported, path)
+            result.items_created = exported
 
         except Exception as exc:
             result.status = StepStatus.FAILED
             result.errors.append(ErrorInfo.from_exception(exc, ErrorCategory.UNKNOWN))
             logger.exception("ExportStep failed")
+        finally:
+            if not committed:
+                session.close(commit=False)
 
         return result
+
+    @staticmethod
+    def _paths(output_dir: Path, formats: list[str]) -> list[Path]:
+        paths = []
+        if "json" in formats:
+            paths.append(output_dir / "listings.json")
+        if "csv" in formats:
+            paths.append(output_dir / "listings.csv")
+        return paths
+
+    @classmethod
+    def _open_writers(
+        cls, output_dir: Path, formats: list[str]
+    ) -> list[_JsonArrayWriter | _CsvWriter]:
+        return [
+            _JsonArrayWriter(path) if path.suffix == ".json" else _CsvWriter(path)
+            for path in cls._paths(output_dir, formats)
+        ]
+
+    @staticmethod
+    def _to_record(l: Listing) -> dict[str, Any]:
+        return {
+            "source_id": l.source_id,
+            "source_url": l.source_url,
+            "property_type": l.property_type.value,
+            "street": l.address.street,
+            "number": l.address.number,
+            "neighborhood": l.address.neighborhood,
+            "city": l.address.city,
+            "state": l.address.state,
+            "zip_code": l.address.zip_code,
+            "sale_price": l.price.sale_price,
+            "condo_fee": l.price.condo_fee,
+            "iptu": l.price.iptu,
+            "area_m2": l.area_m2,
+            "bedrooms": l.bedrooms,
+            "bathrooms": l.bathrooms,
+            "parking_spaces": l.parking_spaces,
+            "latitude": l.coordinates.latitude if l.coordinates else None,
+            "longitude": l.coordinates.longitude if l.coordinates else None,
+            "description": l.description,
+            "amenities": l.amenities,
+            "building_amenities": l.building_amenities,
+            "unit_amenities": l.unit_amenities,
+            "floor_number": l.floor_number,
+            "total_floors": l.total_floors,
+            "year_built": l.year_built,
+            "furnished": l.furnished.value,
+            "pet_friendly": l.pet_friendly,
+            "images": l.images,
+            "content_hash": str(l.content_hash) if l.content_hash else "",
+        }
@@ -1,8 +1,11 @@
 from __future__ import annotations
 
+import asyncio
 import logging
+from typing import Any
 
-from rpaquintoandar.application.pipeline import PipelineContext
+from rpaquintoandar.application.dtos import ExtractResult
+from rpaquintoandar.application.pipeline import PipelineContext, StepOptions, iter_queue
 from rpaquintoandar.application.use_cases import ExtractDetailUseCase
 from rpaquintoandar.domain.enums import ErrorCategory, StepStatus
 from rpaquintoandar.domain.value_objects import ErrorInfo, StepResult
@@ -11,6 +14,10 @@ logger = logging.getLogger(__name__)
 
 
 class ExtractStep:
+    def __init__(self, options: StepOptions | None = None) -> None:
+        # Without explicit options, retries follow scraping.retry_attempts/retry_delay_ms
+        self._options = options
+
     @property
     def name(self) -> str:
         return "extract"
@@ -18,18 +25,54 @@ class ExtractStep:
     async def execute(self, context: PipelineContext) -> StepResult:
         result = StepResult()
         try:
-            detail_extractor = await context.container.detail_extractor()
-            repo = context.container.listing_repo()
-            use_case = ExtractDetailUseCase(detail_extractor, repo)
-            extract_result = await use_case.execute()
+            use_case = await self._use_case(context, outbox=None)
+            self._apply(await use_case.execute(), result)
+        except Exception as exc:
+            result.status = StepStatus.FAILED
+            result.errors.append(ErrorInfo.from_exception(exc, ErrorCategory.UNKNOWN))
+            logger.exception("ExtractStep failed")
 
-            result.items_processed = extract_result.total_processed
-            result.items_created = extract_result.enriched
-            result.items_failed = extract_result.failed
+        return result
 
+    async def stream(
+        self,
+        context: PipelineContext,
+        inbox: asyncio.Queue[Any] | None,
+        outbox: asyncio.Queue[Any] | None,
+    ) -> StepResult:
+        """Enrich source id batches from ``inbox``; enriched listings go to ``outbox``."""
+        result = StepResult()
+        try:
+            use_case = await self._use_case(context, outbox)
+            self._apply(await use_case.execute_stream(iter_queue(inbox)), result)
         except Exception as exc:
             result.status = StepStatus.FAILED
             result.errors.append(ErrorInfo.from_exception(exc, ErrorCategory.UNKNOWN))
             logger.exception("ExtractStep failed")
 
         return result
+
+    async def _use_case(
+        self, context: PipelineContext, outbox: asyncio.Queue[Any] | None
+    ) -> ExtractDetailUseCase:
+        detail_extractor = await context.container.detail_extractor()
+        repo = context.container.listing_repo()
+        return ExtractDetailUseCase(
+            detail_extractor,
+            repo,
+            concurrency=context.container.settings.scraping.concurrency,
+            claim_batch_size=context.container.settings.scraping.claim_batch_size,
+            lease_seconds=context.container.settings.scraping.lease_seconds,
+            payload_archive=context.container.payload_archive(),
+            retry_policy=context.container.retry_policy(
+                max_retries=self._options.max_retries if self._options else None,
+                retry_delay_ms=self._options.retry_delay_ms if self._options else None,
+            ),
+            on_enriched=outbox.put if outbox is not None else None,
+        )
+
+    @staticmethod
+    def _apply(extract_result: ExtractResult, result: StepResult) -> None:
+        result.items_processed = extract_result.total_processed
+        result.items_created = extract_result.enriched
+        result.items_failed = extract_result.failed
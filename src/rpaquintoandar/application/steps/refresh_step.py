@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import logging
+from datetime import datetime, timedelta
+
+from rpaquintoandar.application.pipeline import PipelineContext, StepOptions
+from rpaquintoandar.application.use_cases import ExtractDetailUseCase
+from rpaquintoandar.domain.enums import ErrorCategory, StepStatus
+from rpaquintoandar.domain.value_objects import ErrorInfo, StepResult
+
+logger = logging.getLogger(__name__)
+
+
+class RefreshStep:
+    """Re-extracts enriched listings whose last fetch is older than the TTL."""
+
+    def __init__(self, options: StepOptions | None = None) -> None:
+        # Without explicit options, retries follow scraping.retry_attempts/retry_delay_ms
+        self._options = options
+
+    @property
+    def name(self) -> str:
+        return "refresh"
+
+    async def execute(self, context: PipelineContext) -> StepResult:
+        result = StepResult()
+        try:
+            settings = context.container.settings
+            repo = context.container.listing_repo()
+            cutoff = datetime.now() - timedelta(days=settings.refresh.max_age_days)
+            due = await repo.get_due_for_refresh(cutoff, settings.refresh.budget_per_run)
+            logger.info(
+                "Refresh: %d listings due (fetched before %s, budget=%d)",
+                len(due),
+                cutoff.isoformat(timespec="seconds"),
+                settings.refresh.budget_per_run,
+            )
+            if not due:
+                return result
+
+            detail_extractor = await context.container.detail_extractor()
+            use_case = ExtractDetailUseCase(
+                detail_extractor,
+                repo,
+                concurrency=settings.scraping.concurrency,
+                payload_archive=context.container.payload_archive(),
+                retry_policy=context.container.retry_policy(
+                    max_retries=self._options.max_retries if self._options else None,
+                    retry_delay_ms=self._options.retry_delay_ms if self._options else None,
+                ),
+            )
+            extract_result = await use_case.execute(due)
+
+            result.items_processed = extract_result.total_processed
+            result.items_created = extract_result.enriched
+            result.items_failed = extract_result.failed
+
+        except Exception as exc:
+            result.status = StepStatus.FAILED
+            result.errors.append(ErrorInfo.from_exception(exc, ErrorCategory.UNKNOWN))
+            logger.exception("RefreshStep failed")
+
+        return result
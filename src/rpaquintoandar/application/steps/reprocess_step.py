@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+import logging
+
+from rpaquintoandar.application.pipeline import PipelineContext
+from rpaquintoandar.application.use_cases import ReprocessArchiveUseCase
+from rpaquintoandar.domain.enums import ErrorCategory, StepStatus
+from rpaquintoandar.domain.value_objects import ErrorInfo, StepResult
+
+logger = logging.getLogger(__name__)
+
+
+class ReprocessStep:
+    @property
+    def name(self) -> str:
+        return "reprocess"
+
+    async def execute(self, context: PipelineContext) -> StepResult:
+        result = StepResult()
+        try:
+            archive = context.container.payload_archive()
+            if archive is None:
+                raise RuntimeError("Payload archive is disabled (archive.enabled=false)")
+            repo = context.container.listing_repo()
+            use_case = ReprocessArchiveUseCase(archive, repo)
+            reprocess_result = await use_case.execute()
+
+            result.items_processed = reprocess_result.total_processed
+            result.items_created = reprocess_result.enriched
+            result.items_failed = reprocess_result.failed
+
+        except Exception as exc:
+            result.status = StepStatus.FAILED
+            result.errors.append(ErrorInfo.from_exception(exc, ErrorCategory.PARSE))
+            logger.exception("ReprocessStep failed")
+
+        return result
@@ -1,14 +1,22 @@
 from __future__ import annotations
 
+import asyncio
 import logging
+from collections.abc import Awaitable, Callable
+from typing import Any
 
+from rpaquintoandar.application.dtos import SearchResult
 from rpaquintoandar.application.pipeline import PipelineContext
 from rpaquintoandar.application.use_cases import SearchListingsUseCase, SegmentedSearchUseCase
+from rpaquintoandar.domain.entities import Listing
 from rpaquintoandar.domain.enums import ErrorCategory, StepStatus
-from rpaquintoandar.domain.value_objects import ErrorInfo, StepResult
+from rpaquintoandar.domain.value_objects import ErrorInfo, StepResult, Viewport
+from rpaquintoandar.shared.known_ids import KnownIdIndex
 
 logger = logging.getLogger(__name__)
 
+OnNew = Callable[[list[Listing]], Awaitable[None]]
+
 
 class SearchStep:
     @property
@@ -16,14 +24,35 @@ class SearchStep:
         return "search"
 
     async def execute(self, context: PipelineContext) -> StepResult:
+        return await self._search(context, on_new=None)
+
+    async def stream(
+        self,
+        context: PipelineContext,
+        inbox: asyncio.Queue[Any] | None,
+        outbox: asyncio.Queue[Any] | None,
+    ) -> StepResult:
+        """Search, handing each batch of new source ids to ``outbox`` as it is stored."""
+        if outbox is None:
+            return await self.execute(context)
+        chunk = context.container.settings.scraping.claim_batch_size
+
+        async def on_new(listings: list[Listing]) -> None:
+            source_ids = [listing.source_id for listing in listings]
+            for start in range(0, len(source_ids), chunk):
+                await outbox.put(source_ids[start : start + chunk])
+
+        return await self._search(context, on_new=on_new)
+
+    async def _search(self, context: PipelineContext, on_new: OnNew | None) -> StepResult:
         result = StepResult()
         try:
             segmented = context.metadata.get("segmented", False)
 
             if segmented:
-                search_result = await self._run_segmented(context)
+                search_result = await self._run_segmented(context, on_new)
             else:
-                search_result = await self._run_simple(context)
+                search_result = await self._run_simple(context, on_new)
 
             result.items_processed = search_result.total_found
             result.items_created = search_result.new_listings
@@ -36,19 +65,21 @@ class SearchStep:
         return result
 
     @staticmethod
-    async def _run_simple(context: PipelineContext):
-        from rpaquintoandar.application.dtos import SearchResult
-
+    async def _run_simple(context: PipelineContext, on_new: OnNew | None) -> SearchResult:
         api_client = await context.container.api_client()
         repo = context.container.listing_repo()
         max_pages = context.metadata.get(
             "max_pages", context.container.settings.scraping.max_pages
         )
-        use_case = SearchListingsUseCase(api_client, repo, max_pages=max_pages)
+        known_ids = await KnownIdIndex.load(repo)
+        logger.info("Loaded %d known listing IDs", len(known_ids))
+        use_case = SearchListingsUseCase(
+            api_client, repo, max_pages=max_pages, known_ids=known_ids, on_new=on_new
+        )
         return await use_case.execute(context.criteria)
 
     @staticmethod
-    async def _run_segmented(context: PipelineContext):
+    async def _run_segmented(context: PipelineContext, on_new: OnNew | None) -> SearchResult:
         api_client = await context.container.api_client()
         repo = context.container.listing_repo()
         collector = await context.container.coordinates_collector()
@@ -59,11 +90,20 @@ class SearchStep:
             "target_count", context.container.settings.search.target_count
         )
 
+        known_ids = await KnownIdIndex.load(repo)
+        logger.info("Loaded %d known listing IDs", len(known_ids))
         use_case = SegmentedSearchUseCase(
-            api_client, repo, collector, max_pages_per_segment=max_pages
+            api_client,
+            repo,
+            collector,
+            max_pages_per_segment=max_pages,
+            known_ids=known_ids,
+            on_new=on_new,
         )
         return await use_case.execute(
             context.criteria,
             target_count=target_count,
             property_type="apartamento" if context.container.settings.search.apartment_only else None,
+            price_ranges=context.container.settings.search.price_ranges,
+            bounding_box=Viewport(**context.container.settings.search.bounding_box),
         )
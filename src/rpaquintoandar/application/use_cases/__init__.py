@@ -1,5 +1,13 @@
+from .compare_runs import CompareRunsUseCase
 from .extract_detail import ExtractDetailUseCase
+from .reprocess_archive import ReprocessArchiveUseCase
 from .search_listings import SearchListingsUseCase
 from .segmented_search import SegmentedSearchUseCase
 
-__all__ = ["ExtractDetailUseCase", "SearchListingsUseCase", "SegmentedSearchUseCase"]
+__all__ = [
+    "CompareRunsUseCase",
+    "ExtractDetailUseCase",
+    "ReprocessArchiveUseCase",
+    "SearchListingsUseCase",
+    "SegmentedSearchUseCase",
+]
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import logging
+
+from rpaquintoandar.domain.entities import ExecutionRun, StepMetric, StepRecord
+from rpaquintoandar.domain.interfaces import IExecutionRepository
+
+logger = logging.getLogger(__name__)
+
+LABEL_WIDTH = 28
+COLUMN_WIDTH = 18
+
+
+class CompareRunsUseCase:
+    """Renders the last N runs side by side, one column per run.
+
+    For every step: wall time and items/second from its step record, then
+    p50/p95/p99 latency of each recorded phase from ``step_metrics``.
+    """
+
+    def __init__(self, execution_repo: IExecutionRepository) -> None:
+        self._repo = execution_repo
+
+    async def execute(self, limit: int = 5) -> str:
+        runs = await self._repo.get_recent_runs(limit)
+        if not runs:
+            return "No execution runs recorded yet."
+
+        steps: dict[int, list[StepRecord]] = {}
+        metrics: dict[int, list[StepMetric]] = {}
+        for run in runs:
+            assert run.id is not None
+            steps[run.id] = await self._repo.get_steps(run.id)
+            metrics[run.id] = await self._repo.get_step_metrics(run.id)
+        return self.render(runs, steps, metrics)
+
+    @staticmethod
+    def render(
+        runs: list[ExecutionRun],
+        steps: dict[int, list[StepRecord]],
+        metrics: dict[int, list[StepMetric]],
+    ) -> str:
+        rows: dict[str, dict[int, str]] = {}
+
+        def put(label: str, run_id: int, value: str) -> None:
+            rows.setdefault(label, {})[run_id] = value
+
+        for run in runs:
+            assert run.id is not None
+            put("mode", run.id, run.mode)
+            put("status", run.id, run.status.value)
+            put("started", run.id, run.started_at.strftime("%m-%d %H:%M"))
+            for step in steps.get(run.id, []):
+                wall = (
+                    (step.finished_at - step.started_at).total_seconds()
+                    if step.finished_at
+                    else 0.0
+                )
+                put(f"{step.step_name} wall s", run.id, f"{wall:.1f}")
+                put(f"{step.step_name} items", run.id, str(step.items_processed))
+                put(
+                    f"{step.step_name} items/s",
+                    run.id,
+                    f"{step.items_processed / wall:.2f}" if wall > 0 else "-",
+                )
+            for m in metrics.get(run.id, []):
+                put(
+                    f"{m.step_name}.{m.phase} p50/95/99",
+                    run.id,
+                    f"{m.p50_ms:.0f}/{m.p95_ms:.0f}/{m.p99_ms:.0f}ms",
+                )
+
+        header = "run".ljust(LABEL_WIDTH) + "".join(
+            f"#{run.id}".rjust(COLUMN_WIDTH) for run in runs
+        )
+        lines = [header, "-" * len(header)]
+        for label, values in rows.items():
+            lines.append(
+                label[:LABEL_WIDTH].ljust(LABEL_WIDTH)
+                + "".join(values.get(run.id or 0, "-").rjust(COLUMN_WIDTH) for run in runs)
+            )
+        return "\n".join(lines)
@@ -1,80 +1,259 @@
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
+import os
+import socket
+import time
+from collections.abc import AsyncIterable, Awaitable, Callable
+from typing import Any
 
-from rpaquintoandar.application.dtos import ExtractResult
+from rpaquintoandar.application.dtos import ExtractResult, WorkerStats
 from rpaquintoandar.domain.entities import Listing
-from rpaquintoandar.domain.enums import FurnishedStatus, ProcessingStatus
-from rpaquintoandar.domain.interfaces import IDetailExtractor, IListingRepository
+from rpaquintoandar.domain.enums import FurnishedStatus
+from rpaquintoandar.domain.interfaces import (
+    IDetailExtractor,
+    IListingRepository,
+    IPayloadArchive,
+    IRetryPolicy,
+)
 from rpaquintoandar.domain.value_objects import Address, ContentHash, Coordinates, PriceInfo
+from rpaquintoandar.shared.hashing import canonical_json
+from rpaquintoandar.shared.perf_metrics import phase
 
 logger = logging.getLogger(__name__)
 
 
+def default_worker_id() -> str:
+    """Lease owner for this process: ``host:pid``."""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
 class ExtractDetailUseCase:
     def __init__(
         self,
         detail_extractor: IDetailExtractor,
         listing_repo: IListingRepository,
+        concurrency: int = 1,
+        payload_archive: IPayloadArchive | None = None,
+        retry_policy: IRetryPolicy | None = None,
+        claim_batch_size: int = 50,
+        lease_seconds: float = 600.0,
+        worker_id: str | None = None,
+        on_enriched: Callable[[Listing], Awaitable[None]] | None = None,
     ) -> None:
         self._extractor = detail_extractor
         self._repo = listing_repo
+        self._concurrency = max(1, concurrency)
+        self._archive = payload_archive
+        self._retry_policy = retry_policy
+        self._claim_batch_size = max(1, claim_batch_size)
+        self._lease_seconds = lease_seconds
+        self._worker_id = worker_id or default_worker_id()
+        # Called with every listing that ends up ENRICHED, e.g. to feed an exporter
+        self._on_enriched = on_enriched
+        # Hashes claimed during this run; closes the window between the
+        # duplicate check and the upsert when workers run concurrently.
+        self._claimed_hashes: set[ContentHash] = set()
 
-    async def execute(self) -> ExtractResult:
-        pending = await self._repo.get_by_status(ProcessingStatus.PENDING)
-        logger.info("Found %d pending listings to enrich", len(pending))
-
-        result = ExtractResult(total_processed=len(pending))
+    async def execute(self, listings: list[Listing] | None = None) -> ExtractResult:
+        """Enrich ``listings``, or claim PENDING listings batch by batch when not given."""
+        result = ExtractResult()
+        result.workers = [WorkerStats(worker_id=i) for i in range(self._concurrency)]
 
-        for listing in pending:
-            try:
-                json_str = await self._extractor.extract_detail(listing)
-                if not json_str:
-                    listing.mark_failed()
-                    await self._repo.upsert(listing)
-                    result.failed += 1
-                    continue
+        if listings is not None:
+            logger.info(
+                "Found %d listings to enrich (concurrency=%d)",
+                len(listings),
+                self._concurrency,
+            )
+            await self._run_batch(listings, result)
+        else:
+            await self._run_claimed(result)
 
-                self._enrich_from_next_data(listing, json_str)
+        self._log_summary(result)
+        return result
 
-                content_hash = ContentHash.from_text(json_str)
+    async def execute_stream(self, source_ids: AsyncIterable[list[str]]) -> ExtractResult:
+        """Enrich listings as their ids arrive, then sweep any other pending ones.
 
-                if await self._repo.exists_by_hash(content_hash):
-                    listing.mark_duplicate()
-                    await self._repo.upsert(listing)
-                    result.duplicates += 1
-                    logger.debug("Duplicate: %s", listing.source_id)
-                    continue
+        Each batch of ids is leased before it is worked, so another process
+        claiming from the same database never gets the same listing.
+        """
+        result = ExtractResult()
+        result.workers = [WorkerStats(worker_id=i) for i in range(self._concurrency)]
+        try:
+            async for batch_ids in source_ids:
+                batch = await self._repo.claim_source_ids(
+                    batch_ids, self._worker_id, self._lease_seconds
+                )
+                if batch:
+                    await self._run_batch(batch, result)
+            await self._claim_until_empty(result)
+        finally:
+            await self._release_leases()
 
-                listing.mark_enriched(content_hash)
-                await self._repo.upsert(listing)
-                result.enriched += 1
-                logger.debug("Enriched: %s", listing.source_id)
+        self._log_summary(result)
+        return result
 
-            except Exception:
-                listing.mark_failed()
-                await self._repo.upsert(listing)
-                result.failed += 1
-                logger.exception("Failed to enrich: %s", listing.source_id)
+    @staticmethod
+    def _log_summary(result: ExtractResult) -> None:
+        for stats in result.workers:
+            logger.info(
+                "Worker %d: processed=%d elapsed=%.1fs throughput=%.2f items/s",
+                stats.worker_id,
+                stats.processed,
+                stats.elapsed_seconds,
+                stats.items_per_second,
+            )
 
         logger.info(
-            "Enrichment completed: processed=%d enriched=%d duplicates=%d failed=%d",
+            "Enrichment completed: processed=%d enriched=%d duplicates=%d "
+            "unchanged=%d failed=%d",
             result.total_processed,
             result.enriched,
             result.duplicates,
+            result.unchanged,
             result.failed,
         )
-        return result
+
+    async def _run_claimed(self, result: ExtractResult) -> None:
+        logger.info(
+            "Claiming pending listings as %s (batch=%d, lease=%.0fs, concurrency=%d)",
+            self._worker_id,
+            self._claim_batch_size,
+            self._lease_seconds,
+            self._concurrency,
+        )
+        try:
+            await self._claim_until_empty(result)
+        finally:
+            await self._release_leases()
+
+    async def _claim_until_empty(self, result: ExtractResult) -> None:
+        while True:
+            batch = await self._repo.claim_batch(
+                self._claim_batch_size, self._worker_id, self._lease_seconds
+            )
+            if not batch:
+                break
+            logger.info("Claimed %d listings", len(batch))
+            await self._run_batch(batch, result)
+
+    async def _release_leases(self) -> None:
+        # Anything still leased (e.g. on cancellation) goes back to the queue now
+        # rather than waiting for the lease to expire
+        released = await self._repo.release_leases(self._worker_id)
+        if released:
+            logger.warning("Released %d unfinished leases", released)
+
+    async def _run_batch(self, batch: list[Listing], result: ExtractResult) -> None:
+        result.total_processed += len(batch)
+        queue: asyncio.Queue[Listing] = asyncio.Queue()
+        for listing in batch:
+            queue.put_nowait(listing)
+
+        active = result.workers[: max(1, min(len(result.workers), len(batch)))]
+        await asyncio.gather(*(self._worker(queue, result, stats) for stats in active))
+
+    async def _worker(
+        self,
+        queue: asyncio.Queue[Listing],
+        result: ExtractResult,
+        stats: WorkerStats,
+    ) -> None:
+        started = time.perf_counter()
+        while True:
+            try:
+                listing = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                break
+            with phase("item"):
+                await self._process(listing, result)
+            stats.processed += 1
+        stats.elapsed_seconds += time.perf_counter() - started
+
+    async def _process(self, listing: Listing, result: ExtractResult) -> None:
+        try:
+            with phase("fetch"):
+                json_str = await self._fetch(listing)
+            if not json_str:
+                listing.mark_failed()
+                await self._persist(listing)
+                result.failed += 1
+                return
+
+            if self._archive is not None:
+                await self._archive.store(listing.source_id, json_str)
+
+            with phase("parse"):
+                data = self._parse_next_data(listing, json_str)
+                if data is not None:
+                    self._enrich_from_next_data(listing, data)
+
+            # Hash a canonical form so key order and whitespace differences
+            # between the browser and HTTP paths don't defeat deduplication.
+            with phase("hash"):
+                content_hash = ContentHash.from_text(
+                    canonical_json(data) if data is not None else json_str
+                )
+
+            if listing.content_hash == content_hash:
+                # Refresh of an already-enriched listing whose payload did not change
+                listing.mark_enriched(content_hash)
+                await self._persist(listing)
+                result.unchanged += 1
+                if self._on_enriched is not None:
+                    await self._on_enriched(listing)
+                return
+
+            claimed = content_hash in self._claimed_hashes
+            self._claimed_hashes.add(content_hash)
+            with phase("dedupe"):
+                duplicate = claimed or await self._repo.exists_by_hash(content_hash)
+            if duplicate:
+                listing.mark_duplicate()
+                await self._persist(listing)
+                result.duplicates += 1
+                logger.debug("Duplicate: %s", listing.source_id)
+                return
+
+            listing.mark_enriched(content_hash)
+            await self._persist(listing)
+            result.enriched += 1
+            logger.debug("Enriched: %s", listing.source_id)
+            if self._on_enriched is not None:
+                await self._on_enriched(listing)
+
+        except Exception:
+            listing.mark_failed()
+            await self._persist(listing)
+            result.failed += 1
+            logger.exception("Failed to enrich: %s", listing.source_id)
+
+    async def _persist(self, listing: Listing) -> None:
+        with phase("persist"):
+            await self._repo.upsert(listing)
+
+    async def _fetch(self, listing: Listing) -> str:
+        if self._retry_policy is None:
+            return await self._extractor.extract_detail(listing)
+        return await self._retry_policy.run(
+            lambda: self._extractor.extract_detail(listing), listing.source_id
+        )
 
     @staticmethod
-    def _enrich_from_next_data(listing: Listing, json_str: str) -> None:
+    def _parse_next_data(listing: Listing, json_str: str) -> dict[str, Any] | None:
         try:
             data = json.loads(json_str)
         except json.JSONDecodeError:
             logger.warning("Invalid JSON in __NEXT_DATA__ for %s", listing.source_id)
-            return
+            return None
+        return data if isinstance(data, dict) else None
 
+    @staticmethod
+    def _enrich_from_next_data(listing: Listing, data: dict[str, Any]) -> None:
         initial = data.get("props", {}).get("pageProps", {}).get("initialState", {})
         house = initial.get("house", {}).get("houseInfo", {})
         if not house:
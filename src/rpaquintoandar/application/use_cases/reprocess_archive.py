@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import logging
+
+from rpaquintoandar.application.dtos import ExtractResult
+from rpaquintoandar.application.use_cases.extract_detail import ExtractDetailUseCase
+from rpaquintoandar.domain.enums import ProcessingStatus
+from rpaquintoandar.domain.interfaces import IListingRepository, IPayloadArchive
+from rpaquintoandar.domain.value_objects import ContentHash
+from rpaquintoandar.shared.hashing import canonical_json
+
+logger = logging.getLogger(__name__)
+
+
+class ReprocessArchiveUseCase:
+    """Re-run detail enrichment over archived payloads, without refetching.
+
+    Uses the latest archived payload per listing. Listings marked
+    DUPLICATE stay duplicates; everything else that parses is
+    re-enriched and marked ENRICHED with a freshly computed hash.
+    """
+
+    def __init__(
+        self,
+        payload_archive: IPayloadArchive,
+        listing_repo: IListingRepository,
+    ) -> None:
+        self._archive = payload_archive
+        self._repo = listing_repo
+
+    async def execute(self) -> ExtractResult:
+        result = ExtractResult()
+        missing = 0
+
+        for source_id, json_str in self._archive.iter_latest():
+            result.total_processed += 1
+            listing = await self._repo.get_by_source_id(source_id)
+            if listing is None:
+                missing += 1
+                continue
+            if listing.status == ProcessingStatus.DUPLICATE:
+                result.duplicates += 1
+                continue
+
+            data = ExtractDetailUseCase._parse_next_data(listing, json_str)
+            if data is None:
+                result.failed += 1
+                continue
+
+            ExtractDetailUseCase._enrich_from_next_data(listing, data)
+            listing.mark_enriched(ContentHash.from_text(canonical_json(data)))
+            await self._repo.upsert(listing)
+            result.enriched += 1
+
+        logger.info(
+            "Reprocess completed: payloads=%d enriched=%d duplicates=%d failed=%d missing=%d",
+            result.total_processed,
+            result.enriched,
+            result.duplicates,
+            result.failed,
+            missing,
+        )
+        return result
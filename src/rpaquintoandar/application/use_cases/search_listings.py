@@ -1,11 +1,15 @@
 from __future__ import annotations
 
 import logging
+from collections.abc import Awaitable, Callable
 
 from rpaquintoandar.application.dtos import SearchResult
+from rpaquintoandar.domain.entities import Listing
 from rpaquintoandar.domain.interfaces import IListingRepository, ISearchApiClient
 from rpaquintoandar.domain.value_objects import SearchCriteria
 from rpaquintoandar.infrastructure.api.quintoandar_api_client import PAGE_SIZE
+from rpaquintoandar.shared.known_ids import KnownIdIndex
+from rpaquintoandar.shared.perf_metrics import phase
 
 logger = logging.getLogger(__name__)
 
@@ -16,10 +20,15 @@ class SearchListingsUseCase:
         api_client: ISearchApiClient,
         listing_repo: IListingRepository,
         max_pages: int = 50,
+        known_ids: KnownIdIndex | None = None,
+        on_new: Callable[[list[Listing]], Awaitable[None]] | None = None,
     ) -> None:
         self._api_client = api_client
         self._repo = listing_repo
         self._max_pages = max_pages
+        self._known_ids = known_ids
+        # Receives each page's newly stored listings, e.g. to start extracting them
+        self._on_new = on_new
 
     async def execute(self, criteria: SearchCriteria) -> SearchResult:
         logger.info("Searching listings: city=%s", criteria.city)
@@ -38,13 +47,23 @@ class SearchListingsUseCase:
                 logger.info("No more listings at offset %d, stopping", offset)
                 break
 
-            new_count = await self._repo.upsert_many(listings)
+            unknown = listings
+            if self._known_ids is not None:
+                unknown = [l for l in listings if l.source_id not in self._known_ids]
+            with phase("persist"):
+                new_count = await self._repo.upsert_many(unknown) if unknown else 0
             result.new_listings += new_count
+            if self._known_ids is not None:
+                for listing in unknown:
+                    self._known_ids.add(listing.source_id)
+            if new_count and self._on_new is not None:
+                await self._on_new(unknown)
 
             logger.info(
-                "Page %d: found=%d new=%d (total_available=%d)",
+                "Page %d: found=%d known=%d new=%d (total_available=%d)",
                 page,
                 len(listings),
+                len(listings) - len(unknown),
                 new_count,
                 total_count,
             )
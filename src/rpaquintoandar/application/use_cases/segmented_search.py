@@ -1,13 +1,15 @@
 from __future__ import annotations
 
 import logging
+from collections.abc import Awaitable, Callable
 from typing import Any
 
 from rpaquintoandar.application.dtos import SearchResult
 from rpaquintoandar.domain.entities import Listing
 from rpaquintoandar.domain.interfaces import IListingRepository, ISearchApiClient
-from rpaquintoandar.domain.value_objects import Coordinates, SearchCriteria
+from rpaquintoandar.domain.value_objects import Coordinates, PriceBand, SearchCriteria, Viewport
 from rpaquintoandar.infrastructure.api.coordinates_collector import CoordinatesCollector
+from rpaquintoandar.shared.known_ids import KnownIdIndex
 
 logger = logging.getLogger(__name__)
 
@@ -19,8 +21,10 @@ class SegmentedSearchUseCase:
 
     Strategy:
     1. Load a search page in Playwright to trigger the coordinates API
-    2. Intercept the response to get up to 10,000 listing IDs
-    3. Create minimal PENDING listings in the database
+    2. Replay it over map tiles, once per ``price_ranges`` band, so no
+       single response is truncated at the 10,000-hit cap
+    3. Create minimal PENDING listings in the database, skipping IDs
+       already stored when a ``KnownIdIndex`` is given
     4. The pipeline's ExtractStep then enriches each via detail pages
     """
 
@@ -30,11 +34,15 @@ class SegmentedSearchUseCase:
         listing_repo: IListingRepository,
         coordinates_collector: CoordinatesCollector,
         max_pages_per_segment: int = 50,
+        known_ids: KnownIdIndex | None = None,
+        on_new: Callable[[list[Listing]], Awaitable[None]] | None = None,
     ) -> None:
         self._api_client = api_client
         self._repo = listing_repo
         self._collector = coordinates_collector
         self._max_pages_per_segment = max_pages_per_segment
+        self._known_ids = known_ids
+        self._on_new = on_new
 
     async def execute(
         self,
@@ -42,6 +50,7 @@ class SegmentedSearchUseCase:
         target_count: int = 1000,
         price_ranges: list[dict[str, Any]] | None = None,
         property_type: str = "apartamento",
+        bounding_box: Viewport | None = None,
     ) -> SearchResult:
         from rpaquintoandar.infrastructure.api.quintoandar_api_client import (
             _build_slug,
@@ -57,15 +66,19 @@ class SegmentedSearchUseCase:
             property_type,
         )
 
-        # Phase 1: Collect listing IDs via coordinates API
+        # Phase 1: Collect listing IDs via coordinates API, one sweep per price band
+        price_bands = [PriceBand.from_dict(r) for r in price_ranges or []]
         id_tuples = await self._collector.collect_ids(
             city_slug=city_slug,
             property_type=property_type,
             target_count=target_count,
+            known_ids=self._known_ids,
+            bounding_box=bounding_box,
+            price_bands=price_bands or None,
         )
 
         if not id_tuples:
-            logger.warning("No listing IDs collected from coordinates API")
+            logger.warning("No new listing IDs collected from coordinates API")
             return SearchResult()
 
         # Phase 2: Create minimal PENDING listings and save to DB
@@ -80,9 +93,14 @@ class SegmentedSearchUseCase:
             listings.append(listing)
 
         new_count = await self._repo.upsert_many(listings)
+        if self._known_ids is not None:
+            for source_id, _, _ in id_tuples:
+                self._known_ids.add(source_id)
+        if new_count and self._on_new is not None:
+            await self._on_new(listings)
 
         logger.info(
-            "SegmentedSearch completed: %d IDs collected, %d new listings saved",
+            "SegmentedSearch completed: %d unknown IDs collected, %d new listings saved",
             len(id_tuples),
             new_count,
         )
@@ -1,5 +1,6 @@
 from .execution_run import ExecutionRun
 from .listing import Listing
+from .step_metric import StepMetric
 from .step_record import StepRecord
 
-__all__ = ["ExecutionRun", "Listing", "StepRecord"]
+__all__ = ["ExecutionRun", "Listing", "StepMetric", "StepRecord"]
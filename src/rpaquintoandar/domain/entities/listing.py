@@ -7,8 +7,15 @@ from rpaquintoandar.domain.enums import FurnishedStatus, ProcessingStatus, Prope
 from rpaquintoandar.domain.value_objects import Address, ContentHash, Coordinates, PriceInfo
 
 
+# Bookkeeping fields that are not persisted as listing columns
+_UNTRACKED = frozenset({"_changed", "id", "created_at", "updated_at"})
+_UNSET = object()
+
+
 @dataclass(slots=True)
 class Listing:
+    # Declared first so it exists before __init__ assigns the other fields
+    _changed: set[str] = field(default_factory=set, init=False, repr=False, compare=False)
     source_id: str
     source_url: str
     property_type: PropertyType = PropertyType.UNKNOWN
@@ -33,14 +40,33 @@ class Listing:
     # Processing
     content_hash: ContentHash | None = None
     status: ProcessingStatus = ProcessingStatus.PENDING
+    last_fetched_at: datetime | None = None
     created_at: datetime = field(default_factory=datetime.now)
     updated_at: datetime = field(default_factory=datetime.now)
     id: int | None = None
 
+    def __setattr__(self, name: str, value: object) -> None:
+        # Only reassignment is tracked; mutate lists by assigning a new one
+        if name not in _UNTRACKED and getattr(self, name, _UNSET) != value:
+            self._changed.add(name)
+        object.__setattr__(self, name, value)
+
+    def __post_init__(self) -> None:
+        self._changed.clear()
+
+    @property
+    def changed_fields(self) -> frozenset[str]:
+        """Fields reassigned to a different value since creation or ``clear_changes``."""
+        return frozenset(self._changed)
+
+    def clear_changes(self) -> None:
+        self._changed.clear()
+
     def mark_enriched(self, content_hash: ContentHash) -> None:
         self.content_hash = content_hash
         self.status = ProcessingStatus.ENRICHED
         self.updated_at = datetime.now()
+        self.last_fetched_at = self.updated_at
 
     def mark_failed(self) -> None:
         self.status = ProcessingStatus.FAILED
@@ -49,3 +75,4 @@ class Listing:
     def mark_duplicate(self) -> None:
         self.status = ProcessingStatus.DUPLICATE
         self.updated_at = datetime.now()
+        self.last_fetched_at = self.updated_at
@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+
+@dataclass(slots=True)
+class StepMetric:
+    """Latency distribution of one phase of a step, in milliseconds."""
+
+    execution_run_id: int
+    step_name: str
+    phase: str
+    samples: int
+    total_ms: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    max_ms: float
+    step_record_id: int | None = None
+    id: int | None = None
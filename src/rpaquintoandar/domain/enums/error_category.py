@@ -8,4 +8,5 @@ class ErrorCategory(StrEnum):
     PARSE = "parse"
     DATABASE = "database"
     API = "api"
+    NOT_FOUND = "not_found"
     UNKNOWN = "unknown"
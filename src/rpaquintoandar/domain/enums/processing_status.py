@@ -3,6 +3,7 @@ from enum import StrEnum
 
 class ProcessingStatus(StrEnum):
     PENDING = "pending"
+    IN_PROGRESS = "in_progress"
     ENRICHED = "enriched"
     FAILED = "failed"
     DUPLICATE = "duplicate"
@@ -3,6 +3,8 @@ from .browser_manager import IBrowserManager
 from .detail_extractor import IDetailExtractor
 from .execution_repository import IExecutionRepository
 from .listing_repository import IListingRepository
+from .payload_archive import IPayloadArchive
+from .retry_policy import IRetryPolicy
 from .search_api_client import ISearchApiClient
 
 __all__ = [
@@ -11,5 +13,7 @@ __all__ = [
     "IDetailExtractor",
     "IExecutionRepository",
     "IListingRepository",
+    "IPayloadArchive",
+    "IRetryPolicy",
     "ISearchApiClient",
 ]
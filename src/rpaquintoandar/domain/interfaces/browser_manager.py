@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from contextlib import AbstractAsyncContextManager
 from typing import Protocol
 
 from playwright.async_api import Page
@@ -10,4 +11,4 @@ class IBrowserManager(Protocol):
 
     async def stop(self) -> None: ...
 
-    async def new_page(self) -> Page: ...
+    def page(self, ssr_only: bool = False) -> AbstractAsyncContextManager[Page]: ...
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from typing import Protocol
 
-from rpaquintoandar.domain.entities import ExecutionRun, StepRecord
+from rpaquintoandar.domain.entities import ExecutionRun, StepMetric, StepRecord
 
 
 class IExecutionRepository(Protocol):
@@ -13,3 +13,11 @@ class IExecutionRepository(Protocol):
     async def create_step(self, step: StepRecord) -> StepRecord: ...
 
     async def update_step(self, step: StepRecord) -> None: ...
+
+    async def save_step_metrics(self, metrics: list[StepMetric]) -> None: ...
+
+    async def get_recent_runs(self, limit: int) -> list[ExecutionRun]: ...
+
+    async def get_steps(self, execution_run_id: int) -> list[StepRecord]: ...
+
+    async def get_step_metrics(self, execution_run_id: int) -> list[StepMetric]: ...
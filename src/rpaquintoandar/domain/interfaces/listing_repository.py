@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from collections.abc import AsyncIterator
+from datetime import datetime
 from typing import Protocol
 
 from rpaquintoandar.domain.entities import Listing
@@ -14,6 +16,24 @@ class IListingRepository(Protocol):
 
     async def get_by_status(self, status: ProcessingStatus) -> list[Listing]: ...
 
+    def iter_by_status(
+        self, status: ProcessingStatus, batch_size: int = 500
+    ) -> AsyncIterator[list[Listing]]: ...
+
+    def iter_source_ids(self, batch_size: int = 10000) -> AsyncIterator[list[str]]: ...
+
+    async def claim_batch(
+        self, limit: int, worker_id: str, lease_seconds: float
+    ) -> list[Listing]: ...
+
+    async def claim_source_ids(
+        self, source_ids: list[str], worker_id: str, lease_seconds: float
+    ) -> list[Listing]: ...
+
+    async def release_leases(self, worker_id: str) -> int: ...
+
+    async def get_due_for_refresh(self, fetched_before: datetime, limit: int) -> list[Listing]: ...
+
     async def get_by_source_id(self, source_id: str) -> Listing | None: ...
 
     async def exists_by_hash(self, content_hash: ContentHash) -> bool: ...
@@ -0,0 +1,13 @@
+from __future__ import annotations
+
+from collections.abc import Iterator
+from datetime import datetime
+from typing import Protocol
+
+
+class IPayloadArchive(Protocol):
+    async def store(
+        self, source_id: str, payload: str, fetched_at: datetime | None = None
+    ) -> None: ...
+
+    def iter_latest(self) -> Iterator[tuple[str, str]]: ...
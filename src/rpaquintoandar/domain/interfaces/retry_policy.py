@@ -0,0 +1,10 @@
+from __future__ import annotations
+
+from collections.abc import Awaitable, Callable
+from typing import Protocol, TypeVar
+
+T = TypeVar("T")
+
+
+class IRetryPolicy(Protocol):
+    async def run(self, operation: Callable[[], Awaitable[T]], description: str = "") -> T: ...
@@ -3,9 +3,11 @@ from .content_hash import ContentHash
 from .coordinates import Coordinates
 from .error_info import ErrorInfo
 from .neighborhood_info import NeighborhoodInfo
+from .price_band import PriceBand
 from .price_info import PriceInfo
 from .search_criteria import SearchCriteria
 from .step_result import StepResult
+from .viewport import Viewport
 
 __all__ = [
     "Address",
@@ -13,7 +15,9 @@ __all__ = [
     "Coordinates",
     "ErrorInfo",
     "NeighborhoodInfo",
+    "PriceBand",
     "PriceInfo",
     "SearchCriteria",
     "StepResult",
+    "Viewport",
 ]
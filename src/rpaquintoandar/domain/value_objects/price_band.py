@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any
+
+
+@dataclass(frozen=True, slots=True)
+class PriceBand:
+    """A sale price range; ``None`` leaves that side open."""
+
+    min: float | None = None
+    max: float | None = None
+
+    @classmethod
+    def from_dict(cls, raw: dict[str, Any]) -> PriceBand:
+        """From a ``search.price_ranges`` entry such as ``{min: 300000, max: 500000}``."""
+        low, high = raw.get("min"), raw.get("max")
+        return cls(
+            min=float(low) if low is not None else None,
+            max=float(high) if high is not None else None,
+        )
+
+    def bisect(self, min_width: float) -> tuple[PriceBand, PriceBand] | None:
+        """Split in two at the midpoint, or ``None`` when the halves would be too narrow.
+
+        An open upper side is split at twice the lower bound; a band open
+        on both sides has no scale to split on.
+        """
+        low = self.min or 0.0
+        if self.max is not None:
+            mid = (low + self.max) / 2
+        elif low > 0:
+            mid = low * 2
+        else:
+            return None
+        if mid - low < min_width:
+            return None
+        return PriceBand(self.min, mid), PriceBand(mid, self.max)
+
+    def __str__(self) -> str:
+        low = f"{self.min:,.0f}" if self.min is not None else ""
+        high = f"{self.max:,.0f}" if self.max is not None else ""
+        return f"[{low}, {high})"
@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True, slots=True)
+class Viewport:
+    """A lat/lng bounding box, as the search map's viewport filter expects."""
+
+    north: float
+    south: float
+    east: float
+    west: float
+
+    @property
+    def height(self) -> float:
+        return self.north - self.south
+
+    @property
+    def width(self) -> float:
+        return self.east - self.west
+
+    def split(self) -> tuple[Viewport, Viewport, Viewport, Viewport]:
+        """The four quadrants: NW, NE, SW, SE."""
+        mid_lat = (self.north + self.south) / 2
+        mid_lng = (self.east + self.west) / 2
+        return (
+            Viewport(north=self.north, south=mid_lat, east=mid_lng, west=self.west),
+            Viewport(north=self.north, south=mid_lat, east=self.east, west=mid_lng),
+            Viewport(north=mid_lat, south=self.south, east=mid_lng, west=self.west),
+            Viewport(north=mid_lat, south=self.south, east=self.east, west=mid_lng),
+        )
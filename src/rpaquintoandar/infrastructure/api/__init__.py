@@ -1,10 +1,18 @@
-from .coordinates_collector import CoordinatesCollector
+from .capture_cache import CapturedRequest, CoordinatesCaptureCache
+from .coordinates_collector import CoordinatesCollector, CoordinatesRequestRejected
+from .http_client import SharedHttpClient
+from .http_detail_extractor import HttpDetailExtractor
 from .quintoandar_api_client import QuintoAndarApiClient
 from .response_parser import parse_search_response, parse_ssr_houses
 
 __all__ = [
+    "CapturedRequest",
+    "CoordinatesCaptureCache",
     "CoordinatesCollector",
+    "CoordinatesRequestRejected",
+    "HttpDetailExtractor",
     "QuintoAndarApiClient",
+    "SharedHttpClient",
     "parse_search_response",
     "parse_ssr_houses",
 ]
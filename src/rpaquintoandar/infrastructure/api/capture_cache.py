@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class CapturedRequest:
+    """A coordinates API request sniffed from the search page."""
+
+    url: str
+    headers: dict[str, str]
+    captured_at: float  # epoch seconds
+
+    @property
+    def age_seconds(self) -> float:
+        return time.time() - self.captured_at
+
+
+class CoordinatesCaptureCache:
+    """Captured coordinates requests per city slug and property type.
+
+    Kept in a small JSON file so later runs can replay the request over
+    HTTP without starting a browser. Entries older than ``ttl_seconds``
+    are ignored; callers invalidate an entry as soon as the API rejects it.
+    """
+
+    def __init__(self, path: Path, ttl_seconds: float) -> None:
+        self._path = path
+        self._ttl = ttl_seconds
+        self._entries: dict[str, CapturedRequest] | None = None
+
+    def get(self, city_slug: str, property_type: str) -> CapturedRequest | None:
+        entry = self._load().get(self._key(city_slug, property_type))
+        if entry is None or entry.age_seconds > self._ttl:
+            return None
+        return entry
+
+    def put(self, city_slug: str, property_type: str, request: CapturedRequest) -> None:
+        self._load()[self._key(city_slug, property_type)] = request
+        self._save()
+
+    def invalidate(self, city_slug: str, property_type: str) -> None:
+        if self._load().pop(self._key(city_slug, property_type), None) is not None:
+            self._save()
+
+    @staticmethod
+    def _key(city_slug: str, property_type: str) -> str:
+        return f"{city_slug}/{property_type}"
+
+    def _load(self) -> dict[str, CapturedRequest]:
+        if self._entries is None:
+            self._entries = {}
+            if self._path.exists():
+                try:
+                    raw = json.loads(self._path.read_text(encoding="utf-8"))
+                    self._entries = {key: CapturedRequest(**value) for key, value in raw.items()}
+                except (OSError, ValueError, TypeError):
+                    logger.warning("Ignoring unreadable capture cache %s", self._path)
+        return self._entries
+
+    def _save(self) -> None:
+        assert self._entries is not None
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self._path.with_suffix(self._path.suffix + ".tmp")
+        tmp.write_text(
+            json.dumps({key: asdict(entry) for key, entry in self._entries.items()}, indent=2),
+            encoding="utf-8",
+        )
+        os.replace(tmp, self._path)
@@ -3,18 +3,71 @@ from __future__ import annotations
 import asyncio
 import json
 import logging
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable, Container
+from dataclasses import dataclass
 from urllib.parse import urlencode, urlparse, parse_qs, urlunparse
 
 import httpx
 
 from rpaquintoandar.domain.interfaces import IBrowserManager
-from rpaquintoandar.domain.value_objects import Coordinates
+from rpaquintoandar.domain.value_objects import Coordinates, PriceBand, Viewport
+from rpaquintoandar.infrastructure.api.capture_cache import CapturedRequest, CoordinatesCaptureCache
+from rpaquintoandar.infrastructure.api.coordinates_stream import CoordinateHitDecoder
 from rpaquintoandar.infrastructure.config.settings_loader import ApiSettings
+from rpaquintoandar.infrastructure.throttling import AdaptiveRateLimiter
+from rpaquintoandar.shared.coordinate_columns import CoordinateColumns
 
 logger = logging.getLogger(__name__)
 
 DETAIL_BASE_URL = "https://www.quintoandar.com.br/imovel"
 SEARCH_PAGE_URL = "https://www.quintoandar.com.br/comprar/imovel"
+CAPTURE_TIMEOUT_SECONDS = 15.0
+# Statuses meaning the replayed request itself is no longer accepted
+REJECTED_STATUSES = frozenset({400, 401, 403, 404, 410})
+# Sale price filter of the coordinates request, rewritten per price band
+PRICE_MIN_PARAM = "filters.priceRange[0].min"
+PRICE_MAX_PARAM = "filters.priceRange[0].max"
+
+# (hits decoded, total hits reported) for one viewport request
+_TileHits = tuple[int, int]
+
+
+@dataclass(slots=True)
+class _Tile:
+    viewport: Viewport
+    band: PriceBand | None
+    root_band: PriceBand | None  # configured band this tile descends from
+    depth: int
+
+
+@dataclass(slots=True)
+class _TileMerge:
+    """Adds one tile's hits to the sweep's columns as they are decoded."""
+
+    seen: CoordinateColumns
+    known_ids: Container[str]
+    new: int = 0
+    known: int = 0
+
+    def __call__(self, source_id: str, lat: float, lon: float) -> None:
+        if source_id in self.known_ids:
+            self.known += 1
+        elif self.seen.add(source_id, lat, lon):
+            self.new += 1
+
+
+@dataclass(slots=True)
+class _BandYield:
+    requests: int = 0
+    splits: int = 0
+    bisections: int = 0
+    new_ids: int = 0
+
+
+class CoordinatesRequestRejected(Exception):
+    """The coordinates API refused the replayed request (stale URL or headers)."""
 
 
 class CoordinatesCollector:
@@ -25,189 +78,388 @@ class CoordinatesCollector:
     pagination which cycles through ~12 listings per neighborhood.
 
     Flow:
-    1. Load a search page in Playwright to capture the coordinates API URL
-    2. Replay that URL (and variants) via httpx to collect IDs
+    1. Load a search page in Playwright to capture the coordinates API URL,
+       unless ``capture_cache`` holds a fresh capture for the slug and type
+    2. Replay that URL via httpx over a quadtree of viewports (per price
+       band, if given), splitting only the tiles whose response hits the
+       per-request cap
     3. Return list of (source_id, lat, lon) tuples
+
+    A cached capture the API rejects is dropped and captured again. With
+    ``browser_factory`` instead of a browser manager, the browser is only
+    started when a capture is actually needed.
     """
 
     def __init__(
         self,
-        browser_manager: IBrowserManager,
+        browser_manager: IBrowserManager | None,
         settings: ApiSettings,
+        coordinates_limiter: AdaptiveRateLimiter | None = None,
+        search_limiter: AdaptiveRateLimiter | None = None,
+        client: httpx.AsyncClient | None = None,
+        capture_cache: CoordinatesCaptureCache | None = None,
+        browser_factory: Callable[[], Awaitable[IBrowserManager]] | None = None,
     ) -> None:
         self._browser = browser_manager
+        self._browser_factory = browser_factory
+        self._capture_cache = capture_cache
         self._settings = settings
+        self._coordinates_limiter = coordinates_limiter
+        self._search_limiter = search_limiter
+        self._client = client
+        self._owns_client = client is None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=httpx.Timeout(self._settings.timeout_seconds),
+                follow_redirects=True,
+            )
+        return self._client
+
+    async def close(self) -> None:
+        if self._client and self._owns_client:
+            await self._client.aclose()
+        self._client = None
 
     async def collect_ids(
         self,
         city_slug: str,
         property_type: str = "apartamento",
         target_count: int = 1000,
-    ) -> list[tuple[str, float, float]]:
+        known_ids: Container[str] | None = None,
+        bounding_box: Viewport | None = None,
+        price_bands: list[PriceBand] | None = None,
+    ) -> CoordinateColumns:
         """Collect listing IDs by intercepting the coordinates API.
 
-        Returns list of (source_id, latitude, longitude) tuples.
+        Returns unique (source_id, latitude, longitude) rows. IDs in
+        ``known_ids`` are dropped as they arrive and do not count towards
+        ``target_count``. With ``price_bands`` the map is swept once per
+        band, so each sweep stays under the per-request hit cap.
         """
-        # Step 1: Load search page and capture coordinates API URL + headers
-        coord_url, coord_headers = await self._capture_coordinates_request(
-            city_slug, property_type
-        )
-
-        if not coord_url:
-            logger.warning("Failed to capture coordinates API URL")
-            return []
+        cache = self._capture_cache
+        captured = cache.get(city_slug, property_type) if cache else None
+        if captured is not None:
+            logger.info(
+                "Replaying cached coordinates request for %s/%s (captured %.1fh ago)",
+                city_slug,
+                property_type,
+                captured.age_seconds / 3600,
+            )
 
-        # Step 2: Fetch IDs via httpx (reusing the captured URL)
-        all_ids = await self._fetch_ids_from_coordinates(
-            coord_url, coord_headers, target_count
+        while True:
+            fresh = captured is None
+            if captured is None:
+                # Step 1: Load search page and capture coordinates API URL + headers
+                captured = await self._capture_coordinates_request(city_slug, property_type)
+                if captured is None:
+                    logger.warning("Failed to capture coordinates API URL")
+                    return []
+                if cache:
+                    cache.put(city_slug, property_type, captured)
+
+            # Step 2: Fetch IDs via httpx (reusing the captured URL)
+            try:
+                all_ids = await self._fetch_ids_from_coordinates(
+                    captured.url,
+                    captured.headers,
+                    target_count,
+                    known_ids or frozenset(),
+                    bounding_box,
+                    price_bands,
+                )
+                break
+            except CoordinatesRequestRejected as exc:
+                if cache:
+                    cache.invalidate(city_slug, property_type)
+                if fresh:
+                    logger.warning("Coordinates API rejected a fresh capture: %s", exc)
+                    return []
+                logger.info("Cached coordinates request rejected (%s); capturing again", exc)
+                captured = None
+
+        logger.info(
+            "Collected %d unique listing IDs (%.1f KB of columns)",
+            len(all_ids),
+            all_ids.nbytes / 1024,
         )
-
-        logger.info("Collected %d unique listing IDs", len(all_ids))
-        return all_ids[:target_count]
+        all_ids.truncate(target_count)
+        return all_ids
 
     async def _capture_coordinates_request(
         self, city_slug: str, property_type: str
-    ) -> tuple[str | None, dict[str, str]]:
+    ) -> CapturedRequest | None:
         """Load a search page and capture the coordinates API request."""
         url = f"{SEARCH_PAGE_URL}/{city_slug}/{property_type}"
         captured_url: str | None = None
         captured_headers: dict[str, str] = {}
-
-        page = await self._browser.new_page()
+        captured = asyncio.Event()
 
         async def on_request(request):
             nonlocal captured_url, captured_headers
-            if "search/coordinates" in request.url:
+            if "search/coordinates" in request.url and not captured.is_set():
                 captured_url = request.url
                 captured_headers = dict(request.headers)
+                captured.set()
+
+        if self._browser is None:
+            if self._browser_factory is None:
+                raise RuntimeError("Browser manager required to capture the coordinates request")
+            self._browser = await self._browser_factory()
+
+        if self._search_limiter:
+            await self._search_limiter.acquire()
+        async with self._browser.page() as page:
+            # Pooled pages outlive this call, so the listener must not leak
+            page.on("request", on_request)
+            try:
+                logger.info("Loading search page to capture coordinates API: %s", url)
+                await page.goto(url, wait_until="domcontentloaded", timeout=30000)
+                # The map fires the coordinates call after hydration; wait for
+                # that request itself instead of a fixed delay
+                try:
+                    await asyncio.wait_for(captured.wait(), CAPTURE_TIMEOUT_SECONDS)
+                except TimeoutError:
+                    logger.warning(
+                        "No coordinates request within %.0fs on %s",
+                        CAPTURE_TIMEOUT_SECONDS,
+                        url,
+                    )
+            finally:
+                page.remove_listener("request", on_request)
+
+        if self._search_limiter:
+            if captured_url:
+                self._search_limiter.record_success()
+            else:
+                self._search_limiter.record_throttle("no coordinates request")
+
+        if captured_url is None:
+            return None
+        return CapturedRequest(
+            url=captured_url,
+            headers=self._replay_headers(captured_headers),
+            captured_at=time.time(),
+        )
 
-        page.on("request", on_request)
-
-        try:
-            logger.info("Loading search page to capture coordinates API: %s", url)
-            await page.goto(url, wait_until="domcontentloaded", timeout=30000)
-            await asyncio.sleep(3)
-        finally:
-            await page.close()
-
-        return captured_url, captured_headers
-
-    async def _fetch_ids_from_coordinates(
-        self,
-        base_url: str,
-        browser_headers: dict[str, str],
-        target_count: int,
-    ) -> list[tuple[str, float, float]]:
-        """Fetch listing IDs from coordinates API via httpx."""
+    @staticmethod
+    def _replay_headers(browser_headers: dict[str, str]) -> dict[str, str]:
+        """The subset of browser headers the coordinates API needs (no cookies)."""
         headers = {
             "accept": browser_headers.get("accept", "application/json"),
             "user-agent": browser_headers.get("user-agent", ""),
         }
         if "x-ab-test" in browser_headers:
             headers["x-ab-test"] = browser_headers["x-ab-test"]
+        return headers
 
-        seen_ids: dict[str, tuple[float, float]] = {}
-
-        async with httpx.AsyncClient(timeout=30, follow_redirects=True) as client:
-            # First call: use exact captured URL
-            ids = await self._single_fetch(client, base_url, headers)
-            for source_id, lat, lon in ids:
-                if source_id not in seen_ids:
-                    seen_ids[source_id] = (lat, lon)
-
-            logger.info(
-                "Coordinates API: %d IDs from initial viewport (target: %d)",
-                len(seen_ids),
-                target_count,
-            )
-
-            # If we need more and have less than target, shift viewport
-            if len(seen_ids) < target_count:
-                for viewport in self._generate_viewports():
-                    if len(seen_ids) >= target_count:
-                        break
-                    shifted_url = self._apply_viewport(base_url, viewport)
-                    ids = await self._single_fetch(client, shifted_url, headers)
-                    new_count = 0
-                    for source_id, lat, lon in ids:
-                        if source_id not in seen_ids:
-                            seen_ids[source_id] = (lat, lon)
-                            new_count += 1
+    async def _fetch_ids_from_coordinates(
+        self,
+        base_url: str,
+        browser_headers: dict[str, str],
+        target_count: int,
+        known_ids: Container[str],
+        bounding_box: Viewport | None = None,
+        price_bands: list[PriceBand] | None = None,
+    ) -> CoordinateColumns:
+        """Fetch listing IDs tile by tile, splitting tiles that hit the API cap.
+
+        Starts from ``bounding_box`` (or the viewport of the captured URL),
+        once per price band when ``price_bands`` is given, and walks a
+        quadtree breadth-first: a tile whose response reaches
+        ``coordinates_hit_cap`` was truncated, so its four quadrants are
+        queued; tiles below the cap are complete and not revisited. A tile
+        still capped at ``min_viewport_degrees`` has its price band bisected
+        instead. Up to ``coordinates_concurrency`` tiles (of any band) are in
+        flight at once, and hits are merged into one ``CoordinateColumns``
+        (deduplicated across tiles and bands) while each response streams in.
+        """
+        headers = self._replay_headers(browser_headers)
+        seen_ids = CoordinateColumns()
+        cap = self._settings.coordinates_hit_cap
+        min_side = self._settings.min_viewport_degrees
+        min_band = self._settings.min_price_band
+        concurrency = max(1, self._settings.coordinates_concurrency)
+        client = self._get_client()
+        root = bounding_box or self._viewport_from_url(base_url)
+        bands: list[PriceBand | None] = list(price_bands) if price_bands else [None]
+
+        if root is None:
+            # No viewport to subdivide: one request per band is all we can do
+            for band in bands:
+                url = self._apply_price_band(base_url, band) if band else base_url
+                await self._single_fetch(client, url, headers, _TileMerge(seen_ids, known_ids))
+            return seen_ids
+
+        tiles: deque[_Tile] = deque(_Tile(root, band, band, 0) for band in bands)
+        in_flight: dict[asyncio.Task[_TileHits], tuple[_Tile, _TileMerge]] = {}
+        yields = {band: _BandYield() for band in bands}
+        try:
+            while (tiles or in_flight) and len(seen_ids) < target_count:
+                while tiles and len(in_flight) < concurrency:
+                    tile = tiles.popleft()
+                    url = self._apply_viewport(base_url, tile.viewport)
+                    if tile.band is not None:
+                        url = self._apply_price_band(url, tile.band)
+                    merge = _TileMerge(seen_ids, known_ids)
+                    task = asyncio.create_task(self._single_fetch(client, url, headers, merge))
+                    in_flight[task] = (tile, merge)
+                    yields[tile.root_band].requests += 1
+
+                done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    tile, merge = in_flight.pop(task)
+                    hits, total = task.result()
+                    band_yield = yields[tile.root_band]
+                    band_yield.new_ids += merge.new
+
+                    saturated = max(total, hits) >= cap
+                    viewport = tile.viewport
+                    split = saturated and min(viewport.height, viewport.width) / 2 >= min_side
+                    halves = (
+                        tile.band.bisect(min_band)
+                        if saturated and not split and tile.band is not None
+                        else None
+                    )
+                    if split:
+                        tiles.extend(
+                            _Tile(quadrant, tile.band, tile.root_band, tile.depth + 1)
+                            for quadrant in viewport.split()
+                        )
+                        band_yield.splits += 1
+                    elif halves is not None:
+                        tiles.extend(
+                            _Tile(viewport, half, tile.root_band, tile.depth) for half in halves
+                        )
+                        band_yield.bisections += 1
+                    elif saturated:
+                        logger.warning(
+                            "Tile at depth %d band=%s is still capped at %d hits; listings "
+                            "beyond the cap are unreachable at min_viewport_degrees=%g",
+                            tile.depth,
+                            tile.band or "any",
+                            cap,
+                            min_side,
+                        )
                     logger.info(
-                        "Viewport shift: +%d new IDs (total: %d)", new_count, len(seen_ids)
+                        "Viewport depth=%d band=%s: %d hits%s, +%d new IDs, %d known (total: %d)",
+                        tile.depth,
+                        tile.band or "any",
+                        hits,
+                        " (capped)" if saturated else "",
+                        merge.new,
+                        merge.known,
+                        len(seen_ids),
                     )
+        finally:
+            # Target reached (or cancelled): drop the requests still running
+            for task in in_flight:
+                task.cancel()
+            if in_flight:
+                await asyncio.gather(*in_flight, return_exceptions=True)
 
-        result = [(sid, lat, lon) for sid, (lat, lon) in seen_ids.items()]
-        return result
+        for band, band_yield in yields.items():
+            logger.info(
+                "Price band %s: %d requests, %d tiles split, %d bisections, %d new IDs",
+                band or "any",
+                band_yield.requests,
+                band_yield.splits,
+                band_yield.bisections,
+                band_yield.new_ids,
+            )
+        logger.info(
+            "Coordinates sweep: %d requests, %d tiles unvisited, %d IDs",
+            sum(y.requests for y in yields.values()),
+            len(tiles) + len(in_flight),
+            len(seen_ids),
+        )
+        return seen_ids
 
-    @staticmethod
     async def _single_fetch(
+        self,
         client: httpx.AsyncClient,
         url: str,
         headers: dict[str, str],
-    ) -> list[tuple[str, float, float]]:
-        """Execute a single coordinates API call and return IDs."""
-        try:
-            resp = await client.get(url, headers=headers)
-            if resp.status_code != 200:
-                logger.warning("Coordinates API returned %d", resp.status_code)
-                return []
-
-            data = resp.json()
-            hits = data.get("hits", {}).get("hits", [])
-            result = []
-            for hit in hits:
-                source_id = str(hit.get("_id", ""))
-                source = hit.get("_source", {})
-                location = source.get("location", {})
-                lat = location.get("lat", 0.0)
-                lon = location.get("lon", 0.0)
-                if source_id:
-                    result.append((source_id, lat, lon))
-            return result
+        on_hit: Callable[[str, float, float], None],
+    ) -> _TileHits:
+        """Execute a single coordinates API call, streaming each hit to ``on_hit``.
 
+        Returns (hits decoded, total hits reported). The body is decoded
+        chunk by chunk rather than parsed whole, so a 10,000-hit response
+        is never materialized as one JSON document.
+        """
+        try:
+            if self._coordinates_limiter:
+                await self._coordinates_limiter.acquire()
+            async with client.stream("GET", url, headers=headers) as resp:
+                if self._coordinates_limiter:
+                    self._coordinates_limiter.record_status(resp.status_code)
+                if resp.status_code in REJECTED_STATUSES:
+                    raise CoordinatesRequestRejected(f"HTTP {resp.status_code}")
+                if resp.status_code != 200:
+                    logger.warning("Coordinates API returned %d", resp.status_code)
+                    return 0, 0
+
+                decoder = CoordinateHitDecoder(on_hit)
+                async for chunk in resp.aiter_bytes():
+                    decoder.feed(chunk)
+                decoder.close()
+            return decoder.hits, decoder.total
+
+        except CoordinatesRequestRejected:
+            raise
         except Exception:
             logger.exception("Failed to fetch coordinates API")
-            return []
+            return 0, 0
 
     @staticmethod
-    def _generate_viewports() -> list[dict[str, float]]:
-        """Generate shifted viewports to cover more area around São Paulo."""
-        # São Paulo center: -23.55, -46.63
-        # Each viewport covers ~0.15 degrees (~15km)
-        base_lat, base_lng = -23.55, -46.63
-        offsets = [
-            (0.0, 0.15),  # east
-            (0.0, -0.15),  # west
-            (0.15, 0.0),  # south
-            (-0.15, 0.0),  # north
-            (0.15, 0.15),  # southeast
-            (-0.15, 0.15),  # northeast
-            (0.15, -0.15),  # southwest
-            (-0.15, -0.15),  # northwest
-        ]
-        viewports = []
-        for dlat, dlng in offsets:
-            clat = base_lat + dlat
-            clng = base_lng + dlng
-            viewports.append({
-                "north": clat + 0.08,
-                "south": clat - 0.08,
-                "east": clng + 0.08,
-                "west": clng - 0.08,
-            })
-        return viewports
+    def _viewport_from_url(url: str) -> Viewport | None:
+        """The viewport filter of a coordinates URL, if it has one."""
+        params = parse_qs(urlparse(url).query)
+        try:
+            return Viewport(
+                **{
+                    side: float(params[f"filters.location.viewport.{side}"][0])
+                    for side in ("north", "south", "east", "west")
+                }
+            )
+        except (KeyError, ValueError, IndexError):
+            return None
 
     @staticmethod
-    def _apply_viewport(url: str, viewport: dict[str, float]) -> str:
+    def _apply_viewport(url: str, viewport: Viewport) -> str:
         """Replace viewport parameters in the coordinates URL."""
+        return CoordinatesCollector._replace_params(
+            url,
+            {
+                "filters.location.viewport.north": str(viewport.north),
+                "filters.location.viewport.south": str(viewport.south),
+                "filters.location.viewport.east": str(viewport.east),
+                "filters.location.viewport.west": str(viewport.west),
+            },
+        )
+
+    @staticmethod
+    def _apply_price_band(url: str, band: PriceBand) -> str:
+        """Replace the sale price filter in the coordinates URL; open sides are dropped."""
+        return CoordinatesCollector._replace_params(
+            url,
+            {
+                PRICE_MIN_PARAM: f"{band.min:.0f}" if band.min is not None else None,
+                PRICE_MAX_PARAM: f"{band.max:.0f}" if band.max is not None else None,
+            },
+        )
+
+    @staticmethod
+    def _replace_params(url: str, values: dict[str, str | None]) -> str:
         parsed = urlparse(url)
         params = parse_qs(parsed.query, keep_blank_values=True)
-
-        params["filters.location.viewport.north"] = [str(viewport["north"])]
-        params["filters.location.viewport.south"] = [str(viewport["south"])]
-        params["filters.location.viewport.east"] = [str(viewport["east"])]
-        params["filters.location.viewport.west"] = [str(viewport["west"])]
+        for key, value in values.items():
+            if value is None:
+                params.pop(key, None)
+            else:
+                params[key] = [value]
 
         # Rebuild query string
         flat_params = []
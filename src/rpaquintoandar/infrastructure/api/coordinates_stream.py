@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import codecs
+import json
+import re
+from collections.abc import Callable
+from typing import Any
+
+# The hits array; the outer "hits" key opens an object, not an array
+_HITS_ARRAY = re.compile(r'"hits"\s*:\s*\[')
+_TOTAL = re.compile(r'"total"\s*:\s*(?:\{[^{}]*?"value"\s*:\s*(\d+)[^{}]*\}|(\d+))')
+_SEPARATORS = " \t\r\n,"
+
+_BEFORE_HITS = 0
+_IN_HITS = 1
+_AFTER_HITS = 2
+
+
+class CoordinateHitDecoder:
+    """Decodes a coordinates API response hit by hit as its bytes arrive.
+
+    The body is ``{"hits": {"total": ..., "hits": [{"_id": ..., "_source":
+    {"location": {"lat": ..., "lon": ...}}}, ...]}}``. Each element of the
+    hits array is decoded with ``raw_decode`` once it is complete and passed
+    to ``on_hit`` as ``(source_id, lat, lon)``, so only the current hit and
+    an unfinished chunk tail are ever held, never the whole document.
+    Text outside the array is kept (it is short) to read ``total`` from.
+    """
+
+    def __init__(self, on_hit: Callable[[str, float, float], None]) -> None:
+        self._on_hit = on_hit
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self._json = json.JSONDecoder()
+        self._buffer = ""
+        self._outside: list[str] = []
+        self._state = _BEFORE_HITS
+        self.hits = 0
+        self.total = 0
+
+    def feed(self, chunk: bytes) -> None:
+        self._buffer += self._utf8.decode(chunk)
+        self._drain()
+
+    def close(self) -> None:
+        """Flush the stream; raises ``ValueError`` if the hits array never ended."""
+        self._buffer += self._utf8.decode(b"", final=True)
+        self._drain()
+        if self._state == _IN_HITS:
+            raise ValueError("Coordinates response ended inside the hits array")
+        self._outside.append(self._buffer)
+        self._buffer = ""
+        match = _TOTAL.search("".join(self._outside))
+        self.total = int(match.group(1) or match.group(2)) if match else self.hits
+
+    def _drain(self) -> None:
+        if self._state == _BEFORE_HITS:
+            match = _HITS_ARRAY.search(self._buffer)
+            if match is None:
+                return
+            self._outside.append(self._buffer[: match.start()])
+            self._buffer = self._buffer[match.end() :]
+            self._state = _IN_HITS
+
+        if self._state == _IN_HITS:
+            buffer = self._buffer
+            pos = 0
+            while True:
+                while pos < len(buffer) and buffer[pos] in _SEPARATORS:
+                    pos += 1
+                if pos == len(buffer):
+                    break
+                if buffer[pos] == "]":
+                    pos += 1
+                    self._state = _AFTER_HITS
+                    break
+                try:
+                    hit, pos_after = self._json.raw_decode(buffer, pos)
+                except json.JSONDecodeError:
+                    # Hit not complete yet; wait for the next chunk
+                    break
+                self._emit(hit)
+                pos = pos_after
+            self._buffer = buffer[pos:]
+
+        if self._state == _AFTER_HITS:
+            self._outside.append(self._buffer)
+            self._buffer = ""
+
+    def _emit(self, hit: Any) -> None:
+        if not isinstance(hit, dict):
+            return
+        self.hits += 1
+        source_id = str(hit.get("_id", ""))
+        if not source_id:
+            return
+        location = hit.get("_source", {}).get("location", {})
+        self._on_hit(source_id, location.get("lat", 0.0), location.get("lon", 0.0))
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import importlib.util
+import logging
+from collections import Counter
+from dataclasses import dataclass, field
+
+import httpx
+
+from rpaquintoandar.infrastructure.config.settings_loader import HttpSettings
+
+logger = logging.getLogger(__name__)
+
+# httpx only negotiates HTTP/2 when the optional h2 package is installed
+H2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+@dataclass(slots=True)
+class HttpClientStats:
+    requests: int = 0
+    by_version: Counter[str] = field(default_factory=Counter)
+    by_status: Counter[int] = field(default_factory=Counter)
+
+
+class SharedHttpClient:
+    """One pooled ``httpx.AsyncClient`` for every plain-HTTP caller.
+
+    Sharing the pool keeps connections to the QuintoAndar hosts alive
+    across the search, coordinates and detail paths, and with HTTP/2
+    concurrent requests to a host multiplex over one connection. Event
+    hooks count requests per protocol version and status for the
+    shutdown summary.
+    """
+
+    def __init__(self, settings: HttpSettings, timeout_seconds: float = 30.0) -> None:
+        self._settings = settings
+        self._timeout = timeout_seconds
+        self._client: httpx.AsyncClient | None = None
+        self.stats = HttpClientStats()
+
+    @property
+    def http2(self) -> bool:
+        return self._settings.http2 and H2_AVAILABLE
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            if self._settings.http2 and not H2_AVAILABLE:
+                logger.warning("HTTP/2 requested but h2 is not installed; using HTTP/1.1")
+            self._client = httpx.AsyncClient(
+                http2=self.http2,
+                timeout=httpx.Timeout(self._timeout),
+                limits=httpx.Limits(
+                    max_connections=self._settings.max_connections,
+                    max_keepalive_connections=self._settings.max_keepalive_connections,
+                    keepalive_expiry=self._settings.keepalive_expiry_seconds,
+                ),
+                follow_redirects=True,
+                event_hooks={"request": [self._on_request], "response": [self._on_response]},
+            )
+        return self._client
+
+    async def close(self) -> None:
+        if self._client is None:
+            return
+        await self._client.aclose()
+        self._client = None
+        logger.info(
+            "HTTP client: requests=%d versions=%s statuses=%s",
+            self.stats.requests,
+            dict(self.stats.by_version),
+            dict(self.stats.by_status),
+        )
+
+    async def _on_request(self, request: httpx.Request) -> None:
+        self.stats.requests += 1
+
+    async def _on_response(self, response: httpx.Response) -> None:
+        self.stats.by_version[response.http_version] += 1
+        self.stats.by_status[response.status_code] += 1
@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+import json
+import logging
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import Any
+from urllib.parse import urlparse
+
+import httpx
+
+from rpaquintoandar.domain.entities import Listing
+from rpaquintoandar.domain.interfaces import IDetailExtractor
+from rpaquintoandar.infrastructure.api.next_data import (
+    DETAIL_PROJECTION,
+    find_next_data_json,
+    project,
+)
+from rpaquintoandar.infrastructure.config.settings_loader import ScrapingSettings
+from rpaquintoandar.infrastructure.resilience import ListingNotFoundError
+from rpaquintoandar.infrastructure.throttling import AdaptiveRateLimiter
+from rpaquintoandar.shared.perf_metrics import phase
+
+logger = logging.getLogger(__name__)
+
+HTML_HEADERS = {
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "pt-BR,pt;q=0.9,en;q=0.8",
+    "User-Agent": (
+        "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36"
+    ),
+}
+DATA_HEADERS = {
+    **HTML_HEADERS,
+    "Accept": "application/json",
+    "x-nextjs-data": "1",
+}
+
+
+@dataclass(slots=True)
+class HttpExtractorStats:
+    data_hits: int = 0
+    html_hits: int = 0
+    fallbacks: int = 0
+    build_id_refreshes: int = 0
+
+
+class HttpDetailExtractor:
+    """Fetches detail ``__NEXT_DATA__`` over plain HTTP, without a browser.
+
+    Flow:
+    1. Learn the Next.js ``buildId`` from the first HTML detail page
+    2. Fetch ``/_next/data/<buildId>/imovel/<id>.json`` for later listings
+    3. On a stale build (404) or non-JSON response, scan the HTML instead
+    4. If HTTP is blocked altogether, delegate to the Playwright extractor
+
+    Both paths return ``DETAIL_PROJECTION`` of the payload, the same
+    subtree the browser extractor returns, so content hashes agree
+    whichever path fetched the listing.
+    """
+
+    def __init__(
+        self,
+        settings: ScrapingSettings,
+        fallback_factory: Callable[[], Awaitable[IDetailExtractor]] | None = None,
+        client: httpx.AsyncClient | None = None,
+        timeout_seconds: float = 30.0,
+        rate_limiter: AdaptiveRateLimiter | None = None,
+    ) -> None:
+        self._settings = settings
+        self._limiter = rate_limiter
+        self._fallback_factory = fallback_factory
+        self._fallback: IDetailExtractor | None = None
+        self._client = client
+        self._owns_client = client is None
+        self._timeout = timeout_seconds
+        self._build_id: str | None = None
+        self.stats = HttpExtractorStats()
+
+        parsed = urlparse(settings.detail_base_url)
+        self._origin = f"{parsed.scheme}://{parsed.netloc}"
+        self._detail_path = parsed.path.rstrip("/")
+
+    async def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=httpx.Timeout(self._timeout),
+                follow_redirects=True,
+            )
+        return self._client
+
+    async def close(self) -> None:
+        if self._client and self._owns_client:
+            await self._client.aclose()
+        self._client = None
+        logger.info(
+            "HTTP detail extractor: data_hits=%d html_hits=%d fallbacks=%d build_refreshes=%d",
+            self.stats.data_hits,
+            self.stats.html_hits,
+            self.stats.fallbacks,
+            self.stats.build_id_refreshes,
+        )
+
+    async def extract_detail(self, listing: Listing) -> str:
+        try:
+            json_str = await self._fetch(listing.source_id)
+        except httpx.HTTPError as exc:
+            logger.debug("HTTP detail fetch failed for %s: %s", listing.source_id, exc)
+            json_str = ""
+
+        if json_str:
+            return json_str
+
+        self.stats.fallbacks += 1
+        if self._fallback_factory is None:
+            return ""
+        if self._fallback is None:
+            self._fallback = await self._fallback_factory()
+        logger.debug("Falling back to browser for %s", listing.source_id)
+        return await self._fallback.extract_detail(listing)
+
+    async def _fetch(self, source_id: str) -> str:
+        if self._build_id:
+            json_str = await self._fetch_data_route(self._build_id, source_id)
+            if json_str:
+                self.stats.data_hits += 1
+                return json_str
+
+        json_str = await self._fetch_html(source_id)
+        if json_str:
+            self.stats.html_hits += 1
+        return json_str
+
+    async def _fetch_data_route(self, build_id: str, source_id: str) -> str:
+        client = await self._get_client()
+        url = f"{self._origin}/_next/data/{build_id}{self._detail_path}/{source_id}.json"
+        resp = await self._get(client, url, params={"id": source_id}, headers=DATA_HEADERS)
+
+        if resp.status_code == 404:
+            # Either a new deploy (stale buildId) or a removed listing; the
+            # HTML fetch that follows tells the two apart and re-learns the id.
+            self._build_id = None
+            return ""
+        if resp.status_code != 200 or "json" not in resp.headers.get("content-type", ""):
+            logger.debug("Data route returned %d for %s", resp.status_code, source_id)
+            return ""
+
+        try:
+            data = resp.json()
+        except ValueError:
+            return ""
+        page_props = data.get("pageProps") if isinstance(data, dict) else None
+        if not page_props:
+            return ""
+        return self._project({"props": {"pageProps": page_props}})
+
+    async def _fetch_html(self, source_id: str) -> str:
+        client = await self._get_client()
+        url = f"{self._settings.detail_base_url}/{source_id}"
+        resp = await self._get(client, url, headers=HTML_HEADERS)
+        if resp.status_code in (404, 410):
+            # The HTML page is authoritative: the listing is gone, and the
+            # browser would only see the same 404
+            raise ListingNotFoundError(source_id, resp.status_code)
+        if resp.status_code != 200:
+            logger.debug("Detail HTML returned %d for %s", resp.status_code, source_id)
+            return ""
+
+        json_str = find_next_data_json(resp.text)
+        if not json_str:
+            if self._limiter:
+                self._limiter.record_throttle("empty __NEXT_DATA__")
+            return ""
+        try:
+            data = json.loads(json_str)
+        except json.JSONDecodeError:
+            return ""
+        if not isinstance(data, dict):
+            return ""
+        if self._build_id is None and (build_id := data.get("buildId")):
+            self._build_id = str(build_id)
+            self.stats.build_id_refreshes += 1
+            logger.info("Next.js buildId: %s", self._build_id)
+        return self._project(data)
+
+    async def _get(self, client: httpx.AsyncClient, url: str, **kwargs: Any) -> httpx.Response:
+        if self._limiter:
+            with phase("rate_limit_wait"):
+                await self._limiter.acquire()
+        with phase("http_get"):
+            resp = await client.get(url, **kwargs)
+        if self._limiter:
+            self._limiter.record_status(resp.status_code)
+        return resp
+
+    @staticmethod
+    def _project(data: dict[str, object]) -> str:
+        projected = project(data, DETAIL_PROJECTION)
+        return json.dumps(projected, ensure_ascii=False) if projected else ""
@@ -1,13 +1,17 @@
 from __future__ import annotations
 
-import asyncio
 import json
 import logging
 from typing import Any
 
 from rpaquintoandar.domain.interfaces import IBrowserManager
 from rpaquintoandar.domain.value_objects import NeighborhoodInfo
+from rpaquintoandar.infrastructure.api.next_data import (
+    NEIGHBORHOOD_PROJECTION,
+    PROJECT_NEXT_DATA_JS,
+)
 from rpaquintoandar.infrastructure.config.settings_loader import ApiSettings
+from rpaquintoandar.infrastructure.throttling import AdaptiveRateLimiter, is_throttle_status
 
 logger = logging.getLogger(__name__)
 
@@ -19,9 +23,11 @@ class NeighborhoodDiscovery:
         self,
         browser_manager: IBrowserManager,
         settings: ApiSettings,
+        rate_limiter: AdaptiveRateLimiter | None = None,
     ) -> None:
         self._browser = browser_manager
         self._settings = settings
+        self._limiter = rate_limiter
 
     async def discover(
         self,
@@ -73,19 +79,22 @@ class NeighborhoodDiscovery:
         self, url: str
     ) -> list[NeighborhoodInfo]:
         """Navigate to a page and extract neighborhood info from __NEXT_DATA__."""
-        page = await self._browser.new_page()
-        try:
-            await page.goto(url, wait_until="domcontentloaded", timeout=30000)
-            await asyncio.sleep(1)
-
+        if self._limiter:
+            await self._limiter.acquire()
+        async with self._browser.page() as page:
+            response = await page.goto(url, wait_until="domcontentloaded", timeout=30000)
             json_str = await page.evaluate(
-                """() => {
-                    const el = document.querySelector('script#__NEXT_DATA__');
-                    return el ? el.textContent : '';
-                }"""
+                PROJECT_NEXT_DATA_JS, list(NEIGHBORHOOD_PROJECTION)
             )
-        finally:
-            await page.close()
+
+        status = response.status if response is not None else None
+        if self._limiter:
+            if is_throttle_status(status):
+                self._limiter.record_throttle(f"HTTP {status}")
+            elif not json_str:
+                self._limiter.record_throttle("empty __NEXT_DATA__")
+            else:
+                self._limiter.record_success()
 
         if not json_str:
             logger.warning("__NEXT_DATA__ not found at %s", url)
@@ -97,12 +106,7 @@ class NeighborhoodDiscovery:
             logger.warning("Failed to parse __NEXT_DATA__ JSON from %s", url)
             return []
 
-        result = self._parse_neighborhoods(data)
-
-        if self._settings.delay_between_requests_ms > 0:
-            await asyncio.sleep(self._settings.delay_between_requests_ms / 1000.0)
-
-        return result
+        return self._parse_neighborhoods(data)
 
     @staticmethod
     def _parse_neighborhoods(data: dict[str, Any]) -> list[NeighborhoodInfo]:
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+from typing import Any
+
+NEXT_DATA_MARKER = 'id="__NEXT_DATA__"'
+SCRIPT_CLOSE = "</script>"
+
+_MISSING = object()
+
+
+def find_next_data_json(html: str) -> str:
+    """Return the text of ``script#__NEXT_DATA__`` from raw HTML.
+
+    Plain substring scan: no DOM is built, and the JSON is not parsed.
+    Returns an empty string when the tag is missing or truncated.
+    """
+    marker = html.find(NEXT_DATA_MARKER)
+    if marker == -1:
+        return ""
+    start = html.find(">", marker)
+    if start == -1:
+        return ""
+    end = html.find(SCRIPT_CLOSE, start)
+    if end == -1:
+        return ""
+    return html[start + 1 : end].strip()
+
+
+# Projection specs: dotted paths into __NEXT_DATA__ that a caller reads.
+# Only these subtrees cross the CDP boundary, nested under their original keys.
+DETAIL_PROJECTION = ("props.pageProps.initialState.house.houseInfo",)
+SEARCH_PROJECTION = (
+    "props.pageProps.initialState.houses",
+    "props.pageProps.initialState.search.markers.total",
+)
+NEIGHBORHOOD_PROJECTION = ("props.pageProps.initialState.search.footer",)
+
+# Page-side counterpart of ``project``; evaluated with the spec as argument.
+# Returns '' when the tag is missing or no path matched.
+PROJECT_NEXT_DATA_JS = """
+(paths) => {
+    const el = document.querySelector('script#__NEXT_DATA__');
+    if (!el) return '';
+    let data;
+    try { data = JSON.parse(el.textContent); } catch (e) { return ''; }
+    const out = {};
+    let matched = false;
+    for (const path of paths) {
+        const keys = path.split('.');
+        let node = data;
+        for (const key of keys) {
+            if (node === null || typeof node !== 'object' || !(key in node)) {
+                node = undefined;
+                break;
+            }
+            node = node[key];
+        }
+        if (node === undefined) continue;
+        let target = out;
+        for (const key of keys.slice(0, -1)) {
+            target = target[key] = target[key] || {};
+        }
+        target[keys[keys.length - 1]] = node;
+        matched = true;
+    }
+    return matched ? JSON.stringify(out) : '';
+}
+"""
+
+
+def project(data: Any, paths: Iterable[str]) -> dict[str, Any]:
+    """Python counterpart of ``PROJECT_NEXT_DATA_JS`` for HTTP-fetched payloads."""
+    out: dict[str, Any] = {}
+    for path in paths:
+        keys = path.split(".")
+        node = data
+        for key in keys:
+            if not isinstance(node, dict) or key not in node:
+                node = _MISSING
+                break
+            node = node[key]
+        if node is _MISSING:
+            continue
+        target = out
+        for key in keys[:-1]:
+            target = target.setdefault(key, {})
+        target[keys[-1]] = node
+    return out
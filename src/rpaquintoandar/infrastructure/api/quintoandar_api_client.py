@@ -1,9 +1,9 @@
 from __future__ import annotations
 
-import asyncio
 import json
 import logging
 import unicodedata
+from collections.abc import Awaitable, Callable
 from typing import Any
 
 import httpx
@@ -11,8 +11,11 @@ import httpx
 from rpaquintoandar.domain.entities import Listing
 from rpaquintoandar.domain.interfaces import IBrowserManager
 from rpaquintoandar.domain.value_objects import SearchCriteria
+from rpaquintoandar.infrastructure.api.next_data import PROJECT_NEXT_DATA_JS, SEARCH_PROJECTION
 from rpaquintoandar.infrastructure.api.response_parser import parse_ssr_houses
 from rpaquintoandar.infrastructure.config.settings_loader import ApiSettings
+from rpaquintoandar.infrastructure.throttling import AdaptiveRateLimiter, is_throttle_status
+from rpaquintoandar.shared.perf_metrics import phase
 
 logger = logging.getLogger(__name__)
 
@@ -50,10 +53,19 @@ class QuintoAndarApiClient:
         self,
         settings: ApiSettings,
         browser_manager: IBrowserManager | None = None,
+        search_limiter: AdaptiveRateLimiter | None = None,
+        count_limiter: AdaptiveRateLimiter | None = None,
+        client: httpx.AsyncClient | None = None,
+        browser_factory: Callable[[], Awaitable[IBrowserManager]] | None = None,
     ) -> None:
         self._settings = settings
         self._browser_manager = browser_manager
-        self._client: httpx.AsyncClient | None = None
+        # Starts the browser on the first SSR search instead of at construction
+        self._browser_factory = browser_factory
+        self._search_limiter = search_limiter
+        self._count_limiter = count_limiter
+        self._client = client
+        self._owns_client = client is None
 
     async def _get_client(self) -> httpx.AsyncClient:
         if self._client is None:
@@ -64,9 +76,9 @@ class QuintoAndarApiClient:
         return self._client
 
     async def close(self) -> None:
-        if self._client:
+        if self._client and self._owns_client:
             await self._client.aclose()
-            self._client = None
+        self._client = None
 
     def _build_count_body(self, criteria: SearchCriteria) -> dict[str, Any]:
         slug = _build_slug(criteria)
@@ -138,7 +150,11 @@ class QuintoAndarApiClient:
         client = await self._get_client()
         body = self._build_count_body(criteria)
 
+        if self._count_limiter:
+            await self._count_limiter.acquire()
         response = await client.post(COUNT_URL, json=body, headers=DEFAULT_HEADERS)
+        if self._count_limiter:
+            self._count_limiter.record_status(response.status_code)
         response.raise_for_status()
 
         data = response.json()
@@ -172,28 +188,36 @@ class QuintoAndarApiClient:
         display_slug = neighborhood_slug or _build_slug(criteria)
         logger.info("Playwright search page=%d slug=%s", page_num, display_slug)
 
+        if self._browser_manager is None and self._browser_factory is not None:
+            self._browser_manager = await self._browser_factory()
         if self._browser_manager is None:
             raise RuntimeError("Browser manager required for search")
 
-        page = await self._browser_manager.new_page()
-        try:
-            await page.goto(url, wait_until="domcontentloaded", timeout=30000)
-            await asyncio.sleep(1)
-
-            json_str = await page.evaluate(
-                """() => {
-                    const el = document.querySelector('script#__NEXT_DATA__');
-                    return el ? el.textContent : '';
-                }"""
-            )
-        finally:
-            await page.close()
+        if self._search_limiter:
+            with phase("rate_limit_wait"):
+                await self._search_limiter.acquire()
+        async with self._browser_manager.page() as page:
+            # __NEXT_DATA__ is part of the SSR document, so domcontentloaded suffices
+            with phase("navigate"):
+                response = await page.goto(url, wait_until="domcontentloaded", timeout=30000)
+            with phase("evaluate"):
+                json_str = await page.evaluate(PROJECT_NEXT_DATA_JS, list(SEARCH_PROJECTION))
+
+        status = response.status if response is not None else None
+        if self._search_limiter:
+            if is_throttle_status(status):
+                self._search_limiter.record_throttle(f"HTTP {status}")
+            elif not json_str:
+                self._search_limiter.record_throttle("empty __NEXT_DATA__")
+            else:
+                self._search_limiter.record_success()
 
         if not json_str:
             logger.warning("__NEXT_DATA__ not found in page (page=%d)", page_num)
             return [], 0
 
-        listings, total_count = self._extract_from_json(json_str)
+        with phase("parse"):
+            listings, total_count = self._extract_from_json(json_str)
 
         logger.info(
             "Search response: %d listings, total=%d (page=%d)",
@@ -202,9 +226,6 @@ class QuintoAndarApiClient:
             page_num,
         )
 
-        if self._settings.delay_between_requests_ms > 0:
-            await asyncio.sleep(self._settings.delay_between_requests_ms / 1000.0)
-
         return listings, total_count
 
     @staticmethod
@@ -0,0 +1,3 @@
+from .payload_archive import ArchiveEntry, PayloadArchive
+
+__all__ = ["ArchiveEntry", "PayloadArchive"]
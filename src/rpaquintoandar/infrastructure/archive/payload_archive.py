@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+import mmap
+import zlib
+from collections.abc import Iterator
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+INDEX_FILE = "index.tsv"
+SEGMENT_PATTERN = "segment-{:05d}.seg"
+
+
+@dataclass(frozen=True, slots=True)
+class ArchiveEntry:
+    source_id: str
+    fetched_at: datetime
+    digest: str
+    segment: int
+    offset: int
+    length: int
+
+
+class PayloadArchive:
+    """Append-only, content-addressed archive of raw ``__NEXT_DATA__`` payloads.
+
+    Layout under ``directory``:
+    - ``segment-NNNNN.seg``: zlib-compressed blobs, concatenated; a new
+      segment starts once the active one exceeds ``segment_max_bytes``
+    - ``index.tsv``: one line per fetch,
+      ``source_id  fetched_at  sha256  segment  offset  length``
+
+    Identical payloads are stored once (keyed by SHA-256 of the raw
+    text); every fetch still gets an index line, so the history of a
+    listing is kept. Reads go through read-only mmaps of the segments.
+    """
+
+    def __init__(self, directory: str | Path, segment_max_bytes: int = 64 * 1024 * 1024) -> None:
+        self._dir = Path(directory)
+        self._segment_max_bytes = segment_max_bytes
+        self._entries: list[ArchiveEntry] = []
+        self._blobs: dict[str, tuple[int, int, int]] = {}
+        self._maps: dict[int, mmap.mmap] = {}
+        self._active_segment = 1
+        self._active_size = 0
+        self._opened = False
+
+    def open(self) -> None:
+        if self._opened:
+            return
+        self._dir.mkdir(parents=True, exist_ok=True)
+        self._load_index()
+        segments = sorted(self._dir.glob("segment-*.seg"))
+        if segments:
+            self._active_segment = int(segments[-1].stem.split("-")[1])
+            self._active_size = segments[-1].stat().st_size
+        self._opened = True
+        logger.info(
+            "Payload archive at %s: %d fetches, %d unique payloads, %d segments",
+            self._dir,
+            len(self._entries),
+            len(self._blobs),
+            len(segments),
+        )
+
+    def close(self) -> None:
+        for mm in self._maps.values():
+            mm.close()
+        self._maps.clear()
+        self._opened = False
+
+    def _load_index(self) -> None:
+        index_path = self._dir / INDEX_FILE
+        if not index_path.exists():
+            return
+        with open(index_path, encoding="utf-8") as f:
+            for line in f:
+                parts = line.rstrip("\n").split("\t")
+                if len(parts) != 6:
+                    # Torn last line after a crash; the blob (if any) is orphaned
+                    continue
+                try:
+                    entry = ArchiveEntry(
+                        source_id=parts[0],
+                        fetched_at=datetime.fromisoformat(parts[1]),
+                        digest=parts[2],
+                        segment=int(parts[3]),
+                        offset=int(parts[4]),
+                        length=int(parts[5]),
+                    )
+                except ValueError:
+                    continue
+                self._entries.append(entry)
+                self._blobs[entry.digest] = (entry.segment, entry.offset, entry.length)
+
+    async def store(self, source_id: str, payload: str, fetched_at: datetime | None = None) -> None:
+        self.open()
+        raw = payload.encode("utf-8")
+        digest = hashlib.sha256(raw).hexdigest()
+
+        location = self._blobs.get(digest)
+        if location is None:
+            location = self._append_blob(zlib.compress(raw, 6))
+            self._blobs[digest] = location
+
+        segment, offset, length = location
+        entry = ArchiveEntry(
+            source_id=source_id,
+            fetched_at=fetched_at or datetime.now(),
+            digest=digest,
+            segment=segment,
+            offset=offset,
+            length=length,
+        )
+        # Blob first, index line second: a crash in between only orphans bytes
+        with open(self._dir / INDEX_FILE, "a", encoding="utf-8") as f:
+            f.write(
+                f"{entry.source_id}\t{entry.fetched_at.isoformat()}\t{entry.digest}\t"
+                f"{entry.segment}\t{entry.offset}\t{entry.length}\n"
+            )
+        self._entries.append(entry)
+
+    def _append_blob(self, blob: bytes) -> tuple[int, int, int]:
+        if self._active_size and self._active_size + len(blob) > self._segment_max_bytes:
+            self._active_segment += 1
+            self._active_size = 0
+        path = self._dir / SEGMENT_PATTERN.format(self._active_segment)
+        with open(path, "ab") as f:
+            offset = f.tell()
+            f.write(blob)
+        self._active_size = offset + len(blob)
+        return self._active_segment, offset, len(blob)
+
+    def read(self, entry: ArchiveEntry) -> str:
+        mm = self._maps.get(entry.segment)
+        if mm is None or entry.offset + entry.length > len(mm):
+            # Segment grew since it was mapped (the active one); remap
+            if mm is not None:
+                mm.close()
+            path = self._dir / SEGMENT_PATTERN.format(entry.segment)
+            with open(path, "rb") as f:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self._maps[entry.segment] = mm
+        blob = mm[entry.offset : entry.offset + entry.length]
+        return zlib.decompress(blob).decode("utf-8")
+
+    def latest_entries(self) -> list[ArchiveEntry]:
+        """Most recent fetch per source_id, in (segment, offset) order for sequential reads."""
+        self.open()
+        latest: dict[str, ArchiveEntry] = {}
+        for entry in self._entries:
+            current = latest.get(entry.source_id)
+            if current is None or entry.fetched_at >= current.fetched_at:
+                latest[entry.source_id] = entry
+        return sorted(latest.values(), key=lambda e: (e.segment, e.offset))
+
+    def iter_latest(self) -> Iterator[tuple[str, str]]:
+        for entry in self.latest_entries():
+            yield entry.source_id, self.read(entry)
+
+    def history(self, source_id: str) -> list[ArchiveEntry]:
+        self.open()
+        return [e for e in self._entries if e.source_id == source_id]
@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import asyncio
 import logging
 
 from rpaquintoandar.domain.entities import Listing
@@ -9,49 +8,54 @@ from rpaquintoandar.infrastructure.browser.page_objects.listing_detail_page impo
     ListingDetailPage,
 )
 from rpaquintoandar.infrastructure.config.settings_loader import ScrapingSettings
+from rpaquintoandar.infrastructure.resilience import EmptyPayloadError, ListingNotFoundError
+from rpaquintoandar.infrastructure.throttling import AdaptiveRateLimiter, is_throttle_status
+from rpaquintoandar.shared.perf_metrics import phase
 
 logger = logging.getLogger(__name__)
 
+NOT_FOUND_STATUSES = frozenset({404, 410})
+
 
 class PlaywrightDetailExtractor:
     def __init__(
         self,
         browser_manager: IBrowserManager,
         scraping_settings: ScrapingSettings,
+        rate_limiter: AdaptiveRateLimiter | None = None,
     ) -> None:
         self._browser_manager = browser_manager
         self._settings = scraping_settings
+        self._limiter = rate_limiter
 
     async def extract_detail(self, listing: Listing) -> str:
-        attempts = self._settings.retry_attempts
-
-        for attempt in range(1, attempts + 1):
-            page = await self._browser_manager.new_page()
-            detail_page = ListingDetailPage(page, self._settings.detail_base_url)
-            try:
-                await detail_page.load_listing(listing.source_id)
-                json_str = await detail_page.extract_next_data()
-                if json_str:
-                    return json_str
-
-                logger.warning(
-                    "Empty __NEXT_DATA__ for %s (attempt %d/%d)",
-                    listing.source_id,
-                    attempt,
-                    attempts,
-                )
-            except Exception:
-                logger.exception(
-                    "Error extracting detail for %s (attempt %d/%d)",
-                    listing.source_id,
-                    attempt,
-                    attempts,
-                )
-            finally:
-                await detail_page.close()
-
-            if attempt < attempts:
-                delay = self._settings.retry_delay_ms / 1000.0
-                await asyncio.sleep(delay)
-
-        return ""
+        """Single attempt; retries are the caller's ``RetryPolicy``'s job."""
+        if self._limiter:
+            with phase("rate_limit_wait"):
+                await self._limiter.acquire()
+        try:
+            async with self._browser_manager.page(ssr_only=True) as page:
+                detail_page = ListingDetailPage(page, self._settings.detail_base_url)
+                with phase("navigate"):
+                    status = await detail_page.load_listing(listing.source_id)
+                with phase("evaluate"):
+                    json_str = await detail_page.extract_next_data()
+        except Exception:
+            if self._limiter:
+                self._limiter.record_throttle("navigation error")
+            raise
+
+        if status in NOT_FOUND_STATUSES:
+            if self._limiter:
+                self._limiter.record_success()
+            raise ListingNotFoundError(listing.source_id, status)
+        if self._limiter:
+            if is_throttle_status(status):
+                self._limiter.record_throttle(f"HTTP {status}")
+            elif not json_str:
+                self._limiter.record_throttle("empty __NEXT_DATA__")
+            else:
+                self._limiter.record_success()
+        if not json_str:
+            raise EmptyPayloadError(listing.source_id)
+        return json_str
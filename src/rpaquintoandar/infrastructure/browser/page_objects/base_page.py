@@ -4,18 +4,20 @@ import logging
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
-    from playwright.async_api import Page
+    from playwright.async_api import Page, Response
 
 logger = logging.getLogger(__name__)
 
 
 class BasePage:
+    """Wraps a page borrowed from the browser manager's pool.
+
+    The page is owned by the pool, so page objects never close it.
+    """
+
     def __init__(self, page: Page) -> None:
         self._page = page
 
-    async def navigate(self, url: str) -> None:
+    async def navigate(self, url: str) -> Response | None:
         logger.debug("Navigating to %s", url)
-        await self._page.goto(url, wait_until="domcontentloaded")
-
-    async def close(self) -> None:
-        await self._page.close()
+        return await self._page.goto(url, wait_until="domcontentloaded")
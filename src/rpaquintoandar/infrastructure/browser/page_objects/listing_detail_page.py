@@ -3,6 +3,7 @@ from __future__ import annotations
 import logging
 from typing import TYPE_CHECKING
 
+from rpaquintoandar.infrastructure.api.next_data import DETAIL_PROJECTION, PROJECT_NEXT_DATA_JS
 from rpaquintoandar.infrastructure.browser.page_objects.base_page import BasePage
 
 if TYPE_CHECKING:
@@ -16,20 +17,15 @@ class ListingDetailPage(BasePage):
         super().__init__(page)
         self._detail_base_url = detail_base_url
 
-    async def load_listing(self, listing_id: str) -> None:
+    async def load_listing(self, listing_id: str) -> int | None:
+        """Navigate to the listing and return the document's HTTP status."""
         url = f"{self._detail_base_url}/{listing_id}"
-        await self.navigate(url)
+        response = await self.navigate(url)
         await self._page.wait_for_load_state("domcontentloaded")
+        return response.status if response is not None else None
 
-    async def extract_next_data(self) -> str:
-        result = await self._page.evaluate(
-            """
-            () => {
-                const el = document.querySelector('script#__NEXT_DATA__');
-                return el ? el.textContent : '';
-            }
-            """
-        )
+    async def extract_next_data(self, paths: tuple[str, ...] = DETAIL_PROJECTION) -> str:
+        result = await self._page.evaluate(PROJECT_NEXT_DATA_JS, list(paths))
         json_str = result or ""
         if json_str:
             logger.debug("Extracted __NEXT_DATA__ (%d chars)", len(json_str))
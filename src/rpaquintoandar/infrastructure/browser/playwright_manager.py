@@ -1,21 +1,53 @@
 from __future__ import annotations
 
+import asyncio
 import logging
 import os
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
 from pathlib import Path
 
-from playwright.async_api import Browser, Page, Playwright, async_playwright
+from playwright.async_api import Browser, BrowserContext, Page, Playwright, async_playwright
 
+from rpaquintoandar.infrastructure.browser.route_blocker import RouteBlocker
 from rpaquintoandar.infrastructure.config.settings_loader import BrowserSettings
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_PROFILE = "default"
+SSR_PROFILE = "ssr"
+
+
+@dataclass(slots=True)
+class _PooledPage:
+    context: BrowserContext
+    page: Page
+    profile: str = DEFAULT_PROFILE
+    uses: int = 0
+
 
 class PlaywrightBrowserManager:
+    """Owns the browser and a fixed pool of warmed context/page pairs.
+
+    Callers borrow a page with ``async with manager.page() as page`` and
+    must not close it. A slot is recycled (context closed and recreated on
+    next acquire) after ``page_max_uses`` navigations or when the borrower
+    raised, so a broken page never goes back into rotation.
+
+    Every context routes requests through a ``RouteBlocker`` (images, fonts,
+    media, trackers, third-party hosts). ``page(ssr_only=True)`` borrows from
+    a separate JavaScript-disabled pool when ``ssr_only_detail`` is enabled,
+    since ``__NEXT_DATA__`` is server-rendered.
+    """
+
     def __init__(self, settings: BrowserSettings) -> None:
         self._settings = settings
         self._playwright: Playwright | None = None
         self._browser: Browser | None = None
+        self._pools: dict[str, asyncio.Queue[_PooledPage | None]] = {}
+        self._blocker = RouteBlocker(settings) if settings.block_resources else None
+        self._recycled = 0
 
     async def start(self) -> None:
         self._set_local_browsers_path()
@@ -24,13 +56,31 @@ class PlaywrightBrowserManager:
             headless=self._settings.headless,
             slow_mo=self._settings.slow_mo_ms,
         )
+        await self._warm_pool(DEFAULT_PROFILE)
+        if self._settings.ssr_only_detail:
+            await self._warm_pool(SSR_PROFILE)
         logger.info(
-            "Browser started (headless=%s, slow_mo=%dms)",
+            "Browser started (headless=%s, slow_mo=%dms, pool=%d, max_uses=%d, "
+            "blocking=%s, ssr_only_detail=%s)",
             self._settings.headless,
             self._settings.slow_mo_ms,
+            self._settings.pool_size,
+            self._settings.page_max_uses,
+            self._blocker is not None,
+            self._settings.ssr_only_detail,
         )
 
     async def stop(self) -> None:
+        if self._pools:
+            for pool in self._pools.values():
+                while not pool.empty():
+                    slot = pool.get_nowait()
+                    if slot is not None:
+                        await self._dispose(slot)
+            self._pools = {}
+            logger.info("Page pool drained (recycled=%d)", self._recycled)
+        if self._blocker is not None:
+            self._blocker.log_summary()
         if self._browser:
             await self._browser.close()
             self._browser = None
@@ -47,14 +97,77 @@ class PlaywrightBrowserManager:
                 os.environ["PLAYWRIGHT_BROWSERS_PATH"] = str(local_path)
                 logger.info("Using local browsers at %s", local_path)
 
-    async def new_page(self) -> Page:
+    @property
+    def route_blocker(self) -> RouteBlocker | None:
+        return self._blocker
+
+    async def _warm_pool(self, profile: str = DEFAULT_PROFILE) -> None:
+        pool: asyncio.Queue[_PooledPage | None] = asyncio.Queue()
+        for _ in range(max(1, self._settings.pool_size)):
+            pool.put_nowait(await self._create_slot(profile))
+        self._pools[profile] = pool
+
+    @asynccontextmanager
+    async def page(self, ssr_only: bool = False) -> AsyncIterator[Page]:
+        profile = SSR_PROFILE if ssr_only and SSR_PROFILE in self._pools else DEFAULT_PROFILE
+        slot = await self._acquire(profile)
+        healthy = False
+        try:
+            yield slot.page
+            healthy = True
+        finally:
+            await self._release(slot, healthy)
+
+    async def _acquire(self, profile: str) -> _PooledPage:
+        pool = self._pools.get(profile)
+        assert pool is not None, "Browser not started"
+        slot = await pool.get()
+        if slot is not None and not slot.page.is_closed():
+            return slot
+        try:
+            if slot is not None:
+                await self._dispose(slot)
+            return await self._create_slot(profile)
+        except BaseException:
+            pool.put_nowait(None)
+            raise
+
+    async def _release(self, slot: _PooledPage, healthy: bool) -> None:
+        pool = self._pools.get(slot.profile)
+        if pool is None:
+            # Manager stopped while the page was borrowed
+            await self._dispose(slot)
+            return
+        slot.uses += 1
+        if healthy and slot.uses < self._settings.page_max_uses and not slot.page.is_closed():
+            pool.put_nowait(slot)
+            return
+
+        self._recycled += 1
+        try:
+            await self._dispose(slot)
+        finally:
+            # Recreated lazily on the next acquire
+            pool.put_nowait(None)
+
+    async def _create_slot(self, profile: str) -> _PooledPage:
         assert self._browser is not None, "Browser not started"
         context = await self._browser.new_context(
             viewport={
                 "width": self._settings.viewport_width,
                 "height": self._settings.viewport_height,
             },
+            java_script_enabled=profile != SSR_PROFILE,
         )
         context.set_default_timeout(self._settings.timeout_ms)
+        if self._blocker is not None:
+            await context.route("**/*", self._blocker.handle)
         page = await context.new_page()
-        return page
+        return _PooledPage(context=context, page=page, profile=profile)
+
+    @staticmethod
+    async def _dispose(slot: _PooledPage) -> None:
+        try:
+            await slot.context.close()
+        except Exception:
+            logger.debug("Error closing browser context", exc_info=True)
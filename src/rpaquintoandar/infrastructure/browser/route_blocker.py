@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import logging
+from collections import Counter
+from typing import TYPE_CHECKING
+from urllib.parse import urlparse
+
+from rpaquintoandar.infrastructure.config.settings_loader import BrowserSettings
+
+if TYPE_CHECKING:
+    from playwright.async_api import Route
+
+logger = logging.getLogger(__name__)
+
+# Aborted requests never produce a response, so their size is unknown.
+# Savings are estimated from typical transfer sizes on QuintoAndar pages.
+TYPICAL_RESOURCE_BYTES = {
+    "image": 60_000,
+    "media": 500_000,
+    "font": 40_000,
+    "stylesheet": 25_000,
+    "script": 80_000,
+    "xhr": 5_000,
+    "fetch": 5_000,
+}
+DEFAULT_RESOURCE_BYTES = 10_000
+
+
+def _host_matches(host: str, patterns: list[str]) -> bool:
+    return any(host == p or host.endswith(f".{p}") for p in patterns)
+
+
+class RouteBlocker:
+    """Route handler that aborts resources we never read.
+
+    A request is aborted when its resource type is in
+    ``blocked_resource_types``, its host is in ``blocked_hosts``, or
+    ``allowed_hosts`` is non-empty and the host is not in it (third party).
+    Host patterns match the host itself and any subdomain.
+    """
+
+    def __init__(self, settings: BrowserSettings) -> None:
+        self._resource_types = frozenset(settings.blocked_resource_types)
+        self._blocked_hosts = list(settings.blocked_hosts)
+        self._allowed_hosts = list(settings.allowed_hosts)
+        self.aborted: Counter[str] = Counter()
+        self.allowed = 0
+
+    def should_block(self, resource_type: str, url: str) -> bool:
+        if resource_type in self._resource_types:
+            return True
+        host = urlparse(url).hostname or ""
+        if not host:
+            return False
+        if _host_matches(host, self._blocked_hosts):
+            return True
+        return bool(self._allowed_hosts) and not _host_matches(host, self._allowed_hosts)
+
+    async def handle(self, route: Route) -> None:
+        request = route.request
+        if self.should_block(request.resource_type, request.url):
+            self.aborted[request.resource_type] += 1
+            await route.abort()
+            return
+        self.allowed += 1
+        await route.continue_()
+
+    @property
+    def estimated_bytes_saved(self) -> int:
+        return sum(
+            count * TYPICAL_RESOURCE_BYTES.get(rtype, DEFAULT_RESOURCE_BYTES)
+            for rtype, count in self.aborted.items()
+        )
+
+    def log_summary(self) -> None:
+        total = sum(self.aborted.values())
+        logger.info(
+            "Route blocking: aborted=%d allowed=%d ~%.1f MB saved (%s)",
+            total,
+            self.allowed,
+            self.estimated_bytes_saved / 1_000_000,
+            ", ".join(f"{k}={v}" for k, v in self.aborted.most_common()) or "none",
+        )
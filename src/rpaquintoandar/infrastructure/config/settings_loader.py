@@ -12,7 +12,52 @@ class ApiSettings:
         "https://apigw.prod.quintoandar.com.br/house-listing-search/v2/search/count"
     )
     timeout_seconds: float = 30.0
-    delay_between_requests_ms: int = 1500
+    # The coordinates API returns at most this many hits per viewport
+    coordinates_hit_cap: int = 10000
+    # Saturated tiles are not split below this size (degrees per side)
+    min_viewport_degrees: float = 0.002
+    # Viewport tiles fetched at once over the shared HTTP client
+    coordinates_concurrency: int = 4
+    # Price bands still capped at the smallest viewport are bisected down to this width
+    min_price_band: float = 10000.0
+    # Captured coordinates requests are replayed from here for capture_ttl_hours
+    # before the search page is loaded again; empty path disables the cache
+    capture_cache_path: str = "data/coordinates_capture.json"
+    capture_ttl_hours: float = 24.0
+
+
+@dataclass(slots=True)
+class HttpSettings:
+    """Pool of the HTTP client shared by the API client, collector and extractor."""
+
+    http2: bool = True  # needs the optional ``h2`` package; HTTP/1.1 otherwise
+    max_connections: int = 20
+    max_keepalive_connections: int = 10
+    keepalive_expiry_seconds: float = 30.0
+
+
+@dataclass(slots=True)
+class EndpointRateSettings:
+    initial_rps: float = 1.0
+    min_rps: float = 0.1
+    max_rps: float = 4.0
+    burst: float = 1.0
+
+
+def _default_endpoint_rates() -> dict[str, EndpointRateSettings]:
+    return {
+        "detail": EndpointRateSettings(initial_rps=2.0, min_rps=0.2, max_rps=8.0, burst=4.0),
+        "search": EndpointRateSettings(initial_rps=0.7, min_rps=0.1, max_rps=2.0),
+        "coordinates": EndpointRateSettings(initial_rps=1.0, min_rps=0.1, max_rps=4.0, burst=2.0),
+        "count": EndpointRateSettings(initial_rps=0.7, min_rps=0.1, max_rps=2.0),
+    }
+
+
+@dataclass(slots=True)
+class RateLimitSettings:
+    increase_step: float = 0.05
+    decrease_factor: float = 0.5
+    endpoints: dict[str, EndpointRateSettings] = field(default_factory=_default_endpoint_rates)
 
 
 @dataclass(slots=True)
@@ -22,6 +67,25 @@ class BrowserSettings:
     slow_mo_ms: int = 100
     viewport_width: int = 1280
     viewport_height: int = 720
+    pool_size: int = 4
+    page_max_uses: int = 50
+    block_resources: bool = True
+    blocked_resource_types: list[str] = field(
+        default_factory=lambda: ["image", "media", "font", "stylesheet"]
+    )
+    blocked_hosts: list[str] = field(
+        default_factory=lambda: [
+            "google-analytics.com",
+            "googletagmanager.com",
+            "doubleclick.net",
+            "facebook.net",
+            "hotjar.com",
+            "clarity.ms",
+            "nr-data.net",
+        ]
+    )
+    allowed_hosts: list[str] = field(default_factory=lambda: ["quintoandar.com.br"])
+    ssr_only_detail: bool = False
 
 
 @dataclass(slots=True)
@@ -30,6 +94,27 @@ class ScrapingSettings:
     max_pages: int = 50
     retry_attempts: int = 3
     retry_delay_ms: int = 3000
+    concurrency: int = 1
+    claim_batch_size: int = 50
+    lease_seconds: float = 600.0
+    detail_fetcher: str = "playwright"
+    streaming: bool = False
+    stream_queue_size: int = 64
+
+
+@dataclass(slots=True)
+class ResilienceSettings:
+    max_delay_ms: int = 60000
+    breaker_window: int = 20
+    breaker_failure_ratio: float = 0.5
+    breaker_min_samples: int = 10
+    breaker_cooldown_seconds: float = 30.0
+
+
+@dataclass(slots=True)
+class RefreshSettings:
+    max_age_days: float = 7.0
+    budget_per_run: int = 1000
 
 
 @dataclass(slots=True)
@@ -40,17 +125,40 @@ class SearchSettings:
     target_count: int = 0
     apartment_only: bool = True
     price_ranges: list[dict] = field(default_factory=list)
+    # City bounding box (north/south/east/west) that segmented search subdivides
+    bounding_box: dict[str, float] = field(
+        default_factory=lambda: {"north": -23.356, "south": -24.008, "east": -46.365, "west": -46.826}
+    )
 
 
 @dataclass(slots=True)
 class PersistenceSettings:
     database_path: str = "data/rpaquintoandar.db"
+    write_batch_size: int = 200
+    flush_interval_ms: int = 50
+    reader_pool_size: int = 4
+    checkpoint_interval_seconds: float = 30.0
+    # PRAGMA profile, applied to every connection (journal_mode is always WAL)
+    synchronous: str = "NORMAL"
+    cache_size: int = -65536  # negative = KiB, i.e. 64 MiB per connection
+    mmap_size: int = 268435456
+    temp_store: str = "MEMORY"
+    wal_autocheckpoint: int = 1000
+    busy_timeout: int = 5000
+
+
+@dataclass(slots=True)
+class ArchiveSettings:
+    enabled: bool = True
+    directory: str = "data/archive"
+    segment_max_mb: int = 64
 
 
 @dataclass(slots=True)
 class ExportSettings:
     output_dir: str = "data/export"
     formats: list[str] = field(default_factory=lambda: ["json"])
+    batch_size: int = 500
 
 
 @dataclass(slots=True)
@@ -59,15 +167,28 @@ class LoggingSettings:
     file: str = "data/rpaquintoandar.log"
 
 
+@dataclass(slots=True)
+class ProfilingSettings:
+    mode: str = ""  # "" (off) | cprofile | sampling | tracemalloc
+    output_dir: str = "data/profiles"
+    sample_interval_ms: float = 5.0
+
+
 @dataclass(slots=True)
 class Settings:
     api: ApiSettings = field(default_factory=ApiSettings)
+    http: HttpSettings = field(default_factory=HttpSettings)
+    rate_limit: RateLimitSettings = field(default_factory=RateLimitSettings)
     browser: BrowserSettings = field(default_factory=BrowserSettings)
     scraping: ScrapingSettings = field(default_factory=ScrapingSettings)
+    resilience: ResilienceSettings = field(default_factory=ResilienceSettings)
+    refresh: RefreshSettings = field(default_factory=RefreshSettings)
     search: SearchSettings = field(default_factory=SearchSettings)
     persistence: PersistenceSettings = field(default_factory=PersistenceSettings)
+    archive: ArchiveSettings = field(default_factory=ArchiveSettings)
     export: ExportSettings = field(default_factory=ExportSettings)
     logging: LoggingSettings = field(default_factory=LoggingSettings)
+    profiling: ProfilingSettings = field(default_factory=ProfilingSettings)
 
 
 def load_settings(config_path: str | Path = "config/settings.yaml") -> Settings:
@@ -84,16 +205,55 @@ def load_settings(config_path: str | Path = "config/settings.yaml") -> Settings:
         settings.api = ApiSettings(
             count_url=api.get("count_url", settings.api.count_url),
             timeout_seconds=api.get("timeout_seconds", 30.0),
-            delay_between_requests_ms=api.get("delay_between_requests_ms", 1500),
+            coordinates_hit_cap=api.get("coordinates_hit_cap", 10000),
+            min_viewport_degrees=api.get("min_viewport_degrees", 0.002),
+            coordinates_concurrency=api.get("coordinates_concurrency", 4),
+            min_price_band=api.get("min_price_band", 10000.0),
+            capture_cache_path=api.get("capture_cache_path", "data/coordinates_capture.json"),
+            capture_ttl_hours=api.get("capture_ttl_hours", 24.0),
+        )
+
+    if http := raw.get("http"):
+        settings.http = HttpSettings(
+            http2=http.get("http2", True),
+            max_connections=http.get("max_connections", 20),
+            max_keepalive_connections=http.get("max_keepalive_connections", 10),
+            keepalive_expiry_seconds=http.get("keepalive_expiry_seconds", 30.0),
+        )
+
+    if rate_limit := raw.get("rate_limit"):
+        endpoints = _default_endpoint_rates()
+        for name, cfg in (rate_limit.get("endpoints") or {}).items():
+            base = endpoints.get(name, EndpointRateSettings())
+            endpoints[name] = EndpointRateSettings(
+                initial_rps=cfg.get("initial_rps", base.initial_rps),
+                min_rps=cfg.get("min_rps", base.min_rps),
+                max_rps=cfg.get("max_rps", base.max_rps),
+                burst=cfg.get("burst", base.burst),
+            )
+        settings.rate_limit = RateLimitSettings(
+            increase_step=rate_limit.get("increase_step", 0.05),
+            decrease_factor=rate_limit.get("decrease_factor", 0.5),
+            endpoints=endpoints,
         )
 
     if browser := raw.get("browser"):
+        blocking = browser.get("blocking", {})
         settings.browser = BrowserSettings(
             headless=browser.get("headless", True),
             timeout_ms=browser.get("timeout_ms", 30000),
             slow_mo_ms=browser.get("slow_mo_ms", 100),
             viewport_width=browser.get("viewport", {}).get("width", 1280),
             viewport_height=browser.get("viewport", {}).get("height", 720),
+            pool_size=browser.get("pool_size", 4),
+            page_max_uses=browser.get("page_max_uses", 50),
+            block_resources=blocking.get("enabled", True),
+            blocked_resource_types=blocking.get(
+                "resource_types", settings.browser.blocked_resource_types
+            ),
+            blocked_hosts=blocking.get("blocked_hosts", settings.browser.blocked_hosts),
+            allowed_hosts=blocking.get("allowed_hosts", settings.browser.allowed_hosts),
+            ssr_only_detail=browser.get("ssr_only_detail", False),
         )
 
     if scraping := raw.get("scraping"):
@@ -102,6 +262,27 @@ def load_settings(config_path: str | Path = "config/settings.yaml") -> Settings:
             max_pages=scraping.get("max_pages", 50),
             retry_attempts=scraping.get("retry_attempts", 3),
             retry_delay_ms=scraping.get("retry_delay_ms", 3000),
+            concurrency=scraping.get("concurrency", 1),
+            claim_batch_size=scraping.get("claim_batch_size", 50),
+            lease_seconds=scraping.get("lease_seconds", 600.0),
+            detail_fetcher=scraping.get("detail_fetcher", "playwright"),
+            streaming=scraping.get("streaming", False),
+            stream_queue_size=scraping.get("stream_queue_size", 64),
+        )
+
+    if resilience := raw.get("resilience"):
+        settings.resilience = ResilienceSettings(
+            max_delay_ms=resilience.get("max_delay_ms", 60000),
+            breaker_window=resilience.get("breaker_window", 20),
+            breaker_failure_ratio=resilience.get("breaker_failure_ratio", 0.5),
+            breaker_min_samples=resilience.get("breaker_min_samples", 10),
+            breaker_cooldown_seconds=resilience.get("breaker_cooldown_seconds", 30.0),
+        )
+
+    if refresh := raw.get("refresh"):
+        settings.refresh = RefreshSettings(
+            max_age_days=refresh.get("max_age_days", 7.0),
+            budget_per_run=refresh.get("budget_per_run", 1000),
         )
 
     if search := raw.get("search"):
@@ -112,17 +293,36 @@ def load_settings(config_path: str | Path = "config/settings.yaml") -> Settings:
             target_count=search.get("target_count", 0),
             apartment_only=search.get("apartment_only", True),
             price_ranges=search.get("price_ranges", []),
+            bounding_box=search.get("bounding_box") or settings.search.bounding_box,
         )
 
     if persistence := raw.get("persistence"):
         settings.persistence = PersistenceSettings(
             database_path=persistence.get("database_path", "data/rpaquintoandar.db"),
+            write_batch_size=persistence.get("write_batch_size", 200),
+            flush_interval_ms=persistence.get("flush_interval_ms", 50),
+            reader_pool_size=persistence.get("reader_pool_size", 4),
+            checkpoint_interval_seconds=persistence.get("checkpoint_interval_seconds", 30.0),
+            synchronous=persistence.get("synchronous", "NORMAL"),
+            cache_size=persistence.get("cache_size", -65536),
+            mmap_size=persistence.get("mmap_size", 268435456),
+            temp_store=persistence.get("temp_store", "MEMORY"),
+            wal_autocheckpoint=persistence.get("wal_autocheckpoint", 1000),
+            busy_timeout=persistence.get("busy_timeout", 5000),
+        )
+
+    if archive := raw.get("archive"):
+        settings.archive = ArchiveSettings(
+            enabled=archive.get("enabled", True),
+            directory=archive.get("directory", "data/archive"),
+            segment_max_mb=archive.get("segment_max_mb", 64),
         )
 
     if export_cfg := raw.get("export"):
         settings.export = ExportSettings(
             output_dir=export_cfg.get("output_dir", "data/export"),
             formats=export_cfg.get("formats", ["json"]),
+            batch_size=export_cfg.get("batch_size", 500),
         )
 
     if logging_cfg := raw.get("logging"):
@@ -131,4 +331,11 @@ def load_settings(config_path: str | Path = "config/settings.yaml") -> Settings:
             file=logging_cfg.get("file", "data/rpaquintoandar.log"),
         )
 
+    if profiling_cfg := raw.get("profiling"):
+        settings.profiling = ProfilingSettings(
+            mode=profiling_cfg.get("mode") or "",
+            output_dir=profiling_cfg.get("output_dir", "data/profiles"),
+            sample_interval_ms=profiling_cfg.get("sample_interval_ms", 5.0),
+        )
+
     return settings
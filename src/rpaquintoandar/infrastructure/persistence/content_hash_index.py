@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_left
+from collections.abc import Iterable
+
+from rpaquintoandar.domain.value_objects import ContentHash
+
+# Pending additions are merged into the sorted array once they reach this size
+MERGE_THRESHOLD = 4096
+
+
+def hash_key(content_hash: ContentHash | str) -> int:
+    """The first 64 bits of a hex SHA-256 digest, as an unsigned int."""
+    return int(str(content_hash)[:16], 16)
+
+
+class ContentHashIndex:
+    """Compact set of 64-bit content-hash prefixes.
+
+    Keys live in a sorted ``array('Q')`` (8 bytes each, about 8 MB per
+    million hashes) searched by bisection, plus a small set of recent
+    additions that is merged in periodically. A miss is definitive; a hit
+    is "probably present" and should be confirmed against the database,
+    both because prefixes can collide and because keys are never removed
+    when a listing's hash changes.
+    """
+
+    def __init__(self) -> None:
+        self._sorted = array("Q")
+        self._pending: set[int] = set()
+
+    def load(self, keys: Iterable[int]) -> None:
+        """Merge a bulk of keys, e.g. every hash already in the database."""
+        merged = set(keys)
+        merged.update(self._sorted)
+        merged.update(self._pending)
+        self._sorted = array("Q", sorted(merged))
+        self._pending.clear()
+
+    def add(self, content_hash: ContentHash | str) -> None:
+        key = hash_key(content_hash)
+        if key in self._pending or self._in_sorted(key):
+            return
+        self._pending.add(key)
+        if len(self._pending) >= MERGE_THRESHOLD:
+            self.load(())
+
+    def might_contain(self, content_hash: ContentHash | str) -> bool:
+        key = hash_key(content_hash)
+        return key in self._pending or self._in_sorted(key)
+
+    def _in_sorted(self, key: int) -> bool:
+        i = bisect_left(self._sorted, key)
+        return i < len(self._sorted) and self._sorted[i] == key
+
+    def __len__(self) -> int:
+        return len(self._sorted) + len(self._pending)
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory held by the keys."""
+        return self._sorted.itemsize * len(self._sorted) + 32 * len(self._pending)
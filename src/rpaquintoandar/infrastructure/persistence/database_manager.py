@@ -1,12 +1,25 @@
 from __future__ import annotations
 
+import asyncio
+import contextlib
 import logging
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
 from pathlib import Path
+from typing import Any, TypeVar
 
 import aiosqlite
 
+from rpaquintoandar.infrastructure.config.settings_loader import PersistenceSettings
+
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+SYNCHRONOUS_MODES = frozenset({"OFF", "NORMAL", "FULL", "EXTRA"})
+TEMP_STORE_MODES = frozenset({"DEFAULT", "FILE", "MEMORY"})
+CHECKPOINT_MODES = frozenset({"PASSIVE", "FULL", "RESTART", "TRUNCATE"})
+
 MIGRATIONS = [
     # Migration 0: initial schema
     """
@@ -80,13 +93,89 @@ MIGRATIONS = [
     );
     INSERT OR IGNORE INTO schema_version (version) VALUES (0);
     """,
+    # Migration 1: fetch timestamp for TTL-based refresh scheduling
+    """
+    ALTER TABLE listings ADD COLUMN last_fetched_at TEXT;
+    UPDATE listings SET last_fetched_at = updated_at
+        WHERE status IN ('enriched', 'duplicate');
+    CREATE INDEX IF NOT EXISTS idx_listings_refresh ON listings(status, last_fetched_at);
+    INSERT OR IGNORE INTO schema_version (version) VALUES (1);
+    """,
+    # Migration 2: leases for claim-based extraction across processes
+    """
+    ALTER TABLE listings ADD COLUMN lease_owner TEXT;
+    ALTER TABLE listings ADD COLUMN lease_expires_at TEXT;
+    CREATE INDEX IF NOT EXISTS idx_listings_lease ON listings(status, lease_expires_at);
+    INSERT OR IGNORE INTO schema_version (version) VALUES (2);
+    """,
+    # Migration 3: per-phase latency percentiles of each step
+    """
+    CREATE TABLE IF NOT EXISTS step_metrics (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        execution_run_id INTEGER NOT NULL,
+        step_record_id INTEGER,
+        step_name TEXT NOT NULL,
+        phase TEXT NOT NULL,
+        samples INTEGER NOT NULL,
+        total_ms REAL NOT NULL,
+        p50_ms REAL NOT NULL,
+        p95_ms REAL NOT NULL,
+        p99_ms REAL NOT NULL,
+        max_ms REAL NOT NULL,
+        FOREIGN KEY (execution_run_id) REFERENCES execution_runs(id),
+        FOREIGN KEY (step_record_id) REFERENCES step_records(id)
+    );
+    CREATE INDEX IF NOT EXISTS idx_step_metrics_run ON step_metrics(execution_run_id);
+    INSERT OR IGNORE INTO schema_version (version) VALUES (3);
+    """,
+    # Migration 4: content hashes moved to canonical JSON of the projected payload;
+    # make every enriched row due for refresh so --mode refresh rehashes it
+    """
+    UPDATE listings SET last_fetched_at = NULL WHERE status = 'enriched';
+    INSERT OR IGNORE INTO schema_version (version) VALUES (4);
+    """,
 ]
 
 
+WriteOp = Callable[[aiosqlite.Connection], Awaitable[T]]
+# A write and its result future, a flush request, or None to stop the writer
+_QueueItem = tuple[WriteOp[Any], asyncio.Future[Any]] | asyncio.Future[None] | None
+
+
 class DatabaseManager:
-    def __init__(self, db_path: str) -> None:
+    """Owns the SQLite connection and its single writer task.
+
+    Mutations are not committed by the caller. ``write`` queues an
+    operation for the writer task, which runs it on the connection and
+    resolves the caller's future as soon as the statement has been
+    applied. Commits are grouped: the open transaction is committed once
+    ``write_batch_size`` operations have been applied or
+    ``flush_interval_ms`` has passed since the first uncommitted one.
+    ``flush`` is the explicit durability point, and ``close`` flushes.
+
+    Point lookups on ``connection`` share it with the writer and so see
+    applied but uncommitted writes. Scans borrow a read-only connection
+    from ``reader()``, which runs concurrently with the writer under WAL
+    but only sees committed data.
+
+    A background task checkpoints the WAL every
+    ``checkpoint_interval_seconds`` (PASSIVE, so it never blocks readers),
+    which keeps the WAL from growing unbounded during long crawls.
+    """
+
+    def __init__(self, db_path: str, settings: PersistenceSettings | None = None) -> None:
         self._db_path = db_path
+        self._settings = settings or PersistenceSettings(database_path=db_path)
         self._connection: aiosqlite.Connection | None = None
+        self._write_batch_size = max(1, self._settings.write_batch_size)
+        self._flush_interval = self._settings.flush_interval_ms / 1000.0
+        self._queue: asyncio.Queue[_QueueItem] | None = None
+        self._writer: asyncio.Task[None] | None = None
+        self._readers: asyncio.Queue[aiosqlite.Connection] | None = None
+        self._reader_connections: list[aiosqlite.Connection] = []
+        self._checkpointer: asyncio.Task[None] | None = None
+        self.writes_applied = 0
+        self.commits = 0
 
     async def initialize(self) -> None:
         Path(self._db_path).parent.mkdir(parents=True, exist_ok=True)
@@ -94,9 +183,90 @@ class DatabaseManager:
         self._connection.row_factory = aiosqlite.Row
         await self._connection.execute("PRAGMA journal_mode=WAL")
         await self._connection.execute("PRAGMA foreign_keys=ON")
+        await self._apply_pragmas(self._connection)
+        await self._connection.execute(
+            f"PRAGMA wal_autocheckpoint={int(self._settings.wal_autocheckpoint)}"
+        )
         await self._run_migrations()
+        if self._writer is None:
+            self._queue = asyncio.Queue()
+            self._writer = asyncio.create_task(self._write_loop(), name="sqlite-writer")
+        if self._readers is None and self._settings.reader_pool_size > 0:
+            await self._open_readers(self._settings.reader_pool_size)
+        if self._checkpointer is None and self._settings.checkpoint_interval_seconds > 0:
+            self._checkpointer = asyncio.create_task(
+                self._checkpoint_loop(), name="sqlite-checkpointer"
+            )
         logger.info("Database initialized at %s", self._db_path)
 
+    async def _apply_pragmas(self, conn: aiosqlite.Connection) -> None:
+        synchronous = self._settings.synchronous.upper()
+        temp_store = self._settings.temp_store.upper()
+        if synchronous not in SYNCHRONOUS_MODES:
+            raise ValueError(f"Invalid persistence.synchronous: {self._settings.synchronous}")
+        if temp_store not in TEMP_STORE_MODES:
+            raise ValueError(f"Invalid persistence.temp_store: {self._settings.temp_store}")
+        await conn.execute(f"PRAGMA synchronous={synchronous}")
+        await conn.execute(f"PRAGMA cache_size={int(self._settings.cache_size)}")
+        await conn.execute(f"PRAGMA mmap_size={int(self._settings.mmap_size)}")
+        await conn.execute(f"PRAGMA temp_store={temp_store}")
+        await conn.execute(f"PRAGMA busy_timeout={int(self._settings.busy_timeout)}")
+
+    async def _open_readers(self, size: int) -> None:
+        uri = f"{Path(self._db_path).resolve().as_uri()}?mode=ro"
+        self._readers = asyncio.Queue()
+        for _ in range(size):
+            conn = await aiosqlite.connect(uri, uri=True)
+            conn.row_factory = aiosqlite.Row
+            await self._apply_pragmas(conn)
+            self._reader_connections.append(conn)
+            self._readers.put_nowait(conn)
+
+    @asynccontextmanager
+    async def reader(self) -> AsyncIterator[aiosqlite.Connection]:
+        """Borrow a read-only connection; it sees committed data only.
+
+        Call ``flush`` first when the read must include this process's
+        own recent writes.
+        """
+        if self._readers is None:
+            yield self.connection
+            return
+        conn = await self._readers.get()
+        try:
+            yield conn
+        finally:
+            self._readers.put_nowait(conn)
+
+    async def checkpoint(self, mode: str = "PASSIVE") -> tuple[int, int, int]:
+        """Checkpoint the WAL through the writer; returns (busy, wal_pages, checkpointed)."""
+        if mode not in CHECKPOINT_MODES:
+            raise ValueError(f"Invalid checkpoint mode: {mode}")
+
+        async def op(conn: aiosqlite.Connection) -> tuple[int, int, int]:
+            # A checkpoint cannot include the writer's own open transaction
+            await conn.commit()
+            cursor = await conn.execute(f"PRAGMA wal_checkpoint({mode})")
+            row = await cursor.fetchone()
+            return (row[0], row[1], row[2]) if row else (0, 0, 0)
+
+        return await self.write(op)
+
+    async def _checkpoint_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self._settings.checkpoint_interval_seconds)
+            try:
+                busy, wal_pages, checkpointed = await self.checkpoint()
+            except Exception:
+                logger.exception("WAL checkpoint failed")
+                continue
+            logger.debug(
+                "WAL checkpoint: %d/%d pages checkpointed%s",
+                checkpointed,
+                wal_pages,
+                " (readers busy)" if busy else "",
+            )
+
     async def _run_migrations(self) -> None:
         conn = self.connection
 
@@ -123,8 +293,104 @@ class DatabaseManager:
         assert self._connection is not None, "Database not initialized"
         return self._connection
 
+    async def write(self, op: WriteOp[T]) -> T:
+        """Run ``op`` on the writer task; returns once applied, without waiting for a commit."""
+        if self._queue is None:
+            result = await op(self.connection)
+            await self.connection.commit()
+            return result
+        future: asyncio.Future[T] = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((op, future))
+        return await future
+
+    async def flush(self) -> None:
+        """Durability point: returns once every write queued before it is committed."""
+        if self._queue is None:
+            return
+        future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait(future)
+        await future
+
+    async def _write_loop(self) -> None:
+        assert self._queue is not None
+        queue = self._queue
+        loop = asyncio.get_running_loop()
+        uncommitted = 0
+        deadline = 0.0
+
+        while True:
+            if uncommitted and loop.time() >= deadline:
+                await self._commit()
+                uncommitted = 0
+            timeout = deadline - loop.time() if uncommitted else None
+            try:
+                item = await asyncio.wait_for(queue.get(), timeout)
+            except TimeoutError:
+                continue
+
+            if item is None:
+                await self._commit()
+                return
+            if isinstance(item, asyncio.Future):
+                error = await self._commit()
+                uncommitted = 0
+                if not item.done():
+                    if error is None:
+                        item.set_result(None)
+                    else:
+                        item.set_exception(error)
+                continue
+
+            op, future = item
+            try:
+                result = await op(self.connection)
+            except Exception as exc:
+                if not future.done():
+                    future.set_exception(exc)
+            else:
+                if not future.done():
+                    future.set_result(result)
+            self.writes_applied += 1
+            uncommitted += 1
+            if uncommitted == 1:
+                deadline = loop.time() + self._flush_interval
+            if uncommitted >= self._write_batch_size:
+                await self._commit()
+                uncommitted = 0
+
+    async def _commit(self) -> Exception | None:
+        try:
+            await self.connection.commit()
+        except Exception as exc:
+            logger.exception("Group commit failed")
+            return exc
+        self.commits += 1
+        return None
+
     async def close(self) -> None:
+        if self._checkpointer is not None:
+            self._checkpointer.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._checkpointer
+            self._checkpointer = None
+        for conn in self._reader_connections:
+            await conn.close()
+        self._reader_connections.clear()
+        self._readers = None
+        if self._writer is not None and self._queue is not None:
+            self._queue.put_nowait(None)
+            await self._writer
+            logger.info(
+                "Writer: %d writes applied in %d commits",
+                self.writes_applied,
+                self.commits,
+            )
+        self._writer = None
+        self._queue = None
         if self._connection:
+            # Fold the WAL back into the main file so it does not linger
+            with contextlib.suppress(Exception):
+                await self._connection.execute("PRAGMA wal_checkpoint(TRUNCATE)")
             await self._connection.close()
             self._connection = None
             logger.info("Database connection closed")
@@ -3,7 +3,9 @@ from __future__ import annotations
 import logging
 from datetime import datetime
 
-from rpaquintoandar.domain.entities import ExecutionRun, StepRecord
+import aiosqlite
+
+from rpaquintoandar.domain.entities import ExecutionRun, StepMetric, StepRecord
 from rpaquintoandar.domain.enums import StepStatus
 from rpaquintoandar.infrastructure.persistence.database_manager import DatabaseManager
 
@@ -15,80 +17,187 @@ class SqliteExecutionRepo:
         self._db = db_manager
 
     async def create_run(self, run: ExecutionRun) -> ExecutionRun:
-        conn = self._db.connection
-        cursor = await conn.execute(
-            """
-            INSERT INTO execution_runs (mode, status, started_at, finished_at)
-            VALUES (?, ?, ?, ?)
-            """,
-            (
-                run.mode,
-                run.status.value,
-                run.started_at.isoformat(),
-                run.finished_at.isoformat() if run.finished_at else None,
-            ),
-        )
-        await conn.commit()
-        run.id = cursor.lastrowid
+        async def op(conn: aiosqlite.Connection) -> int | None:
+            cursor = await conn.execute(
+                """
+                INSERT INTO execution_runs (mode, status, started_at, finished_at)
+                VALUES (?, ?, ?, ?)
+                """,
+                (
+                    run.mode,
+                    run.status.value,
+                    run.started_at.isoformat(),
+                    run.finished_at.isoformat() if run.finished_at else None,
+                ),
+            )
+            return cursor.lastrowid
+
+        run.id = await self._db.write(op)
         logger.info("Created execution run #%d mode=%s", run.id, run.mode)
         return run
 
     async def update_run(self, run: ExecutionRun) -> None:
-        conn = self._db.connection
-        await conn.execute(
-            """
-            UPDATE execution_runs SET status=?, finished_at=? WHERE id=?
-            """,
-            (
-                run.status.value,
-                run.finished_at.isoformat() if run.finished_at else None,
-                run.id,
-            ),
-        )
-        await conn.commit()
+        async def op(conn: aiosqlite.Connection) -> None:
+            await conn.execute(
+                """
+                UPDATE execution_runs SET status=?, finished_at=? WHERE id=?
+                """,
+                (
+                    run.status.value,
+                    run.finished_at.isoformat() if run.finished_at else None,
+                    run.id,
+                ),
+            )
+
+        await self._db.write(op)
+        # Run and step boundaries are durability points
+        await self._db.flush()
 
     async def create_step(self, step: StepRecord) -> StepRecord:
-        conn = self._db.connection
-        cursor = await conn.execute(
-            """
-            INSERT INTO step_records
-            (execution_run_id, step_name, status, items_processed, items_created,
-             items_failed, error_message, started_at, finished_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                step.execution_run_id,
-                step.step_name,
-                step.status.value,
-                step.items_processed,
-                step.items_created,
-                step.items_failed,
-                step.error_message,
-                step.started_at.isoformat(),
-                step.finished_at.isoformat() if step.finished_at else None,
-            ),
-        )
-        await conn.commit()
-        step.id = cursor.lastrowid
+        async def op(conn: aiosqlite.Connection) -> int | None:
+            cursor = await conn.execute(
+                """
+                INSERT INTO step_records
+                (execution_run_id, step_name, status, items_processed, items_created,
+                 items_failed, error_message, started_at, finished_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    step.execution_run_id,
+                    step.step_name,
+                    step.status.value,
+                    step.items_processed,
+                    step.items_created,
+                    step.items_failed,
+                    step.error_message,
+                    step.started_at.isoformat(),
+                    step.finished_at.isoformat() if step.finished_at else None,
+                ),
+            )
+            return cursor.lastrowid
+
+        step.id = await self._db.write(op)
         return step
 
     async def update_step(self, step: StepRecord) -> None:
-        conn = self._db.connection
-        await conn.execute(
-            """
-            UPDATE step_records
-            SET status=?, items_processed=?, items_created=?, items_failed=?,
-                error_message=?, finished_at=?
-            WHERE id=?
-            """,
+        async def op(conn: aiosqlite.Connection) -> None:
+            await conn.execute(
+                """
+                UPDATE step_records
+                SET status=?, items_processed=?, items_created=?, items_failed=?,
+                    error_message=?, finished_at=?
+                WHERE id=?
+                """,
+                (
+                    step.status.value,
+                    step.items_processed,
+                    step.items_created,
+                    step.items_failed,
+                    step.error_message,
+                    step.finished_at.isoformat() if step.finished_at else None,
+                    step.id,
+                ),
+            )
+
+        await self._db.write(op)
+        await self._db.flush()
+
+    async def save_step_metrics(self, metrics: list[StepMetric]) -> None:
+        if not metrics:
+            return
+        params = [
             (
-                step.status.value,
-                step.items_processed,
-                step.items_created,
-                step.items_failed,
-                step.error_message,
-                step.finished_at.isoformat() if step.finished_at else None,
-                step.id,
-            ),
-        )
-        await conn.commit()
+                m.execution_run_id,
+                m.step_record_id,
+                m.step_name,
+                m.phase,
+                m.samples,
+                m.total_ms,
+                m.p50_ms,
+                m.p95_ms,
+                m.p99_ms,
+                m.max_ms,
+            )
+            for m in metrics
+        ]
+
+        async def op(conn: aiosqlite.Connection) -> None:
+            await conn.executemany(
+                """
+                INSERT INTO step_metrics
+                (execution_run_id, step_record_id, step_name, phase, samples,
+                 total_ms, p50_ms, p95_ms, p99_ms, max_ms)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                params,
+            )
+
+        await self._db.write(op)
+
+    async def get_recent_runs(self, limit: int) -> list[ExecutionRun]:
+        """The ``limit`` most recent runs, oldest first."""
+        await self._db.flush()
+        async with self._db.reader() as conn:
+            cursor = await conn.execute(
+                "SELECT * FROM execution_runs ORDER BY id DESC LIMIT ?", (limit,)
+            )
+            rows = await cursor.fetchall()
+        return [
+            ExecutionRun(
+                mode=r["mode"],
+                status=StepStatus(r["status"]),
+                started_at=datetime.fromisoformat(r["started_at"]),
+                finished_at=datetime.fromisoformat(r["finished_at"]) if r["finished_at"] else None,
+                id=r["id"],
+            )
+            for r in reversed(rows)
+        ]
+
+    async def get_steps(self, execution_run_id: int) -> list[StepRecord]:
+        await self._db.flush()
+        async with self._db.reader() as conn:
+            cursor = await conn.execute(
+                "SELECT * FROM step_records WHERE execution_run_id=? ORDER BY id",
+                (execution_run_id,),
+            )
+            rows = await cursor.fetchall()
+        return [
+            StepRecord(
+                execution_run_id=r["execution_run_id"],
+                step_name=r["step_name"],
+                status=StepStatus(r["status"]),
+                items_processed=r["items_processed"],
+                items_created=r["items_created"],
+                items_failed=r["items_failed"],
+                error_message=r["error_message"] or "",
+                started_at=datetime.fromisoformat(r["started_at"]),
+                finished_at=datetime.fromisoformat(r["finished_at"]) if r["finished_at"] else None,
+                id=r["id"],
+            )
+            for r in rows
+        ]
+
+    async def get_step_metrics(self, execution_run_id: int) -> list[StepMetric]:
+        await self._db.flush()
+        async with self._db.reader() as conn:
+            cursor = await conn.execute(
+                "SELECT * FROM step_metrics WHERE execution_run_id=? ORDER BY id",
+                (execution_run_id,),
+            )
+            rows = await cursor.fetchall()
+        return [
+            StepMetric(
+                execution_run_id=r["execution_run_id"],
+                step_record_id=r["step_record_id"],
+                step_name=r["step_name"],
+                phase=r["phase"],
+                samples=r["samples"],
+                total_ms=r["total_ms"],
+                p50_ms=r["p50_ms"],
+                p95_ms=r["p95_ms"],
+                p99_ms=r["p99_ms"],
+                max_ms=r["max_ms"],
+                id=r["id"],
+            )
+            for r in rows
+        ]
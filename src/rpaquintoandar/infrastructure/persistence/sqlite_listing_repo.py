@@ -1,147 +1,353 @@
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
-from datetime import datetime
+from collections.abc import AsyncIterator, Callable
+from datetime import datetime, timedelta
+
+import aiosqlite
 
 from rpaquintoandar.domain.entities import Listing
 from rpaquintoandar.domain.enums import FurnishedStatus, ProcessingStatus, PropertyType
 from rpaquintoandar.domain.value_objects import Address, ContentHash, Coordinates, PriceInfo
+from rpaquintoandar.infrastructure.persistence.content_hash_index import (
+    ContentHashIndex,
+    hash_key,
+)
 from rpaquintoandar.infrastructure.persistence.database_manager import DatabaseManager
 
 logger = logging.getLogger(__name__)
 
+INSERT_SQL = """
+    INSERT INTO listings
+    (source_id, source_url, property_type,
+     street, number, neighborhood, city, state, zip_code,
+     sale_price, condo_fee, iptu,
+     area_m2, bedrooms, bathrooms, parking_spaces,
+     latitude, longitude, images, amenities,
+     description, building_amenities, unit_amenities,
+     floor_number, total_floors, year_built, furnished,
+     pet_friendly, content_hash, status, last_fetched_at,
+     created_at, updated_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?,
+            ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+# Columns rewritten when an existing row is upserted in full
+UPDATE_COLUMNS = (
+    "property_type", "street", "number", "neighborhood", "city", "state",
+    "zip_code", "sale_price", "condo_fee", "iptu",
+    "area_m2", "bedrooms", "bathrooms", "parking_spaces",
+    "latitude", "longitude", "images", "amenities",
+    "description", "building_amenities", "unit_amenities",
+    "floor_number", "total_floors", "year_built", "furnished",
+    "pet_friendly", "content_hash", "status", "last_fetched_at", "updated_at",
+)  # fmt: skip
+
+CLAIM_SQL = """
+    UPDATE listings
+    SET status=?, lease_owner=?, lease_expires_at=?
+    WHERE id IN (
+        SELECT id FROM listings
+        WHERE status=? OR (status=? AND lease_expires_at < ?)
+        ORDER BY id
+        LIMIT ?
+    )
+    RETURNING *
+"""
+
+CLAIM_SOURCE_IDS_SQL = """
+    UPDATE listings
+    SET status=?, lease_owner=?, lease_expires_at=?
+    WHERE source_id IN (SELECT value FROM json_each(?))
+      AND (status=? OR (status=? AND lease_expires_at < ?))
+    RETURNING *
+"""
+
+UPSERT_SQL = (
+    INSERT_SQL
+    + "ON CONFLICT(source_id) DO UPDATE SET "
+    + ", ".join(f"{column}=excluded.{column}" for column in UPDATE_COLUMNS)
+    + ", lease_owner=NULL, lease_expires_at=NULL RETURNING id"
+)
+
+
+def _pet_friendly(value: bool | None) -> int | None:
+    return 1 if value else (0 if value is False else None)
+
+
+# Listing field -> the column values it is stored as, for partial updates
+FIELD_COLUMNS: dict[str, Callable[[Listing], dict[str, object]]] = {
+    "property_type": lambda l: {"property_type": l.property_type.value},
+    "address": lambda l: {
+        "street": l.address.street,
+        "number": l.address.number,
+        "neighborhood": l.address.neighborhood,
+        "city": l.address.city,
+        "state": l.address.state,
+        "zip_code": l.address.zip_code,
+    },
+    "price": lambda l: {
+        "sale_price": l.price.sale_price,
+        "condo_fee": l.price.condo_fee,
+        "iptu": l.price.iptu,
+    },
+    "area_m2": lambda l: {"area_m2": l.area_m2},
+    "bedrooms": lambda l: {"bedrooms": l.bedrooms},
+    "bathrooms": lambda l: {"bathrooms": l.bathrooms},
+    "parking_spaces": lambda l: {"parking_spaces": l.parking_spaces},
+    "coordinates": lambda l: {
+        "latitude": l.coordinates.latitude if l.coordinates else None,
+        "longitude": l.coordinates.longitude if l.coordinates else None,
+    },
+    "images": lambda l: {"images": json.dumps(l.images)},
+    "amenities": lambda l: {"amenities": json.dumps(l.amenities)},
+    "description": lambda l: {"description": l.description},
+    "building_amenities": lambda l: {"building_amenities": json.dumps(l.building_amenities)},
+    "unit_amenities": lambda l: {"unit_amenities": json.dumps(l.unit_amenities)},
+    "floor_number": lambda l: {"floor_number": l.floor_number},
+    "total_floors": lambda l: {"total_floors": l.total_floors},
+    "year_built": lambda l: {"year_built": l.year_built},
+    "furnished": lambda l: {"furnished": l.furnished.value},
+    "pet_friendly": lambda l: {"pet_friendly": _pet_friendly(l.pet_friendly)},
+    "content_hash": lambda l: {"content_hash": str(l.content_hash) if l.content_hash else ""},
+    "status": lambda l: {"status": l.status.value},
+    "last_fetched_at": lambda l: {
+        "last_fetched_at": l.last_fetched_at.isoformat() if l.last_fetched_at else None
+    },
+}
+
 
 class SqliteListingRepo:
     def __init__(self, db_manager: DatabaseManager) -> None:
         self._db = db_manager
+        self._hash_index = ContentHashIndex()
+        self._hash_index_loaded = False
+        self._hash_index_lock = asyncio.Lock()
 
     async def upsert(self, listing: Listing) -> Listing:
-        conn = self._db.connection
-        existing = await self.get_by_source_id(listing.source_id)
+        """Persist ``listing`` in a single statement.
 
-        if existing:
-            await conn.execute(
-                """
-                UPDATE listings
-                SET property_type=?, street=?, number=?, neighborhood=?, city=?, state=?,
-                    zip_code=?, sale_price=?, condo_fee=?, iptu=?,
-                    area_m2=?, bedrooms=?, bathrooms=?, parking_spaces=?,
-                    latitude=?, longitude=?, images=?, amenities=?,
-                    description=?, building_amenities=?, unit_amenities=?,
-                    floor_number=?, total_floors=?, year_built=?, furnished=?,
-                    pet_friendly=?, content_hash=?, status=?, updated_at=?
-                WHERE source_id=?
-                """,
-                (
-                    listing.property_type.value,
-                    listing.address.street,
-                    listing.address.number,
-                    listing.address.neighborhood,
-                    listing.address.city,
-                    listing.address.state,
-                    listing.address.zip_code,
-                    listing.price.sale_price,
-                    listing.price.condo_fee,
-                    listing.price.iptu,
-                    listing.area_m2,
-                    listing.bedrooms,
-                    listing.bathrooms,
-                    listing.parking_spaces,
-                    listing.coordinates.latitude if listing.coordinates else None,
-                    listing.coordinates.longitude if listing.coordinates else None,
-                    json.dumps(listing.images),
-                    json.dumps(listing.amenities),
-                    listing.description,
-                    json.dumps(listing.building_amenities),
-                    json.dumps(listing.unit_amenities),
-                    listing.floor_number,
-                    listing.total_floors,
-                    listing.year_built,
-                    listing.furnished.value,
-                    1 if listing.pet_friendly else (0 if listing.pet_friendly is False else None),
-                    str(listing.content_hash) if listing.content_hash else "",
-                    listing.status.value,
-                    datetime.now().isoformat(),
-                    listing.source_id,
-                ),
-            )
-            await conn.commit()
-            listing.id = existing.id
-        else:
-            now = datetime.now().isoformat()
-            cursor = await conn.execute(
-                """
-                INSERT INTO listings
-                (source_id, source_url, property_type,
-                 street, number, neighborhood, city, state, zip_code,
-                 sale_price, condo_fee, iptu,
-                 area_m2, bedrooms, bathrooms, parking_spaces,
-                 latitude, longitude, images, amenities,
-                 description, building_amenities, unit_amenities,
-                 floor_number, total_floors, year_built, furnished,
-                 pet_friendly, content_hash, status, created_at, updated_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?,
-                        ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    listing.source_id,
-                    listing.source_url,
-                    listing.property_type.value,
-                    listing.address.street,
-                    listing.address.number,
-                    listing.address.neighborhood,
-                    listing.address.city,
-                    listing.address.state,
-                    listing.address.zip_code,
-                    listing.price.sale_price,
-                    listing.price.condo_fee,
-                    listing.price.iptu,
-                    listing.area_m2,
-                    listing.bedrooms,
-                    listing.bathrooms,
-                    listing.parking_spaces,
-                    listing.coordinates.latitude if listing.coordinates else None,
-                    listing.coordinates.longitude if listing.coordinates else None,
-                    json.dumps(listing.images),
-                    json.dumps(listing.amenities),
-                    listing.description,
-                    json.dumps(listing.building_amenities),
-                    json.dumps(listing.unit_amenities),
-                    listing.floor_number,
-                    listing.total_floors,
-                    listing.year_built,
-                    listing.furnished.value,
-                    1 if listing.pet_friendly else (
-                        0 if listing.pet_friendly is False else None
-                    ),
-                    str(listing.content_hash) if listing.content_hash else "",
-                    listing.status.value,
-                    now,
-                    now,
-                ),
+        A listing loaded from the DB (``id`` set) only writes the columns
+        of its changed fields, so a status transition is a tiny UPDATE.
+        Anything else goes through INSERT ... ON CONFLICT DO UPDATE.
+        Returns once the writer applied it; the commit is grouped.
+        """
+        now = datetime.now().isoformat()
+
+        if listing.id is not None:
+            changed = listing.changed_fields
+            if not changed:
+                return listing
+            columns = self._changed_columns(listing, changed)
+            assignments = "".join(f"{column}=?, " for column in columns)
+            sql = (
+                f"UPDATE listings SET {assignments}updated_at=?, "
+                "lease_owner=NULL, lease_expires_at=NULL WHERE id=?"
             )
-            await conn.commit()
-            listing.id = cursor.lastrowid
+            params = (*columns.values(), now, listing.id)
+
+            async def update(conn: aiosqlite.Connection) -> int:
+                cursor = await conn.execute(sql, params)
+                return cursor.rowcount
+
+            if await self._db.write(update):
+                self._index_hash(listing)
+                listing.clear_changes()
+                return listing
 
+        insert_params = self._insert_params(listing, now)
+
+        async def upsert_row(conn: aiosqlite.Connection) -> int | None:
+            cursor = await conn.execute(UPSERT_SQL, insert_params)
+            row = await cursor.fetchone()
+            return row[0] if row else None
+
+        row_id = await self._db.write(upsert_row)
+        listing.id = row_id if row_id is not None else listing.id
+        self._index_hash(listing)
+        listing.clear_changes()
         return listing
 
     async def upsert_many(self, listings: list[Listing]) -> int:
-        created = 0
+        """Insert listings not yet known; existing rows are left untouched.
+
+        One executemany for the whole batch. The returned count of new
+        rows is the cursor's rowcount, which sqlite3 sums over the batch
+        from each statement's changes() (0 on conflict).
+        """
+        if not listings:
+            return 0
+        now = datetime.now().isoformat()
+        params = [self._insert_params(listing, now) for listing in listings]
+
+        async def insert_new(conn: aiosqlite.Connection) -> int:
+            cursor = await conn.executemany(
+                INSERT_SQL + " ON CONFLICT(source_id) DO NOTHING", params
+            )
+            return max(cursor.rowcount, 0)
+
+        created = await self._db.write(insert_new)
         for listing in listings:
-            existing = await self.get_by_source_id(listing.source_id)
-            if not existing:
-                await self.upsert(listing)
-                created += 1
+            # Conflicting rows keep their stored hash; an extra key only costs a confirm query
+            self._index_hash(listing)
         logger.info("Upserted %d/%d listings", created, len(listings))
         return created
 
     async def get_by_status(self, status: ProcessingStatus) -> list[Listing]:
-        conn = self._db.connection
-        cursor = await conn.execute(
-            "SELECT * FROM listings WHERE status=?", (status.value,)
+        await self._db.flush()
+        async with self._db.reader() as conn:
+            cursor = await conn.execute(
+                "SELECT * FROM listings WHERE status=?", (status.value,)
+            )
+            rows = await cursor.fetchall()
+        return [self._row_to_listing(row) for row in rows]
+
+    async def claim_batch(
+        self, limit: int, worker_id: str, lease_seconds: float
+    ) -> list[Listing]:
+        """Atomically lease up to ``limit`` pending listings to ``worker_id``.
+
+        Listings whose lease expired (their worker died) are claimable
+        again, so nothing is lost and nothing is worked twice concurrently.
+        A single UPDATE ... RETURNING makes the claim atomic across
+        processes sharing the database. The claim is flushed right away so
+        the write lock is not held while other processes wait to claim.
+        """
+        now = datetime.now()
+        expires = now + timedelta(seconds=lease_seconds)
+
+        params = (
+            ProcessingStatus.IN_PROGRESS.value,
+            worker_id,
+            expires.isoformat(),
+            ProcessingStatus.PENDING.value,
+            ProcessingStatus.IN_PROGRESS.value,
+            now.isoformat(),
+            limit,
         )
-        rows = await cursor.fetchall()
+
+        async def claim(conn: aiosqlite.Connection) -> list[aiosqlite.Row]:
+            cursor = await conn.execute(CLAIM_SQL, params)
+            return list(await cursor.fetchall())
+
+        rows = await self._db.write(claim)
+        await self._db.flush()
+        listings = [self._row_to_listing(row) for row in rows]
+        listings.sort(key=lambda listing: listing.id or 0)
+        return listings
+
+    async def claim_source_ids(
+        self, source_ids: list[str], worker_id: str, lease_seconds: float
+    ) -> list[Listing]:
+        """Lease the given listings to ``worker_id`` if they are still claimable.
+
+        Same rules as ``claim_batch``, but for specific listings, e.g. the
+        ones a search stage just inserted.
+        """
+        if not source_ids:
+            return []
+        now = datetime.now()
+        expires = now + timedelta(seconds=lease_seconds)
+        params = (
+            ProcessingStatus.IN_PROGRESS.value,
+            worker_id,
+            expires.isoformat(),
+            json.dumps(source_ids),
+            ProcessingStatus.PENDING.value,
+            ProcessingStatus.IN_PROGRESS.value,
+            now.isoformat(),
+        )
+
+        async def claim(conn: aiosqlite.Connection) -> list[aiosqlite.Row]:
+            cursor = await conn.execute(CLAIM_SOURCE_IDS_SQL, params)
+            return list(await cursor.fetchall())
+
+        rows = await self._db.write(claim)
+        await self._db.flush()
+        listings = [self._row_to_listing(row) for row in rows]
+        listings.sort(key=lambda listing: listing.id or 0)
+        return listings
+
+    async def release_leases(self, worker_id: str) -> int:
+        """Return listings still leased to ``worker_id`` to the pending queue."""
+
+        async def release(conn: aiosqlite.Connection) -> int:
+            cursor = await conn.execute(
+                """
+                UPDATE listings
+                SET status=?, lease_owner=NULL, lease_expires_at=NULL
+                WHERE status=? AND lease_owner=?
+                """,
+                (ProcessingStatus.PENDING.value, ProcessingStatus.IN_PROGRESS.value, worker_id),
+            )
+            return cursor.rowcount
+
+        released = await self._db.write(release)
+        await self._db.flush()
+        return released
+
+    async def iter_by_status(
+        self, status: ProcessingStatus, batch_size: int = 500
+    ) -> AsyncIterator[list[Listing]]:
+        """Yield listings with ``status`` in ``id`` order, ``batch_size`` at a time.
+
+        Keyset pagination (``id > last``) keeps every page an index range
+        scan on idx_listings_status, whose entries are ordered by rowid
+        within a status, so memory stays bounded by one batch. Each page
+        borrows a reader only for its own query.
+        """
+        await self._db.flush()
+        last_id = 0
+        while True:
+            async with self._db.reader() as conn:
+                cursor = await conn.execute(
+                    "SELECT * FROM listings WHERE status=? AND id>? ORDER BY id LIMIT ?",
+                    (status.value, last_id, batch_size),
+                )
+                rows = await cursor.fetchall()
+            if not rows:
+                return
+            batch = [self._row_to_listing(row) for row in rows]
+            last_id = batch[-1].id or last_id
+            yield batch
+            if len(rows) < batch_size:
+                return
+
+    async def iter_source_ids(self, batch_size: int = 10000) -> AsyncIterator[list[str]]:
+        """Yield every stored source_id, ``batch_size`` at a time, in ``id`` order."""
+        await self._db.flush()
+        last_id = 0
+        while True:
+            async with self._db.reader() as conn:
+                cursor = await conn.execute(
+                    "SELECT id, source_id FROM listings WHERE id>? ORDER BY id LIMIT ?",
+                    (last_id, batch_size),
+                )
+                rows = await cursor.fetchall()
+            if not rows:
+                return
+            last_id = rows[-1][0]
+            yield [row[1] for row in rows]
+            if len(rows) < batch_size:
+                return
+
+    async def get_due_for_refresh(self, fetched_before: datetime, limit: int) -> list[Listing]:
+        """Enriched listings last fetched before ``fetched_before``, oldest first."""
+        await self._db.flush()
+        async with self._db.reader() as conn:
+            cursor = await conn.execute(
+                """
+                SELECT * FROM listings
+                WHERE status=? AND (last_fetched_at IS NULL OR last_fetched_at < ?)
+                ORDER BY last_fetched_at IS NOT NULL, last_fetched_at, id
+                LIMIT ?
+                """,
+                (ProcessingStatus.ENRICHED.value, fetched_before.isoformat(), limit),
+            )
+            rows = await cursor.fetchall()
         return [self._row_to_listing(row) for row in rows]
 
     async def get_by_source_id(self, source_id: str) -> Listing | None:
@@ -153,6 +359,16 @@ class SqliteListingRepo:
         return self._row_to_listing(row) if row else None
 
     async def exists_by_hash(self, content_hash: ContentHash) -> bool:
+        """Whether an ENRICHED listing already has ``content_hash``.
+
+        The in-memory index answers the common case (a new hash) without
+        touching SQLite; only index hits are confirmed with a query. The
+        index covers writes made through this repository instance, so the
+        Container shares one instance per process.
+        """
+        await self._ensure_hash_index()
+        if not self._hash_index.might_contain(content_hash):
+            return False
         conn = self._db.connection
         cursor = await conn.execute(
             "SELECT 1 FROM listings WHERE content_hash=? AND status=?",
@@ -163,6 +379,80 @@ class SqliteListingRepo:
     async def get_enriched(self) -> list[Listing]:
         return await self.get_by_status(ProcessingStatus.ENRICHED)
 
+    async def _ensure_hash_index(self) -> None:
+        if self._hash_index_loaded:
+            return
+        async with self._hash_index_lock:
+            if self._hash_index_loaded:
+                return
+            await self._db.flush()
+            keys: list[int] = []
+            async with self._db.reader() as conn:
+                cursor = await conn.execute(
+                    "SELECT content_hash FROM listings WHERE status=? AND content_hash!=''",
+                    (ProcessingStatus.ENRICHED.value,),
+                )
+                while rows := await cursor.fetchmany(10000):
+                    keys.extend(hash_key(row[0]) for row in rows)
+            self._hash_index.load(keys)
+            self._hash_index_loaded = True
+            logger.info(
+                "Loaded %d content hashes into memory (%.1f MB)",
+                len(self._hash_index),
+                self._hash_index.nbytes / 1e6,
+            )
+
+    def _index_hash(self, listing: Listing) -> None:
+        if listing.status == ProcessingStatus.ENRICHED and listing.content_hash:
+            self._hash_index.add(listing.content_hash)
+
+    @staticmethod
+    def _changed_columns(listing: Listing, fields: frozenset[str]) -> dict[str, object]:
+        columns: dict[str, object] = {}
+        for name in fields:
+            to_columns = FIELD_COLUMNS.get(name)
+            if to_columns is not None:
+                columns.update(to_columns(listing))
+        return columns
+
+    @staticmethod
+    def _insert_params(listing: Listing, now: str) -> tuple[object, ...]:
+        return (
+            listing.source_id,
+            listing.source_url,
+            listing.property_type.value,
+            listing.address.street,
+            listing.address.number,
+            listing.address.neighborhood,
+            listing.address.city,
+            listing.address.state,
+            listing.address.zip_code,
+            listing.price.sale_price,
+            listing.price.condo_fee,
+            listing.price.iptu,
+            listing.area_m2,
+            listing.bedrooms,
+            listing.bathrooms,
+            listing.parking_spaces,
+            listing.coordinates.latitude if listing.coordinates else None,
+            listing.coordinates.longitude if listing.coordinates else None,
+            json.dumps(listing.images),
+            json.dumps(listing.amenities),
+            listing.description,
+            json.dumps(listing.building_amenities),
+            json.dumps(listing.unit_amenities),
+            listing.floor_number,
+            listing.total_floors,
+            listing.year_built,
+            listing.furnished.value,
+            _pet_friendly(listing.pet_friendly),
+            str(listing.content_hash) if listing.content_hash else "",
+            listing.status.value,
+            listing.last_fetched_at.isoformat() if listing.last_fetched_at else None,
+            now,
+            now,
+        )
+
     @staticmethod
     def _row_to_listing(row: object) -> Listing:
         r = dict(row)  # type: ignore[arg-type]
@@ -170,6 +460,7 @@ class SqliteListingRepo:
         lat = r["latitude"]
         lon = r["longitude"]
         pet = r["pet_friendly"]
+        fetched = r["last_fetched_at"]
 
         return Listing(
             id=r["id"],
@@ -206,6 +497,7 @@ class SqliteListingRepo:
             pet_friendly=True if pet == 1 else (False if pet == 0 else None),
             content_hash=ContentHash(value=hash_val) if hash_val else None,
             status=ProcessingStatus(r["status"]),
+            last_fetched_at=datetime.fromisoformat(fetched) if fetched else None,
             created_at=datetime.fromisoformat(r["created_at"]),
             updated_at=datetime.fromisoformat(r["updated_at"]),
         )
@@ -0,0 +1,13 @@
+from .circuit_breaker import BreakerState, CircuitBreaker
+from .errors import EmptyPayloadError, ListingNotFoundError, PermanentFetchError
+from .retry_policy import RetryPolicy, classify
+
+__all__ = [
+    "BreakerState",
+    "CircuitBreaker",
+    "EmptyPayloadError",
+    "ListingNotFoundError",
+    "PermanentFetchError",
+    "RetryPolicy",
+    "classify",
+]
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import deque
+from collections.abc import Callable
+from enum import StrEnum
+
+logger = logging.getLogger(__name__)
+
+
+class BreakerState(StrEnum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Shared failure-rate breaker that pauses every caller while open.
+
+    Outcomes are kept over a sliding window of the last ``window`` calls.
+    Once at least ``min_samples`` are recorded and the failure ratio
+    reaches ``failure_ratio`` the breaker opens for ``cooldown_seconds``.
+    After the cooldown a single caller is let through as a probe: success
+    closes the breaker, failure opens it for another cooldown.
+    """
+
+    def __init__(
+        self,
+        window: int = 20,
+        failure_ratio: float = 0.5,
+        min_samples: int = 10,
+        cooldown_seconds: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._outcomes: deque[bool] = deque(maxlen=max(1, window))
+        self._failure_ratio = failure_ratio
+        self._min_samples = max(1, min_samples)
+        self._cooldown = cooldown_seconds
+        self._clock = clock
+        self._state = BreakerState.CLOSED
+        self._open_until = 0.0
+        self._closed = asyncio.Event()
+        self._closed.set()
+        self.times_opened = 0
+
+    @property
+    def state(self) -> BreakerState:
+        return self._state
+
+    async def wait_until_closed(self) -> None:
+        while self._state is not BreakerState.CLOSED:
+            now = self._clock()
+            if self._state is BreakerState.OPEN and now >= self._open_until:
+                self._state = BreakerState.HALF_OPEN
+                logger.info("Circuit breaker half-open: sending a probe request")
+                return
+            if self._state is BreakerState.OPEN:
+                timeout = self._open_until - now
+            else:
+                # A probe is in flight; re-check in case it ends without an outcome
+                timeout = self._cooldown
+            try:
+                await asyncio.wait_for(self._closed.wait(), timeout)
+            except TimeoutError:
+                pass
+
+    def record_success(self) -> None:
+        self._outcomes.append(True)
+        if self._state is BreakerState.HALF_OPEN:
+            self._state = BreakerState.CLOSED
+            self._outcomes.clear()
+            self._closed.set()
+            logger.info("Circuit breaker closed: probe succeeded, resuming workers")
+
+    def record_failure(self) -> None:
+        self._outcomes.append(False)
+        if self._state is BreakerState.HALF_OPEN:
+            self._open("probe failed")
+            return
+        if self._state is BreakerState.CLOSED and len(self._outcomes) >= self._min_samples:
+            failures = self._outcomes.count(False)
+            ratio = failures / len(self._outcomes)
+            if ratio >= self._failure_ratio:
+                self._open(f"{failures}/{len(self._outcomes)} recent calls failed")
+
+    def _open(self, reason: str) -> None:
+        self._state = BreakerState.OPEN
+        self._open_until = self._clock() + self._cooldown
+        self._closed.clear()
+        self.times_opened += 1
+        logger.warning(
+            "Circuit breaker open (%s): pausing all workers for %.0fs",
+            reason,
+            self._cooldown,
+        )
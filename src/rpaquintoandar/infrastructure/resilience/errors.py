@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+
+class PermanentFetchError(Exception):
+    """A failure that will not go away on retry."""
+
+
+class ListingNotFoundError(PermanentFetchError):
+    def __init__(self, source_id: str, status: int | None = None) -> None:
+        super().__init__(f"Listing {source_id} not found (HTTP {status})")
+        self.source_id = source_id
+        self.status = status
+
+
+class EmptyPayloadError(Exception):
+    """The page loaded but carried no ``__NEXT_DATA__`` (often a soft block)."""
+
+    def __init__(self, source_id: str) -> None:
+        super().__init__(f"Empty __NEXT_DATA__ for {source_id}")
+        self.source_id = source_id
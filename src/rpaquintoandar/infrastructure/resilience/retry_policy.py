@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import random
+import sqlite3
+from collections.abc import Awaitable, Callable
+from typing import TypeVar
+
+import httpx
+from playwright.async_api import Error as PlaywrightError
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+from rpaquintoandar.domain.enums import ErrorCategory
+from rpaquintoandar.infrastructure.resilience.circuit_breaker import CircuitBreaker
+from rpaquintoandar.infrastructure.resilience.errors import (
+    EmptyPayloadError,
+    PermanentFetchError,
+)
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Categories that say nothing about the site's health. They neither trip
+# the breaker nor get retried.
+PERMANENT_CATEGORIES = frozenset({ErrorCategory.NOT_FOUND, ErrorCategory.SELECTOR})
+# Categories that do indicate trouble upstream and count against the breaker.
+BREAKER_CATEGORIES = frozenset(
+    {ErrorCategory.NETWORK, ErrorCategory.TIMEOUT, ErrorCategory.API, ErrorCategory.PARSE}
+)
+
+
+def classify(exc: BaseException) -> ErrorCategory:
+    if isinstance(exc, PermanentFetchError):
+        return ErrorCategory.NOT_FOUND
+    if isinstance(exc, EmptyPayloadError | json.JSONDecodeError):
+        return ErrorCategory.PARSE
+    if isinstance(exc, TimeoutError | PlaywrightTimeoutError | httpx.TimeoutException):
+        return ErrorCategory.TIMEOUT
+    if isinstance(exc, httpx.HTTPStatusError):
+        status = exc.response.status_code
+        if status in (404, 410):
+            return ErrorCategory.NOT_FOUND
+        return ErrorCategory.API
+    if isinstance(exc, httpx.TransportError | ConnectionError):
+        return ErrorCategory.NETWORK
+    if isinstance(exc, PlaywrightError):
+        return ErrorCategory.NETWORK if "net::" in exc.message else ErrorCategory.UNKNOWN
+    if isinstance(exc, sqlite3.Error):
+        return ErrorCategory.DATABASE
+    return ErrorCategory.UNKNOWN
+
+
+class RetryPolicy:
+    """Retries an async operation with exponential backoff and full jitter.
+
+    The n-th retry sleeps a uniform random time in
+    ``[0, min(max_delay, base_delay * 2**(n-1))]``. Permanent failures are
+    re-raised immediately. When a ``CircuitBreaker`` is given, every
+    attempt first waits for it to close and reports its outcome to it.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        base_delay_ms: int = 2000,
+        max_delay_ms: int = 60000,
+        breaker: CircuitBreaker | None = None,
+        rng: random.Random | None = None,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+    ) -> None:
+        self._max_attempts = max(1, max_attempts)
+        self._base_delay = base_delay_ms / 1000.0
+        self._max_delay = max_delay_ms / 1000.0
+        self._breaker = breaker
+        self._rng = rng or random.Random()
+        self._sleep = sleep
+
+    def backoff(self, attempt: int) -> float:
+        cap = min(self._max_delay, self._base_delay * 2 ** (attempt - 1))
+        return self._rng.uniform(0.0, cap)
+
+    async def run(self, operation: Callable[[], Awaitable[T]], description: str = "") -> T:
+        attempt = 0
+        while True:
+            attempt += 1
+            if self._breaker is not None:
+                await self._breaker.wait_until_closed()
+            try:
+                result = await operation()
+            except Exception as exc:
+                category = classify(exc)
+                if self._breaker is not None:
+                    if category in BREAKER_CATEGORIES:
+                        self._breaker.record_failure()
+                    else:
+                        self._breaker.record_success()
+
+                if category in PERMANENT_CATEGORIES:
+                    logger.info("%s: permanent failure (%s), not retrying: %s", description, category, exc)
+                    raise
+                if attempt >= self._max_attempts:
+                    logger.warning(
+                        "%s: giving up after %d attempts (%s): %s",
+                        description,
+                        attempt,
+                        category,
+                        exc,
+                    )
+                    raise
+
+                delay = self.backoff(attempt)
+                logger.warning(
+                    "%s: %s error on attempt %d/%d, retrying in %.1fs: %s",
+                    description,
+                    category,
+                    attempt,
+                    self._max_attempts,
+                    delay,
+                    exc,
+                )
+                await self._sleep(delay)
+                continue
+
+            if self._breaker is not None:
+                self._breaker.record_success()
+            return result
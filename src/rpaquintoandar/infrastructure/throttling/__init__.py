@@ -0,0 +1,13 @@
+from .adaptive_rate_limiter import (
+    AdaptiveRateLimiter,
+    LimiterSnapshot,
+    RateLimiterRegistry,
+    is_throttle_status,
+)
+
+__all__ = [
+    "AdaptiveRateLimiter",
+    "LimiterSnapshot",
+    "RateLimiterRegistry",
+    "is_throttle_status",
+]
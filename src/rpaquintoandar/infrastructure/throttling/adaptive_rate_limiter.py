@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from rpaquintoandar.infrastructure.config.settings_loader import (
+    EndpointRateSettings,
+    RateLimitSettings,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def is_throttle_status(status: int | None) -> bool:
+    return status is not None and (status == 429 or status >= 500)
+
+
+@dataclass(frozen=True, slots=True)
+class LimiterSnapshot:
+    name: str
+    rate: float
+    acquired: int
+    throttle_events: int
+    waited_seconds: float
+
+
+class AdaptiveRateLimiter:
+    """Token bucket whose refill rate adapts to server health (AIMD).
+
+    Every healthy response adds ``increase_step`` requests/second, up to
+    ``max_rps``. A throttle signal (429, 5xx, empty ``__NEXT_DATA__``)
+    multiplies the rate by ``decrease_factor``, down to ``min_rps``, and
+    drains the bucket so the next request waits a full interval.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        endpoint: EndpointRateSettings,
+        increase_step: float = 0.05,
+        decrease_factor: float = 0.5,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.name = name
+        self._min_rate = endpoint.min_rps
+        self._max_rate = endpoint.max_rps
+        self._burst = max(1.0, endpoint.burst)
+        self._rate = min(max(endpoint.initial_rps, self._min_rate), self._max_rate)
+        self._increase_step = increase_step
+        self._decrease_factor = decrease_factor
+        self._clock = clock
+        self._tokens = 1.0
+        self._last_refill = clock()
+        self._lock = asyncio.Lock()
+        self._acquired = 0
+        self._throttle_events = 0
+        self._waited = 0.0
+
+    @property
+    def rate(self) -> float:
+        return self._rate
+
+    async def acquire(self) -> None:
+        # The lock is held while sleeping so waiters are released in FIFO order
+        async with self._lock:
+            self._refill()
+            if self._tokens < 1.0:
+                wait = (1.0 - self._tokens) / self._rate
+                self._waited += wait
+                await asyncio.sleep(wait)
+                self._refill()
+            self._tokens -= 1.0
+            self._acquired += 1
+
+    def _refill(self) -> None:
+        now = self._clock()
+        elapsed = now - self._last_refill
+        self._last_refill = now
+        self._tokens = min(self._burst, self._tokens + elapsed * self._rate)
+
+    def record_success(self) -> None:
+        self._rate = min(self._max_rate, self._rate + self._increase_step)
+
+    def record_throttle(self, reason: str) -> None:
+        previous = self._rate
+        self._refill()
+        self._rate = max(self._min_rate, self._rate * self._decrease_factor)
+        self._tokens = min(self._tokens, 0.0)
+        self._throttle_events += 1
+        logger.warning(
+            "Rate limiter [%s] throttled (%s): %.2f -> %.2f req/s",
+            self.name,
+            reason,
+            previous,
+            self._rate,
+        )
+
+    def record_status(self, status: int | None) -> None:
+        if is_throttle_status(status):
+            self.record_throttle(f"HTTP {status}")
+        else:
+            self.record_success()
+
+    def snapshot(self) -> LimiterSnapshot:
+        return LimiterSnapshot(
+            name=self.name,
+            rate=self._rate,
+            acquired=self._acquired,
+            throttle_events=self._throttle_events,
+            waited_seconds=self._waited,
+        )
+
+
+class RateLimiterRegistry:
+    """One limiter per endpoint class, shared by every client that hits it."""
+
+    def __init__(self, settings: RateLimitSettings) -> None:
+        self._settings = settings
+        self._limiters: dict[str, AdaptiveRateLimiter] = {}
+
+    def get(self, endpoint: str) -> AdaptiveRateLimiter:
+        limiter = self._limiters.get(endpoint)
+        if limiter is None:
+            endpoint_settings = self._settings.endpoints.get(endpoint, EndpointRateSettings())
+            limiter = AdaptiveRateLimiter(
+                endpoint,
+                endpoint_settings,
+                increase_step=self._settings.increase_step,
+                decrease_factor=self._settings.decrease_factor,
+            )
+            self._limiters[endpoint] = limiter
+        return limiter
+
+    def snapshots(self) -> list[LimiterSnapshot]:
+        return [limiter.snapshot() for limiter in self._limiters.values()]
+
+    def log_summary(self) -> None:
+        for snap in self.snapshots():
+            logger.info(
+                "Rate limiter [%s]: rate=%.2f req/s acquired=%d throttled=%d waited=%.1fs",
+                snap.name,
+                snap.rate,
+                snap.acquired,
+                snap.throttle_events,
+                snap.waited_seconds,
+            )
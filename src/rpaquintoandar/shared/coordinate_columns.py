@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+from array import array
+from collections.abc import Iterator
+
+EMPTY_SLOT = -1
+INITIAL_CAPACITY = 1024
+# 2**64 / golden ratio: spreads clustered ids across the table
+_FIB_MULTIPLIER = 0x9E3779B97F4A7C15
+_U64 = (1 << 64) - 1
+_MAX_NUMERIC_DIGITS = 18  # always fits in a signed 64-bit int
+
+
+def numeric_key(source_id: str) -> int | None:
+    """``source_id`` as an int when it round-trips exactly, else ``None``."""
+    if (
+        source_id.isdigit()
+        and len(source_id) <= _MAX_NUMERIC_DIGITS
+        and (source_id[0] != "0" or len(source_id) == 1)
+    ):
+        return int(source_id)
+    return None
+
+
+class CoordinateColumns:
+    """Unique ``(source_id, lat, lon)`` rows held column by column.
+
+    Numeric ids go in an ``array('q')`` and coordinates in two
+    ``array('d')`` columns, 24 bytes per row. Membership goes through an
+    open-addressing table of row numbers (``array('i')``, linear probing,
+    kept at most half full), which adds 8 to 16 bytes per row instead of
+    a dict entry plus str and tuple objects. The rare non-numeric id
+    falls back to a plain dict. Rows iterate in insertion order, numeric
+    ids first.
+    """
+
+    def __init__(self) -> None:
+        self._ids = array("q")
+        self._lats = array("d")
+        self._lons = array("d")
+        self._slots = array("i", [EMPTY_SLOT]) * INITIAL_CAPACITY
+        self._shift = 64 - (INITIAL_CAPACITY.bit_length() - 1)
+        self._other: dict[str, tuple[float, float]] = {}
+
+    def add(self, source_id: str, lat: float, lon: float) -> bool:
+        """Store the row unless the id is already present; returns whether it was new."""
+        key = numeric_key(source_id)
+        if key is None:
+            if source_id in self._other:
+                return False
+            self._other[source_id] = (lat, lon)
+            return True
+
+        slot = self._find(key)
+        if self._slots[slot] != EMPTY_SLOT:
+            return False
+        self._slots[slot] = len(self._ids)
+        self._ids.append(key)
+        self._lats.append(lat)
+        self._lons.append(lon)
+        if len(self._ids) * 2 > len(self._slots):
+            self._rehash(len(self._slots) * 2)
+        return True
+
+    def truncate(self, limit: int) -> None:
+        """Keep only the first ``limit`` rows."""
+        if limit >= len(self):
+            return
+        if limit <= len(self._ids):
+            del self._ids[limit:]
+            del self._lats[limit:]
+            del self._lons[limit:]
+            self._other.clear()
+            self._rehash(len(self._slots))
+        else:
+            keep = limit - len(self._ids)
+            self._other = dict(list(self._other.items())[:keep])
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the numeric columns and their hash table."""
+        return sum(a.itemsize * len(a) for a in (self._ids, self._lats, self._lons, self._slots))
+
+    def __contains__(self, source_id: object) -> bool:
+        if not isinstance(source_id, str):
+            return False
+        key = numeric_key(source_id)
+        if key is None:
+            return source_id in self._other
+        return self._slots[self._find(key)] != EMPTY_SLOT
+
+    def __len__(self) -> int:
+        return len(self._ids) + len(self._other)
+
+    def __iter__(self) -> Iterator[tuple[str, float, float]]:
+        for row, key in enumerate(self._ids):
+            yield str(key), self._lats[row], self._lons[row]
+        for source_id, (lat, lon) in self._other.items():
+            yield source_id, lat, lon
+
+    def _find(self, key: int) -> int:
+        """Slot holding ``key``, or the empty slot where it would go."""
+        mask = len(self._slots) - 1
+        slot = ((key * _FIB_MULTIPLIER) & _U64) >> self._shift
+        while True:
+            row = self._slots[slot]
+            if row == EMPTY_SLOT or self._ids[row] == key:
+                return slot
+            slot = (slot + 1) & mask
+
+    def _rehash(self, capacity: int) -> None:
+        self._slots = array("i", [EMPTY_SLOT]) * capacity
+        self._shift = 64 - (capacity.bit_length() - 1)
+        for row, key in enumerate(self._ids):
+            self._slots[self._find(key)] = row
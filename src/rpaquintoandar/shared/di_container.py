@@ -1,11 +1,17 @@
 from __future__ import annotations
 
+import asyncio
 import logging
+from pathlib import Path
 from typing import TYPE_CHECKING
 
 from rpaquintoandar.infrastructure.alerting.log_alerter import LogAlerter
+from rpaquintoandar.infrastructure.api.capture_cache import CoordinatesCaptureCache
 from rpaquintoandar.infrastructure.api.coordinates_collector import CoordinatesCollector
+from rpaquintoandar.infrastructure.api.http_client import SharedHttpClient
+from rpaquintoandar.infrastructure.api.http_detail_extractor import HttpDetailExtractor
 from rpaquintoandar.infrastructure.api.quintoandar_api_client import QuintoAndarApiClient
+from rpaquintoandar.infrastructure.archive.payload_archive import PayloadArchive
 from rpaquintoandar.infrastructure.browser.detail_extractor.playwright_detail_extractor import (
     PlaywrightDetailExtractor,
 )
@@ -14,14 +20,20 @@ from rpaquintoandar.infrastructure.config.settings_loader import Settings
 from rpaquintoandar.infrastructure.persistence.database_manager import DatabaseManager
 from rpaquintoandar.infrastructure.persistence.sqlite_execution_repo import SqliteExecutionRepo
 from rpaquintoandar.infrastructure.persistence.sqlite_listing_repo import SqliteListingRepo
+from rpaquintoandar.infrastructure.resilience import CircuitBreaker, RetryPolicy
+from rpaquintoandar.infrastructure.throttling import RateLimiterRegistry
 
 if TYPE_CHECKING:
+    import httpx
+
     from rpaquintoandar.domain.interfaces import (
         IAlerter,
         IBrowserManager,
         IDetailExtractor,
         IExecutionRepository,
         IListingRepository,
+        IPayloadArchive,
+        IRetryPolicy,
         ISearchApiClient,
     )
 
@@ -33,11 +45,19 @@ class Container:
         self.settings = settings
         self._db_manager: DatabaseManager | None = None
         self._browser_manager: PlaywrightBrowserManager | None = None
+        self._browser_lock = asyncio.Lock()
         self._api_client: QuintoAndarApiClient | None = None
         self._coordinates_collector: CoordinatesCollector | None = None
+        self._http_detail_extractor: HttpDetailExtractor | None = None
+        self._payload_archive: PayloadArchive | None = None
+        self.rate_limiters = RateLimiterRegistry(settings.rate_limit)
+        self._circuit_breaker: CircuitBreaker | None = None
+        self._listing_repo: SqliteListingRepo | None = None
+        self._http = SharedHttpClient(settings.http, settings.api.timeout_seconds)
 
     async def initialize(self) -> None:
-        self._db_manager = DatabaseManager(self.settings.persistence.database_path)
+        persistence = self.settings.persistence
+        self._db_manager = DatabaseManager(persistence.database_path, persistence)
         await self._db_manager.initialize()
         logger.info("Container initialized")
 
@@ -46,8 +66,14 @@ class Container:
             await self._browser_manager.stop()
         if self._api_client:
             await self._api_client.close()
+        if self._http_detail_extractor:
+            await self._http_detail_extractor.close()
+        await self._http.close()
+        if self._payload_archive:
+            self._payload_archive.close()
         if self._db_manager:
             await self._db_manager.close()
+        self.rate_limiters.log_summary()
         logger.info("Container shut down")
 
     @property
@@ -56,32 +82,112 @@ class Container:
         return self._db_manager
 
     def listing_repo(self) -> IListingRepository:
-        return SqliteListingRepo(self.db_manager)
+        # One instance per process so its in-memory hash index stays current
+        if self._listing_repo is None:
+            self._listing_repo = SqliteListingRepo(self.db_manager)
+        return self._listing_repo
 
     def execution_repo(self) -> IExecutionRepository:
         return SqliteExecutionRepo(self.db_manager)
 
+    def http_client(self) -> httpx.AsyncClient:
+        """The pooled client shared by every plain-HTTP component."""
+        return self._http.client
+
     async def api_client(self) -> ISearchApiClient:
         if self._api_client is None:
-            bm = await self.browser_manager()
-            self._api_client = QuintoAndarApiClient(self.settings.api, bm)
+            self._api_client = QuintoAndarApiClient(
+                self.settings.api,
+                browser_factory=self.browser_manager,
+                search_limiter=self.rate_limiters.get("search"),
+                count_limiter=self.rate_limiters.get("count"),
+                client=self.http_client(),
+            )
         return self._api_client
 
     async def browser_manager(self) -> IBrowserManager:
-        if self._browser_manager is None:
-            self._browser_manager = PlaywrightBrowserManager(self.settings.browser)
-            await self._browser_manager.start()
+        # Components start the browser on first use, possibly concurrently
+        async with self._browser_lock:
+            if self._browser_manager is None:
+                manager = PlaywrightBrowserManager(self.settings.browser)
+                await manager.start()
+                self._browser_manager = manager
         return self._browser_manager
 
     async def coordinates_collector(self) -> CoordinatesCollector:
         if self._coordinates_collector is None:
-            bm = await self.browser_manager()
-            self._coordinates_collector = CoordinatesCollector(bm, self.settings.api)
+            api = self.settings.api
+            cache = (
+                CoordinatesCaptureCache(Path(api.capture_cache_path), api.capture_ttl_hours * 3600)
+                if api.capture_cache_path
+                else None
+            )
+            # The browser is only started if there is no usable cached capture
+            self._coordinates_collector = CoordinatesCollector(
+                None,
+                api,
+                coordinates_limiter=self.rate_limiters.get("coordinates"),
+                search_limiter=self.rate_limiters.get("search"),
+                client=self.http_client(),
+                capture_cache=cache,
+                browser_factory=self.browser_manager,
+            )
         return self._coordinates_collector
 
     async def detail_extractor(self) -> IDetailExtractor:
+        if self.settings.scraping.detail_fetcher != "http":
+            return await self._browser_detail_extractor()
+        if self._http_detail_extractor is None:
+            self._http_detail_extractor = HttpDetailExtractor(
+                self.settings.scraping,
+                fallback_factory=self._browser_detail_extractor,
+                client=self.http_client(),
+                rate_limiter=self.rate_limiters.get("detail"),
+            )
+        return self._http_detail_extractor
+
+    async def _browser_detail_extractor(self) -> IDetailExtractor:
         bm = await self.browser_manager()
-        return PlaywrightDetailExtractor(bm, self.settings.scraping)
+        return PlaywrightDetailExtractor(
+            bm,
+            self.settings.scraping,
+            rate_limiter=self.rate_limiters.get("detail"),
+        )
+
+    def circuit_breaker(self) -> CircuitBreaker:
+        if self._circuit_breaker is None:
+            resilience = self.settings.resilience
+            self._circuit_breaker = CircuitBreaker(
+                window=resilience.breaker_window,
+                failure_ratio=resilience.breaker_failure_ratio,
+                min_samples=resilience.breaker_min_samples,
+                cooldown_seconds=resilience.breaker_cooldown_seconds,
+            )
+        return self._circuit_breaker
+
+    def retry_policy(
+        self, max_retries: int | None = None, retry_delay_ms: int | None = None
+    ) -> IRetryPolicy:
+        """Retry policy for detail fetches; all policies share one circuit breaker."""
+        scraping = self.settings.scraping
+        if max_retries is None:
+            max_retries = scraping.retry_attempts - 1
+        return RetryPolicy(
+            max_attempts=max_retries + 1,
+            base_delay_ms=scraping.retry_delay_ms if retry_delay_ms is None else retry_delay_ms,
+            max_delay_ms=self.settings.resilience.max_delay_ms,
+            breaker=self.circuit_breaker(),
+        )
+
+    def payload_archive(self) -> IPayloadArchive | None:
+        if not self.settings.archive.enabled:
+            return None
+        if self._payload_archive is None:
+            self._payload_archive = PayloadArchive(
+                self.settings.archive.directory,
+                segment_max_bytes=self.settings.archive.segment_max_mb * 1024 * 1024,
+            )
+        return self._payload_archive
 
     def alerter(self) -> IAlerter:
         return LogAlerter()
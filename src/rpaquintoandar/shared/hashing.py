@@ -1,4 +1,5 @@
 import hashlib
+import json
 import re
 
 
@@ -10,3 +11,8 @@ def normalize_text(text: str) -> str:
 def sha256_hash(text: str) -> str:
     normalized = normalize_text(text)
     return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+def canonical_json(data: object) -> str:
+    """Stable serialization for hashing: sorted keys, no insignificant whitespace."""
+    return json.dumps(data, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_left
+
+from rpaquintoandar.domain.interfaces import IListingRepository
+
+# Pending additions are merged into the sorted array once they reach this size
+MERGE_THRESHOLD = 4096
+
+
+class KnownIdIndex:
+    """Membership index of listing source ids already in the database.
+
+    QuintoAndar ids are numeric, so they are kept as a sorted
+    ``array('q')`` (8 bytes per id) searched by bisection, with a small
+    set of recent additions merged in periodically. The rare non-numeric
+    id falls back to a plain set.
+    """
+
+    def __init__(self) -> None:
+        self._sorted = array("q")
+        self._pending: set[int] = set()
+        self._other: set[str] = set()
+
+    @classmethod
+    async def load(cls, repo: IListingRepository) -> KnownIdIndex:
+        index = cls()
+        numeric: list[int] = []
+        async for batch in repo.iter_source_ids():
+            for source_id in batch:
+                if source_id.isdigit():
+                    numeric.append(int(source_id))
+                else:
+                    index._other.add(source_id)
+        index._sorted = array("q", sorted(set(numeric)))
+        return index
+
+    def add(self, source_id: str) -> None:
+        if not source_id.isdigit():
+            self._other.add(source_id)
+            return
+        key = int(source_id)
+        if key in self._pending or self._in_sorted(key):
+            return
+        self._pending.add(key)
+        if len(self._pending) >= MERGE_THRESHOLD:
+            self._merge()
+
+    def __contains__(self, source_id: object) -> bool:
+        if not isinstance(source_id, str):
+            return False
+        if not source_id.isdigit():
+            return source_id in self._other
+        key = int(source_id)
+        return key in self._pending or self._in_sorted(key)
+
+    def __len__(self) -> int:
+        return len(self._sorted) + len(self._pending) + len(self._other)
+
+    def _in_sorted(self, key: int) -> bool:
+        i = bisect_left(self._sorted, key)
+        return i < len(self._sorted) and self._sorted[i] == key
+
+    def _merge(self) -> None:
+        merged = set(self._sorted)
+        merged.update(self._pending)
+        self._sorted = array("q", sorted(merged))
+        self._pending.clear()
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import math
+import time
+from array import array
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from rpaquintoandar.domain.entities import StepMetric
+
+# Phase latencies of the step running in the current task (and the tasks it spawns)
+_recorder: ContextVar[PhaseRecorder | None] = ContextVar("phase_recorder", default=None)
+
+
+def percentile(sorted_values: array[float] | list[float], pct: float) -> float:
+    """Nearest-rank percentile of already sorted values."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+class PhaseRecorder:
+    """Collects per-item durations by phase for one step.
+
+    Samples are kept as seconds in ``array('d')`` (8 bytes each) so a
+    long crawl's latencies stay cheap to hold until the step ends.
+    """
+
+    def __init__(self) -> None:
+        self._samples: dict[str, array[float]] = {}
+
+    def record(self, phase: str, seconds: float) -> None:
+        samples = self._samples.get(phase)
+        if samples is None:
+            samples = self._samples[phase] = array("d")
+        samples.append(seconds)
+
+    @property
+    def phases(self) -> list[str]:
+        return list(self._samples)
+
+    def summarize(
+        self, execution_run_id: int, step_name: str, step_record_id: int | None = None
+    ) -> list[StepMetric]:
+        metrics = []
+        for phase, samples in self._samples.items():
+            ordered = sorted(samples)
+            metrics.append(
+                StepMetric(
+                    execution_run_id=execution_run_id,
+                    step_record_id=step_record_id,
+                    step_name=step_name,
+                    phase=phase,
+                    samples=len(ordered),
+                    total_ms=sum(ordered) * 1000,
+                    p50_ms=percentile(ordered, 50) * 1000,
+                    p95_ms=percentile(ordered, 95) * 1000,
+                    p99_ms=percentile(ordered, 99) * 1000,
+                    max_ms=ordered[-1] * 1000,
+                )
+            )
+        return metrics
+
+
+@contextmanager
+def recording(recorder: PhaseRecorder) -> Iterator[PhaseRecorder]:
+    """Route ``phase`` timings in this context to ``recorder``."""
+    token = _recorder.set(recorder)
+    try:
+        yield recorder
+    finally:
+        _recorder.reset(token)
+
+
+@contextmanager
+def phase(name: str) -> Iterator[None]:
+    """Time the block as one sample of ``name``; a no-op outside ``recording``."""
+    recorder = _recorder.get()
+    if recorder is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        recorder.record(name, time.perf_counter() - started)
@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import cProfile
+import logging
+import sys
+import threading
+import tracemalloc
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Protocol
+
+from rpaquintoandar.infrastructure.config.settings_loader import ProfilingSettings
+
+logger = logging.getLogger(__name__)
+
+PROFILE_MODES = ("cprofile", "sampling", "tracemalloc")
+TRACEMALLOC_FRAMES = 25
+TRACEMALLOC_TOP = 40
+
+
+class _Profiler(Protocol):
+    def start(self) -> None: ...
+
+    def stop(self, output_dir: Path, name: str) -> Path: ...
+
+
+class _CProfiler:
+    """Deterministic profile, written as ``<name>.pstats``."""
+
+    def __init__(self) -> None:
+        self._profile = cProfile.Profile()
+
+    def start(self) -> None:
+        self._profile.enable()
+
+    def stop(self, output_dir: Path, name: str) -> Path:
+        self._profile.disable()
+        path = output_dir / f"{name}.pstats"
+        self._profile.dump_stats(path)
+        return path
+
+
+class _SamplingProfiler:
+    """Samples the event loop thread's stack from a side thread.
+
+    Writes ``<name>.collapsed``: one ``frame;frame;frame count`` line per
+    distinct stack, the input format of flamegraph.pl and speedscope.
+    Time the loop spends waiting on I/O shows up under its selector call.
+    """
+
+    def __init__(self, interval_ms: float) -> None:
+        self._interval = max(interval_ms, 0.5) / 1000.0
+        self._target = threading.get_ident()
+        self._stacks: Counter[str] = Counter()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._sample, name="sampling-profiler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self, output_dir: Path, name: str) -> Path:
+        self._stopped.set()
+        self._thread.join()
+        path = output_dir / f"{name}.collapsed"
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in self._stacks.most_common():
+                f.write(f"{stack} {count}\n")
+        return path
+
+    def _sample(self) -> None:
+        while not self._stopped.wait(self._interval):
+            frame = sys._current_frames().get(self._target)
+            frames: list[str] = []
+            while frame is not None:
+                code = frame.f_code
+                frames.append(f"{code.co_qualname} ({Path(code.co_filename).name}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if frames:
+                self._stacks[";".join(reversed(frames))] += 1
+
+
+class _TracemallocProfiler:
+    """Allocations made during the step: a snapshot plus a top-N report."""
+
+    def __init__(self) -> None:
+        self._owns_tracing = False
+
+    def start(self) -> None:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+            self._owns_tracing = True
+        tracemalloc.reset_peak()
+
+    def stop(self, output_dir: Path, name: str) -> Path:
+        snapshot = tracemalloc.take_snapshot().filter_traces(
+            (
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            )
+        )
+        current, peak = tracemalloc.get_traced_memory()
+        if self._owns_tracing:
+            tracemalloc.stop()
+
+        snapshot.dump(str(output_dir / f"{name}.tracemalloc"))
+        path = output_dir / f"{name}.tracemalloc.txt"
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(f"current={current / 1e6:.1f} MB peak={peak / 1e6:.1f} MB\n\n")
+            for stat in snapshot.statistics("lineno")[:TRACEMALLOC_TOP]:
+                f.write(f"{stat}\n")
+        return path
+
+
+class ProfileSession:
+    """Profiles pipeline steps one at a time into ``<output_dir>/<run_id>/``."""
+
+    def __init__(self, mode: str, output_dir: Path, sample_interval_ms: float = 5.0) -> None:
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"Unknown profiling mode: {mode}")
+        self._mode = mode
+        self._output_dir = output_dir
+        self._sample_interval_ms = sample_interval_ms
+
+    @classmethod
+    def from_settings(cls, settings: ProfilingSettings, run_id: int) -> ProfileSession | None:
+        """``None`` when profiling is off, so callers skip it entirely."""
+        if not settings.mode:
+            return None
+        return cls(settings.mode, Path(settings.output_dir) / str(run_id), settings.sample_interval_ms)
+
+    @contextmanager
+    def profile(self, name: str) -> Iterator[None]:
+        profiler = self._new_profiler()
+        self._output_dir.mkdir(parents=True, exist_ok=True)
+        profiler.start()
+        try:
+            yield
+        finally:
+            path = profiler.stop(self._output_dir, name)
+            logger.info("Wrote %s profile of %s to %s", self._mode, name, path)
+
+    def _new_profiler(self) -> _Profiler:
+        if self._mode == "cprofile":
+            return _CProfiler()
+        if self._mode == "sampling":
+            return _SamplingProfiler(self._sample_interval_ms)
+        return _TracemallocProfiler()
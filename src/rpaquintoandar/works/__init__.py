@@ -1,6 +1,17 @@
 from .full_crawl_work import FullCrawlWork
+from .refresh_work import RefreshWork
+from .reprocess_work import ReprocessWork
 from .resume_work import ResumeWork
 from .single_listing_test_work import SingleListingTestWork
 from .single_page_test_work import SinglePageTestWork
+from .stats_work import StatsWork
 
-__all__ = ["FullCrawlWork", "ResumeWork", "SingleListingTestWork", "SinglePageTestWork"]
+__all__ = [
+    "FullCrawlWork",
+    "RefreshWork",
+    "ReprocessWork",
+    "ResumeWork",
+    "SingleListingTestWork",
+    "SinglePageTestWork",
+    "StatsWork",
+]
@@ -17,14 +17,16 @@ class FullCrawlWork:
         criteria: SearchCriteria,
         max_pages: int | None = None,
         target_count: int | None = None,
+        streaming: bool = False,
     ) -> None:
         self._container = container
         self._criteria = criteria
         self._max_pages = max_pages
         self._target_count = target_count
+        self._streaming = streaming
 
     async def execute(self) -> None:
-        logger.info("Starting FullCrawlWork")
+        logger.info("Starting FullCrawlWork (streaming=%s)", self._streaming)
         metadata: dict = {"mode": "full-crawl"}
         if self._max_pages is not None:
             metadata["max_pages"] = self._max_pages
@@ -40,6 +42,8 @@ class FullCrawlWork:
         )
         runner = PipelineRunner(
             steps=[SearchStep(), ExtractStep(), ExportStep()],
+            streaming=self._streaming,
+            queue_size=self._container.settings.scraping.stream_queue_size,
         )
         await runner.run(context)
         logger.info("FullCrawlWork finished")
@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+import logging
+
+from rpaquintoandar.application.pipeline import PipelineContext, PipelineRunner
+from rpaquintoandar.application.steps import ExportStep, RefreshStep
+from rpaquintoandar.domain.value_objects import SearchCriteria
+from rpaquintoandar.shared.di_container import Container
+
+logger = logging.getLogger(__name__)
+
+
+class RefreshWork:
+    def __init__(self, container: Container) -> None:
+        self._container = container
+
+    async def execute(self) -> None:
+        logger.info("Starting RefreshWork")
+        context = PipelineContext(
+            container=self._container,
+            criteria=SearchCriteria(),
+            metadata={"mode": "refresh"},
+        )
+        runner = PipelineRunner(steps=[RefreshStep(), ExportStep()])
+        await runner.run(context)
+        logger.info("RefreshWork finished")
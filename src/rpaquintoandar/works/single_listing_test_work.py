@@ -23,7 +23,14 @@ class SingleListingTestWork:
         )
 
         detail_extractor = await self._container.detail_extractor()
-        json_str = await detail_extractor.extract_detail(listing)
+        retry_policy = self._container.retry_policy()
+        try:
+            json_str = await retry_policy.run(
+                lambda: detail_extractor.extract_detail(listing), listing.source_id
+            )
+        except Exception as exc:
+            logger.warning("Detail extraction failed for %s: %s", listing.source_id, exc)
+            json_str = ""
 
         print(f"\n{'='*60}")
         print(f"Listing Detail Extraction: {self._listing_id}")
@@ -35,17 +42,17 @@ class SingleListingTestWork:
 
         try:
             data = json.loads(json_str)
-            props = data.get("props", {}).get("pageProps", {})
-            house = props.get("house", {}) or props.get("listing", {}) or {}
+            initial = data.get("props", {}).get("pageProps", {}).get("initialState", {})
+            house = initial.get("house", {}).get("houseInfo", {}) or {}
 
-            print(f"  Description:  {(house.get('description', '') or '')[:200]}...")
+            print(f"  Description:  {(house.get('remarks', '') or '')[:200]}...")
             print(f"  Address:      {house.get('address', {})}")
             print(f"  Price:        {house.get('salePrice', 'N/A')}")
             print(f"  Area:         {house.get('area', 'N/A')} m²")
             print(f"  Bedrooms:     {house.get('bedrooms', 'N/A')}")
-            print(f"  Furnished:    {house.get('furnished', 'N/A')}")
-            print(f"  Pet Friendly: {house.get('petFriendly', 'N/A')}")
-            print(f"  Year Built:   {house.get('yearBuilt', 'N/A')}")
+            print(f"  Furnished:    {house.get('hasFurniture', 'N/A')}")
+            print(f"  Pet Friendly: {house.get('acceptsPets', 'N/A')}")
+            print(f"  Year Built:   {house.get('constructionYear', 'N/A')}")
             print(f"  JSON size:    {len(json_str)} chars")
         except json.JSONDecodeError:
             print(f"  Raw data ({len(json_str)} chars): {json_str[:500]}...")
@@ -0,0 +1,18 @@
+from __future__ import annotations
+
+import logging
+
+from rpaquintoandar.application.use_cases import CompareRunsUseCase
+from rpaquintoandar.shared.di_container import Container
+
+logger = logging.getLogger(__name__)
+
+
+class StatsWork:
+    def __init__(self, container: Container, runs: int = 5) -> None:
+        self._container = container
+        self._runs = runs
+
+    async def execute(self) -> None:
+        use_case = CompareRunsUseCase(self._container.execution_repo())
+        print(await use_case.execute(self._runs))
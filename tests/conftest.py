@@ -1,9 +1,12 @@
 import asyncio
 import tempfile
+from collections.abc import Callable
 from pathlib import Path
+from typing import Any
 
 import pytest
 
+from rpaquintoandar.domain.entities import Listing
 from rpaquintoandar.infrastructure.config.settings_loader import Settings
 from rpaquintoandar.infrastructure.persistence.database_manager import DatabaseManager
 
@@ -31,3 +34,17 @@ async def db_manager(tmp_db_path: str) -> DatabaseManager:
 @pytest.fixture
 def settings() -> Settings:
     return Settings()
+
+
+@pytest.fixture
+def make_listing() -> Callable[..., Listing]:
+    """Factory for listings with a detail URL derived from ``source_id``."""
+
+    def factory(source_id: str, **fields: Any) -> Listing:
+        return Listing(
+            source_id=source_id,
+            source_url=f"https://www.quintoandar.com.br/imovel/{source_id}",
+            **fields,
+        )
+
+    return factory
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import sqlite3
+
+import pytest
+
+from rpaquintoandar.infrastructure.config.settings_loader import PersistenceSettings
+from rpaquintoandar.infrastructure.persistence.database_manager import DatabaseManager
+
+
+async def pragma(conn, name: str):
+    cursor = await conn.execute(f"PRAGMA {name}")
+    row = await cursor.fetchone()
+    return row[0]
+
+
+@pytest.mark.asyncio
+async def test_performance_pragmas_are_applied(tmp_db_path: str):
+    settings = PersistenceSettings(
+        synchronous="normal", cache_size=-8192, temp_store="MEMORY", busy_timeout=1234
+    )
+    manager = DatabaseManager(tmp_db_path, settings)
+    await manager.initialize()
+
+    conn = manager.connection
+    assert await pragma(conn, "journal_mode") == "wal"
+    assert await pragma(conn, "synchronous") == 1  # NORMAL
+    assert await pragma(conn, "cache_size") == -8192
+    assert await pragma(conn, "temp_store") == 2  # MEMORY
+    assert await pragma(conn, "busy_timeout") == 1234
+    async with manager.reader() as reader:
+        assert await pragma(reader, "cache_size") == -8192
+
+    await manager.close()
+
+
+@pytest.mark.asyncio
+async def test_invalid_synchronous_mode_is_rejected(tmp_db_path: str):
+    manager = DatabaseManager(tmp_db_path, PersistenceSettings(synchronous="SOMETIMES"))
+
+    with pytest.raises(ValueError, match="synchronous"):
+        await manager.initialize()
+    await manager.close()
+
+
+@pytest.mark.asyncio
+async def test_readers_are_read_only_and_see_flushed_writes(db_manager: DatabaseManager):
+    async def insert(conn):
+        await conn.execute(
+            "INSERT INTO execution_runs (mode, started_at) VALUES ('full', datetime('now'))"
+        )
+
+    await db_manager.write(insert)
+    await db_manager.flush()
+
+    async with db_manager.reader() as conn:
+        cursor = await conn.execute("SELECT COUNT(*) FROM execution_runs")
+        assert (await cursor.fetchone())[0] == 1
+        with pytest.raises(sqlite3.OperationalError, match="readonly"):
+            await conn.execute("DELETE FROM execution_runs")
+
+
+@pytest.mark.asyncio
+async def test_checkpoint_moves_wal_pages_into_database(db_manager: DatabaseManager):
+    async def insert(conn):
+        await conn.executemany(
+            "INSERT INTO execution_runs (mode, started_at) VALUES (?, datetime('now'))",
+            [(f"m{i}",) for i in range(200)],
+        )
+
+    await db_manager.write(insert)
+
+    busy, wal_pages, checkpointed = await db_manager.checkpoint("TRUNCATE")
+
+    assert busy == 0
+    assert wal_pages == checkpointed
@@ -21,11 +21,17 @@ async def test_database_initializes(tmp_db_path: str):
     assert "execution_runs" in tables
     assert "step_records" in tables
     assert "schema_version" in tables
+    assert "step_metrics" in tables
 
     cursor = await conn.execute("SELECT MAX(version) FROM schema_version")
     row = await cursor.fetchone()
     assert row is not None
-    assert row[0] == 0
+    assert row[0] == 4
+
+    cursor = await conn.execute("PRAGMA table_info(listings)")
+    columns = {row[1] for row in await cursor.fetchall()}
+    assert "last_fetched_at" in columns
+    assert {"lease_owner", "lease_expires_at"} <= columns
 
     await manager.close()
 
@@ -39,3 +45,26 @@ async def test_double_initialization_is_safe(tmp_db_path: str):
     manager2 = DatabaseManager(tmp_db_path)
     await manager2.initialize()
     await manager2.close()
+
+
+@pytest.mark.asyncio
+async def test_enriched_rows_become_due_for_rehash(tmp_db_path: str):
+    manager = DatabaseManager(tmp_db_path)
+    await manager.initialize()
+    conn = manager.connection
+    await conn.execute(
+        "INSERT INTO listings (source_id, source_url, status, content_hash, last_fetched_at, "
+        "created_at, updated_at) VALUES ('1', 'u', 'enriched', 'legacy', '2026-01-01', "
+        "'2026-01-01', '2026-01-01')"
+    )
+    await conn.execute("DELETE FROM schema_version WHERE version = 4")
+    await conn.commit()
+    await manager.close()
+
+    manager = DatabaseManager(tmp_db_path)
+    await manager.initialize()
+    cursor = await manager.connection.execute(
+        "SELECT last_fetched_at FROM listings WHERE source_id = '1'"
+    )
+    assert await cursor.fetchone() == (None,)
+    await manager.close()
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+from rpaquintoandar.infrastructure.archive import PayloadArchive
+
+
+@pytest.mark.asyncio
+async def test_store_and_read_latest(tmp_path: Path):
+    archive = PayloadArchive(tmp_path / "archive")
+    t0 = datetime(2026, 1, 1)
+
+    await archive.store("1", '{"v": 1}', fetched_at=t0)
+    await archive.store("1", '{"v": 2}', fetched_at=t0 + timedelta(days=1))
+    await archive.store("2", '{"v": 3}', fetched_at=t0)
+
+    latest = dict(archive.iter_latest())
+    assert latest == {"1": '{"v": 2}', "2": '{"v": 3}'}
+    assert len(archive.history("1")) == 2
+    archive.close()
+
+
+@pytest.mark.asyncio
+async def test_identical_payloads_stored_once(tmp_path: Path):
+    archive = PayloadArchive(tmp_path / "archive")
+
+    await archive.store("1", '{"same": true}')
+    await archive.store("2", '{"same": true}')
+
+    entries = archive.latest_entries()
+    assert len({(e.segment, e.offset) for e in entries}) == 1
+    archive.close()
+
+
+@pytest.mark.asyncio
+async def test_reopen_reads_index_and_rolls_segments(tmp_path: Path):
+    directory = tmp_path / "archive"
+    archive = PayloadArchive(directory, segment_max_bytes=64)
+    for i in range(10):
+        await archive.store(str(i), f'{{"payload": "{"x" * 50}{i}"}}')
+    archive.close()
+
+    assert len(list(directory.glob("segment-*.seg"))) > 1
+
+    reopened = PayloadArchive(directory, segment_max_bytes=64)
+    latest = dict(reopened.iter_latest())
+    assert latest["7"].endswith('7"}')
+    assert len(latest) == 10
+
+    await reopened.store("10", '{"after": "reopen"}')
+    assert dict(reopened.iter_latest())["10"] == '{"after": "reopen"}'
+    reopened.close()
+
+
+@pytest.mark.asyncio
+async def test_torn_index_line_is_ignored(tmp_path: Path):
+    directory = tmp_path / "archive"
+    archive = PayloadArchive(directory)
+    await archive.store("1", '{"ok": 1}')
+    archive.close()
+
+    with open(directory / "index.tsv", "a", encoding="utf-8") as f:
+        f.write("2\t2026-01-01T00:00")
+
+    reopened = PayloadArchive(directory)
+    assert dict(reopened.iter_latest()) == {"1": '{"ok": 1}'}
+    reopened.close()
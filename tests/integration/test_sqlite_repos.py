@@ -1,12 +1,18 @@
 from __future__ import annotations
 
+from datetime import datetime, timedelta
+
 import pytest
 
-from rpaquintoandar.domain.entities import Listing
-from rpaquintoandar.domain.enums import ProcessingStatus
+from rpaquintoandar.application.use_cases import CompareRunsUseCase
+from rpaquintoandar.domain.entities import ExecutionRun, Listing, StepRecord
+from rpaquintoandar.domain.enums import ProcessingStatus, StepStatus
 from rpaquintoandar.domain.value_objects import Address, ContentHash, PriceInfo
 from rpaquintoandar.infrastructure.persistence.database_manager import DatabaseManager
+from rpaquintoandar.infrastructure.persistence.sqlite_execution_repo import SqliteExecutionRepo
 from rpaquintoandar.infrastructure.persistence.sqlite_listing_repo import SqliteListingRepo
+from rpaquintoandar.shared.known_ids import KnownIdIndex
+from rpaquintoandar.shared.perf_metrics import PhaseRecorder
 
 
 def make_listing(source_id: str = "test-1", **kwargs) -> Listing:
@@ -80,6 +86,28 @@ async def test_exists_by_hash(db_manager: DatabaseManager):
     assert await repo.exists_by_hash(ContentHash.from_text("other")) is False
 
 
+@pytest.mark.asyncio
+async def test_exists_by_hash_answers_misses_from_memory(db_manager: DatabaseManager):
+    seeded = make_listing("hash-seeded")
+    seeded.mark_enriched(ContentHash.from_text("seeded"))
+    await SqliteListingRepo(db_manager).upsert(seeded)
+
+    repo = SqliteListingRepo(db_manager)
+    assert await repo.exists_by_hash(ContentHash.from_text("seeded")) is True
+
+    later = make_listing("hash-later")
+    later.mark_enriched(ContentHash.from_text("later"))
+    await repo.upsert(later)
+
+    statements: list[str] = []
+    await db_manager.connection.set_trace_callback(statements.append)
+    assert await repo.exists_by_hash(ContentHash.from_text("missing")) is False
+    assert await repo.exists_by_hash(ContentHash.from_text("later")) is True
+    await db_manager.connection.set_trace_callback(None)
+
+    assert len([s for s in statements if "WHERE content_hash=" in s]) == 1
+
+
 @pytest.mark.asyncio
 async def test_get_enriched(db_manager: DatabaseManager):
     repo = SqliteListingRepo(db_manager)
@@ -89,3 +117,178 @@ async def test_get_enriched(db_manager: DatabaseManager):
 
     enriched = await repo.get_enriched()
     assert any(l.source_id == "enriched-1" for l in enriched)
+
+
+@pytest.mark.asyncio
+async def test_get_due_for_refresh_oldest_first(db_manager: DatabaseManager):
+    repo = SqliteListingRepo(db_manager)
+    now = datetime.now()
+    for source_id, age_days in (("fresh", 1), ("old", 30), ("older", 60)):
+        listing = make_listing(source_id)
+        listing.mark_enriched(ContentHash.from_text(source_id))
+        listing.last_fetched_at = now - timedelta(days=age_days)
+        await repo.upsert(listing)
+    await repo.upsert(make_listing("pending"))
+
+    due = await repo.get_due_for_refresh(now - timedelta(days=7), limit=10)
+    assert [l.source_id for l in due] == ["older", "old"]
+
+    due = await repo.get_due_for_refresh(now - timedelta(days=7), limit=1)
+    assert [l.source_id for l in due] == ["older"]
+
+
+@pytest.mark.asyncio
+async def test_claim_batch_leases_disjoint_listings(db_manager: DatabaseManager):
+    repo = SqliteListingRepo(db_manager)
+    await repo.upsert_many([make_listing(f"claim-{i}") for i in range(5)])
+
+    first = await repo.claim_batch(3, "host:1", lease_seconds=60)
+    second = await repo.claim_batch(3, "host:2", lease_seconds=60)
+    third = await repo.claim_batch(3, "host:3", lease_seconds=60)
+
+    assert [l.source_id for l in first] == ["claim-0", "claim-1", "claim-2"]
+    assert [l.source_id for l in second] == ["claim-3", "claim-4"]
+    assert third == []
+    assert all(l.status == ProcessingStatus.IN_PROGRESS for l in first + second)
+
+    # Finishing a listing clears its lease
+    first[0].mark_enriched(ContentHash.from_text("x"))
+    await repo.upsert(first[0])
+    released = await repo.release_leases("host:1")
+    assert released == 2
+    again = await repo.claim_batch(10, "host:4", lease_seconds=60)
+    assert [l.source_id for l in again] == ["claim-1", "claim-2"]
+
+
+@pytest.mark.asyncio
+async def test_claim_batch_reclaims_expired_leases(db_manager: DatabaseManager):
+    repo = SqliteListingRepo(db_manager)
+    await repo.upsert(make_listing("lease-1"))
+
+    crashed = await repo.claim_batch(10, "dead:1", lease_seconds=-1)
+    assert len(crashed) == 1
+
+    reclaimed = await repo.claim_batch(10, "live:2", lease_seconds=60)
+    assert [l.source_id for l in reclaimed] == ["lease-1"]
+    assert await repo.claim_batch(10, "live:3", lease_seconds=60) == []
+
+
+@pytest.mark.asyncio
+async def test_claim_source_ids_leases_only_claimable_listings(db_manager: DatabaseManager):
+    repo = SqliteListingRepo(db_manager)
+    await repo.upsert_many([make_listing(f"stream-{i}") for i in range(4)])
+    taken = await repo.claim_batch(1, "other:1", lease_seconds=60)
+
+    claimed = await repo.claim_source_ids(
+        ["stream-0", "stream-2", "stream-3", "missing"], "host:1", lease_seconds=60
+    )
+
+    assert taken[0].source_id == "stream-0"
+    assert [l.source_id for l in claimed] == ["stream-2", "stream-3"]
+    assert await repo.claim_source_ids(["stream-2"], "host:2", lease_seconds=60) == []
+
+
+@pytest.mark.asyncio
+async def test_iter_by_status_pages_by_id(db_manager: DatabaseManager):
+    repo = SqliteListingRepo(db_manager)
+    await repo.upsert_many([make_listing(f"iter-{i}") for i in range(7)])
+    enriched = await repo.get_by_source_id("iter-3")
+    assert enriched is not None
+    enriched.mark_enriched(ContentHash.from_text("iter"))
+    await repo.upsert(enriched)
+
+    batches = [batch async for batch in repo.iter_by_status(ProcessingStatus.PENDING, 3)]
+
+    assert [len(b) for b in batches] == [3, 3]
+    ids = [l.source_id for b in batches for l in b]
+    assert ids == ["iter-0", "iter-1", "iter-2", "iter-4", "iter-5", "iter-6"]
+
+
+@pytest.mark.asyncio
+async def test_upsert_many_counts_only_new_rows(db_manager: DatabaseManager):
+    repo = SqliteListingRepo(db_manager)
+    existing = make_listing("mixed-0", description="kept")
+    await repo.upsert(existing)
+
+    batch = [make_listing("mixed-0"), make_listing("mixed-1"), make_listing("mixed-1")]
+    created = await repo.upsert_many(batch)
+
+    assert created == 1
+    kept = await repo.get_by_source_id("mixed-0")
+    assert kept is not None and kept.description == "kept"
+
+
+@pytest.mark.asyncio
+async def test_upsert_writes_only_changed_columns(db_manager: DatabaseManager):
+    repo = SqliteListingRepo(db_manager)
+    await repo.upsert(make_listing("dirty-1", description="desc", images=["a.jpg"]))
+    loaded = await repo.get_by_source_id("dirty-1")
+    assert loaded is not None
+
+    statements: list[str] = []
+    await db_manager.connection.set_trace_callback(statements.append)
+    loaded.mark_failed()
+    await repo.upsert(loaded)
+    await repo.upsert(loaded)  # nothing left to write
+    await db_manager.connection.set_trace_callback(None)
+
+    updates = [s for s in statements if s.lstrip().startswith("UPDATE")]
+    assert len(updates) == 1
+    assert "status=" in updates[0]
+    assert "images" not in updates[0] and "description" not in updates[0]
+
+    fetched = await repo.get_by_source_id("dirty-1")
+    assert fetched is not None
+    assert fetched.status == ProcessingStatus.FAILED
+    assert fetched.images == ["a.jpg"]
+
+
+@pytest.mark.asyncio
+async def test_upsert_without_id_uses_native_upsert(db_manager: DatabaseManager):
+    repo = SqliteListingRepo(db_manager)
+    first = await repo.upsert(make_listing("native-1", description="v1"))
+    second = await repo.upsert(make_listing("native-1", description="v2"))
+
+    assert second.id == first.id
+    fetched = await repo.get_by_source_id("native-1")
+    assert fetched is not None and fetched.description == "v2"
+
+
+@pytest.mark.asyncio
+async def test_known_id_index_loads_stored_source_ids(db_manager: DatabaseManager):
+    repo = SqliteListingRepo(db_manager)
+    await repo.upsert_many([make_listing(sid) for sid in ("900001", "900002", "legacy-x")])
+
+    batches = [batch async for batch in repo.iter_source_ids(batch_size=2)]
+    known_ids = await KnownIdIndex.load(repo)
+
+    assert [len(b) for b in batches] == [2, 1]
+    assert len(known_ids) == 3
+    assert "900002" in known_ids and "legacy-x" in known_ids
+    assert "900003" not in known_ids
+
+
+@pytest.mark.asyncio
+async def test_step_metrics_round_trip_and_compare_runs(db_manager: DatabaseManager):
+    repo = SqliteExecutionRepo(db_manager)
+    for mode in ("full-crawl", "resume"):
+        run = await repo.create_run(ExecutionRun(mode=mode))
+        step = await repo.create_step(StepRecord(execution_run_id=run.id, step_name="extract"))
+        step.items_processed = 10
+        step.finish(StepStatus.SUCCEEDED)
+        await repo.update_step(step)
+        recorder = PhaseRecorder()
+        for seconds in (0.1, 0.2, 0.3):
+            recorder.record("fetch", seconds)
+        await repo.save_step_metrics(recorder.summarize(run.id, "extract", step.id))
+        run.finish(StepStatus.SUCCEEDED)
+        await repo.update_run(run)
+
+    runs = await repo.get_recent_runs(5)
+    metrics = await repo.get_step_metrics(runs[0].id)
+    report = await CompareRunsUseCase(repo).execute(5)
+
+    assert [r.mode for r in runs] == ["full-crawl", "resume"]
+    assert [(m.phase, m.samples, round(m.p50_ms)) for m in metrics] == [("fetch", 3, 200)]
+    assert "extract.fetch p50/95/99" in report
+    assert "200/300/300ms" in report
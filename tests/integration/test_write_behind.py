@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import asyncio
+import sqlite3
+
+import aiosqlite
+import pytest
+
+from rpaquintoandar.infrastructure.config.settings_loader import PersistenceSettings
+from rpaquintoandar.infrastructure.persistence.database_manager import DatabaseManager
+
+
+def count_committed(db_path: str) -> int:
+    # A separate connection only sees committed data
+    with sqlite3.connect(db_path) as conn:
+        return conn.execute("SELECT COUNT(*) FROM execution_runs").fetchone()[0]
+
+
+def insert_run(mode: str):
+    async def op(conn: aiosqlite.Connection) -> int | None:
+        cursor = await conn.execute(
+            "INSERT INTO execution_runs (mode, started_at) VALUES (?, datetime('now'))",
+            (mode,),
+        )
+        return cursor.lastrowid
+
+    return op
+
+
+@pytest.mark.asyncio
+async def test_writes_are_group_committed(tmp_db_path: str):
+    manager = DatabaseManager(
+        tmp_db_path, PersistenceSettings(write_batch_size=10, flush_interval_ms=10_000)
+    )
+    await manager.initialize()
+
+    ids = await asyncio.gather(*(manager.write(insert_run(f"m{i}")) for i in range(25)))
+
+    assert len(set(ids)) == 25
+    assert manager.commits == 2
+    assert count_committed(tmp_db_path) == 20
+
+    await manager.flush()
+    assert count_committed(tmp_db_path) == 25
+    await manager.close()
+
+
+@pytest.mark.asyncio
+async def test_interval_commits_and_close_flushes(tmp_db_path: str):
+    manager = DatabaseManager(
+        tmp_db_path, PersistenceSettings(write_batch_size=1000, flush_interval_ms=20)
+    )
+    await manager.initialize()
+
+    await manager.write(insert_run("a"))
+    await asyncio.sleep(0.1)
+    assert count_committed(tmp_db_path) == 1
+
+    await manager.write(insert_run("b"))
+    await manager.close()
+    assert count_committed(tmp_db_path) == 2
+
+
+@pytest.mark.asyncio
+async def test_failed_write_does_not_stop_writer(tmp_db_path: str):
+    manager = DatabaseManager(tmp_db_path)
+    await manager.initialize()
+
+    async def broken(conn: aiosqlite.Connection) -> None:
+        await conn.execute("INSERT INTO no_such_table VALUES (1)")
+
+    with pytest.raises(sqlite3.OperationalError):
+        await manager.write(broken)
+    assert await manager.write(insert_run("after")) is not None
+
+    await manager.close()
+    assert count_committed(tmp_db_path) == 1
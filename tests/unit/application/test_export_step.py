@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import csv
+import json
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+from rpaquintoandar.application.pipeline import PipelineContext
+from rpaquintoandar.application.steps import ExportStep
+from rpaquintoandar.domain.entities import Listing
+from rpaquintoandar.domain.value_objects import ContentHash, SearchCriteria
+from rpaquintoandar.infrastructure.config.settings_loader import Settings
+
+
+class PagedRepo:
+    def __init__(self, listings: list[Listing]) -> None:
+        self._listings = listings
+        self.batch_sizes: list[int] = []
+
+    async def iter_by_status(self, status, batch_size=500):
+        for start in range(0, len(self._listings), batch_size):
+            batch = self._listings[start : start + batch_size]
+            self.batch_sizes.append(len(batch))
+            yield batch
+
+
+def make_context(tmp_path: Path, repo: PagedRepo, formats: list[str]) -> PipelineContext:
+    settings = Settings()
+    settings.export.output_dir = str(tmp_path)
+    settings.export.formats = formats
+    settings.export.batch_size = 2
+    container = MagicMock()
+    container.settings = settings
+    container.listing_repo.return_value = repo
+    return PipelineContext(container=container, criteria=SearchCriteria())
+
+
+def make_enriched(source_id: str) -> Listing:
+    listing = Listing(
+        source_id=source_id,
+        source_url=f"https://www.quintoandar.com.br/imovel/{source_id}",
+        description="Apartamento com varanda",
+        images=["a.jpg"],
+    )
+    listing.mark_enriched(ContentHash.from_text(source_id))
+    return listing
+
+
+@pytest.mark.asyncio
+async def test_export_streams_same_documents(tmp_path: Path):
+    listings = [make_enriched(f"e-{i}") for i in range(5)]
+    repo = PagedRepo(listings)
+
+    result = await ExportStep().execute(make_context(tmp_path, repo, ["json", "csv"]))
+
+    assert result.items_created == 5
+    assert repo.batch_sizes == [2, 2, 1]
+    records = [ExportStep._to_record(l) for l in listings]
+    expected_json = json.dumps(records, ensure_ascii=False, indent=2)
+    assert (tmp_path / "listings.json").read_text(encoding="utf-8") == expected_json
+    with open(tmp_path / "listings.csv", encoding="utf-8", newline="") as f:
+        rows = list(csv.DictReader(f))
+    assert [r["source_id"] for r in rows] == [f"e-{i}" for i in range(5)]
+    assert json.loads(rows[0]["images"]) == ["a.jpg"]
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+@pytest.mark.asyncio
+async def test_export_nothing_writes_no_files(tmp_path: Path):
+    result = await ExportStep().execute(make_context(tmp_path, PagedRepo([]), ["json"]))
+
+    assert result.items_processed == 0
+    assert not (tmp_path / "listings.json").exists()
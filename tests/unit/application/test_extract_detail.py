@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from unittest.mock import AsyncMock
+
+import pytest
+
+from rpaquintoandar.application.use_cases import ExtractDetailUseCase
+from rpaquintoandar.domain.entities import Listing
+from rpaquintoandar.domain.enums import ProcessingStatus
+from rpaquintoandar.infrastructure.resilience import ListingNotFoundError, RetryPolicy
+
+
+def make_next_data(remarks: str) -> str:
+    return json.dumps(
+        {"props": {"pageProps": {"initialState": {"house": {"houseInfo": {"remarks": remarks}}}}}}
+    )
+
+
+class SlowExtractor:
+    def __init__(self, payloads: dict[str, str]) -> None:
+        self._payloads = payloads
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def extract_detail(self, listing: Listing) -> str:
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        return self._payloads.get(listing.source_id, "")
+
+
+def make_repo(pending: list[Listing]) -> AsyncMock:
+    repo = AsyncMock()
+    repo.claim_batch = AsyncMock(side_effect=[pending, []])
+    repo.release_leases = AsyncMock(return_value=0)
+    repo.exists_by_hash = AsyncMock(return_value=False)
+    repo.upsert = AsyncMock(side_effect=lambda listing: listing)
+    return repo
+
+
+@pytest.mark.asyncio
+async def test_extract_runs_workers_concurrently(make_listing):
+    pending = [make_listing(f"l-{i}") for i in range(8)]
+    extractor = SlowExtractor({p.source_id: make_next_data(p.source_id) for p in pending})
+    repo = make_repo(pending)
+
+    use_case = ExtractDetailUseCase(extractor, repo, concurrency=4)
+    result = await use_case.execute()
+
+    assert result.total_processed == 8
+    assert result.enriched == 8
+    assert extractor.max_in_flight == 4
+    assert len(result.workers) == 4
+    assert sum(w.processed for w in result.workers) == 8
+
+
+@pytest.mark.asyncio
+async def test_extract_concurrent_accounting(make_listing):
+    pending = [make_listing(f"l-{i}") for i in range(6)]
+    payloads = {
+        "l-0": make_next_data("same"),
+        "l-1": make_next_data("same"),
+        "l-2": make_next_data("a"),
+        "l-3": make_next_data("b"),
+    }
+    extractor = SlowExtractor(payloads)
+    repo = make_repo(pending)
+
+    use_case = ExtractDetailUseCase(extractor, repo, concurrency=3)
+    result = await use_case.execute()
+
+    assert result.enriched == 3
+    assert result.duplicates == 1
+    assert result.failed == 2
+    statuses = [listing.status for listing in pending]
+    assert statuses.count(ProcessingStatus.FAILED) == 2
+
+
+@pytest.mark.asyncio
+async def test_extract_given_listings_counts_unchanged(make_listing):
+    listing = make_listing("l-0")
+    extractor = SlowExtractor({"l-0": make_next_data("same")})
+    repo = make_repo([])
+
+    first = await ExtractDetailUseCase(extractor, repo).execute([listing])
+    fetched_at = listing.last_fetched_at
+    second = await ExtractDetailUseCase(extractor, repo).execute([listing])
+
+    assert first.enriched == 1
+    assert second.unchanged == 1
+    assert listing.status == ProcessingStatus.ENRICHED
+    assert listing.last_fetched_at is not None and listing.last_fetched_at >= fetched_at
+    repo.claim_batch.assert_not_awaited()
+
+
+class RaisingExtractor:
+    def __init__(self, error: Exception) -> None:
+        self._error = error
+        self.calls = 0
+
+    async def extract_detail(self, listing: Listing) -> str:
+        self.calls += 1
+        raise self._error
+
+
+@pytest.mark.asyncio
+async def test_extract_does_not_retry_missing_listing(make_listing):
+    listing = make_listing("gone")
+    extractor = RaisingExtractor(ListingNotFoundError("gone", 404))
+    policy = RetryPolicy(max_attempts=3, base_delay_ms=0)
+
+    result = await ExtractDetailUseCase(
+        extractor, make_repo([]), retry_policy=policy
+    ).execute([listing])
+
+    assert extractor.calls == 1
+    assert result.failed == 1
+    assert listing.status == ProcessingStatus.FAILED
+
+
+@pytest.mark.asyncio
+async def test_extract_stream_claims_arriving_ids_then_sweeps_pending(make_listing):
+    streamed = [make_listing(f"s-{i}") for i in range(3)]
+    leftover = [make_listing("old-1")]
+    everything = streamed + leftover
+    extractor = SlowExtractor({e.source_id: make_next_data(e.source_id) for e in everything})
+    repo = make_repo(leftover)
+    repo.claim_source_ids = AsyncMock(
+        side_effect=lambda ids, worker, lease: [s for s in streamed if s.source_id in ids]
+    )
+    enriched: list[str] = []
+
+    async def on_enriched(listing: Listing) -> None:
+        enriched.append(listing.source_id)
+
+    async def batches():
+        yield ["s-0", "s-1"]
+        yield ["s-2"]
+
+    use_case = ExtractDetailUseCase(extractor, repo, concurrency=2, on_enriched=on_enriched)
+    result = await use_case.execute_stream(batches())
+
+    assert result.enriched == 4
+    assert repo.claim_source_ids.await_count == 2
+    assert sorted(enriched) == ["old-1", "s-0", "s-1", "s-2"]
+    repo.release_leases.assert_awaited_once()
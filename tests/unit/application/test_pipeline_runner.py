@@ -1,11 +1,15 @@
 from __future__ import annotations
 
+import asyncio
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 
-from rpaquintoandar.application.pipeline import PipelineContext, PipelineRunner
+from rpaquintoandar.application.pipeline import PipelineContext, PipelineRunner, iter_queue
+from rpaquintoandar.domain.enums import StepStatus
 from rpaquintoandar.domain.value_objects import SearchCriteria, StepResult
+from rpaquintoandar.infrastructure.config.settings_loader import ProfilingSettings
+from rpaquintoandar.shared.perf_metrics import phase
 
 
 def make_mock_container():
@@ -20,6 +24,7 @@ def make_mock_container():
     )
     execution_repo.update_step = AsyncMock()
     container.execution_repo.return_value = execution_repo
+    container.settings.profiling = ProfilingSettings()
     return container
 
 
@@ -73,3 +78,114 @@ async def test_runner_stops_on_failure():
     await runner.run(context)
 
     assert "after_fail" not in context.step_results
+
+
+class Producer:
+    def __init__(self, items: list[int]):
+        self._items = items
+        self.max_ahead = 0
+
+    @property
+    def name(self) -> str:
+        return "producer"
+
+    async def execute(self, context: PipelineContext) -> StepResult:
+        return StepResult()
+
+    async def stream(self, context, inbox, outbox) -> StepResult:
+        for item in self._items:
+            await outbox.put(item)
+            self.max_ahead = max(self.max_ahead, outbox.qsize())
+        return StepResult(items_processed=len(self._items))
+
+
+class Consumer:
+    def __init__(self, fail: bool = False):
+        self._fail = fail
+        self.seen: list[int] = []
+
+    @property
+    def name(self) -> str:
+        return "consumer"
+
+    async def execute(self, context: PipelineContext) -> StepResult:
+        return StepResult()
+
+    async def stream(self, context, inbox, outbox) -> StepResult:
+        async for item in iter_queue(inbox):
+            if self._fail:
+                raise RuntimeError("consumer exploded")
+            await asyncio.sleep(0)
+            self.seen.append(item)
+        return StepResult(items_processed=len(self.seen))
+
+
+@pytest.mark.asyncio
+async def test_streaming_runner_connects_steps_with_bounded_queue():
+    container = make_mock_container()
+    context = PipelineContext(container=container, criteria=SearchCriteria())
+    producer, consumer = Producer(list(range(50))), Consumer()
+
+    runner = PipelineRunner(steps=[producer, consumer], streaming=True, queue_size=4)
+    await runner.run(context)
+
+    assert consumer.seen == list(range(50))
+    assert producer.max_ahead <= 4
+    execution_repo = container.execution_repo.return_value
+    records = [call.args[0] for call in execution_repo.update_step.await_args_list]
+    assert sorted(r.step_name for r in records) == ["consumer", "producer"]
+    assert all(r.status == StepStatus.SUCCEEDED for r in records)
+
+
+@pytest.mark.asyncio
+async def test_streaming_runner_cancels_stages_after_failure():
+    container = make_mock_container()
+    context = PipelineContext(container=container, criteria=SearchCriteria())
+
+    runner = PipelineRunner(
+        steps=[Producer(list(range(50))), Consumer(fail=True)], streaming=True, queue_size=2
+    )
+    await runner.run(context)
+
+    execution_repo = container.execution_repo.return_value
+    records = {c.args[0].step_name: c.args[0] for c in execution_repo.update_step.await_args_list}
+    assert records["consumer"].status == StepStatus.FAILED
+    assert records["producer"].status == StepStatus.FAILED
+    assert "cancelled after consumer failed" in records["producer"].error_message
+    run = execution_repo.update_run.await_args.args[0]
+    assert run.status == StepStatus.FAILED
+
+
+class TimedStep(FakeStep):
+    async def execute(self, context: PipelineContext) -> StepResult:
+        for _ in range(3):
+            with phase("parse"):
+                pass
+        return StepResult(items_processed=3)
+
+
+@pytest.mark.asyncio
+async def test_runner_saves_phase_metrics_per_step():
+    container = make_mock_container()
+    context = PipelineContext(container=container, criteria=SearchCriteria())
+
+    await PipelineRunner(steps=[TimedStep("timed"), FakeStep("untimed")]).run(context)
+
+    execution_repo = container.execution_repo.return_value
+    saved = [call.args[0] for call in execution_repo.save_step_metrics.await_args_list]
+    assert [(m.step_name, m.phase, m.samples) for m in saved[0]] == [("timed", "parse", 3)]
+    assert saved[1] == []
+
+
+@pytest.mark.asyncio
+async def test_runner_profiles_each_step(tmp_path):
+    container = make_mock_container()
+    container.settings.profiling = ProfilingSettings(mode="cprofile", output_dir=str(tmp_path))
+    context = PipelineContext(container=container, criteria=SearchCriteria())
+
+    await PipelineRunner(steps=[FakeStep("search"), FakeStep("extract")]).run(context)
+
+    assert sorted(p.name for p in (tmp_path / "1").iterdir()) == [
+        "extract.pstats",
+        "search.pstats",
+    ]
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import json
+from unittest.mock import AsyncMock
+
+import pytest
+
+from rpaquintoandar.application.use_cases import ReprocessArchiveUseCase
+from rpaquintoandar.domain.enums import ProcessingStatus
+
+
+class FakeArchive:
+    def __init__(self, payloads: dict[str, str]) -> None:
+        self._payloads = payloads
+
+    async def store(self, source_id, payload, fetched_at=None) -> None:
+        self._payloads[source_id] = payload
+
+    def iter_latest(self):
+        yield from self._payloads.items()
+
+
+@pytest.mark.asyncio
+async def test_reprocess_enriches_from_archive(make_listing):
+    payload = json.dumps(
+        {"props": {"pageProps": {"initialState": {"house": {"houseInfo": {"remarks": "Nice"}}}}}}
+    )
+    listings = {
+        "1": make_listing("1", status=ProcessingStatus.ENRICHED),
+        "2": make_listing("2", status=ProcessingStatus.DUPLICATE),
+    }
+    archive = FakeArchive({"1": payload, "2": payload, "3": payload, "4": "not json"})
+    repo = AsyncMock()
+    repo.get_by_source_id = AsyncMock(side_effect=lambda sid: listings.get(sid) or (
+        make_listing(sid, status=ProcessingStatus.PENDING) if sid == "4" else None
+    ))
+    repo.upsert = AsyncMock(side_effect=lambda l: l)
+
+    result = await ReprocessArchiveUseCase(archive, repo).execute()
+
+    assert result.total_processed == 4
+    assert result.enriched == 1
+    assert result.duplicates == 1
+    assert result.failed == 1
+    assert listings["1"].description == "Nice"
+    assert listings["1"].content_hash is not None
+    repo.upsert.assert_awaited_once()
@@ -7,6 +7,7 @@ import pytest
 from rpaquintoandar.application.use_cases import SearchListingsUseCase
 from rpaquintoandar.domain.entities import Listing
 from rpaquintoandar.domain.value_objects import SearchCriteria
+from rpaquintoandar.shared.known_ids import KnownIdIndex
 
 
 @pytest.mark.asyncio
@@ -45,3 +46,27 @@ async def test_search_listings_no_results():
 
     assert result.total_found == 0
     assert result.new_listings == 0
+
+
+@pytest.mark.asyncio
+async def test_search_listings_skips_known_ids():
+    listings = [
+        Listing(source_id=str(i), source_url=f"https://www.quintoandar.com.br/imovel/{i}")
+        for i in (101, 102, 103)
+    ]
+    api_client = AsyncMock()
+    api_client.search = AsyncMock(return_value=(listings, 3))
+
+    repo = AsyncMock()
+    repo.upsert_many = AsyncMock(return_value=1)
+    known_ids = KnownIdIndex()
+    known_ids.add("101")
+    known_ids.add("103")
+
+    use_case = SearchListingsUseCase(api_client, repo, max_pages=1, known_ids=known_ids)
+    result = await use_case.execute(SearchCriteria())
+
+    saved = repo.upsert_many.await_args.args[0]
+    assert [l.source_id for l in saved] == ["102"]
+    assert result.new_listings == 1
+    assert "102" in known_ids
@@ -35,3 +35,15 @@ class TestListing:
         listing = make_listing()
         listing.mark_duplicate()
         assert listing.status == ProcessingStatus.DUPLICATE
+
+    def test_tracks_changed_fields(self):
+        listing = make_listing(description="same")
+        assert listing.changed_fields == frozenset()
+
+        listing.description = "same"
+        listing.mark_failed()
+        assert listing.changed_fields == {"status"}
+
+        listing.clear_changes()
+        listing.images = ["a.jpg"]
+        assert listing.changed_fields == {"images"}
@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+from rpaquintoandar.domain.value_objects import PriceBand
+
+
+def test_from_dict_keeps_open_sides():
+    assert PriceBand.from_dict({"max": 300000}) == PriceBand(None, 300000.0)
+    assert PriceBand.from_dict({"min": 1000000}) == PriceBand(1000000.0, None)
+
+
+def test_bisect_closed_and_open_bands():
+    assert PriceBand(300000, 500000).bisect(10000) == (
+        PriceBand(300000, 400000),
+        PriceBand(400000, 500000),
+    )
+    assert PriceBand(None, 300000).bisect(10000) == (
+        PriceBand(None, 150000),
+        PriceBand(150000, 300000),
+    )
+    assert PriceBand(1000000, None).bisect(10000) == (
+        PriceBand(1000000, 2000000),
+        PriceBand(2000000, None),
+    )
+
+
+def test_bisect_stops_at_min_width_and_unbounded_bands():
+    assert PriceBand(300000, 310000).bisect(10000) is None
+    assert PriceBand().bisect(10000) is None
@@ -0,0 +1,15 @@
+from __future__ import annotations
+
+from rpaquintoandar.domain.value_objects import Viewport
+
+
+def test_split_covers_parent_with_four_quadrants():
+    parent = Viewport(north=-23.0, south=-24.0, east=-46.0, west=-47.0)
+
+    nw, ne, sw, se = parent.split()
+
+    assert nw == Viewport(north=-23.0, south=-23.5, east=-46.5, west=-47.0)
+    assert ne == Viewport(north=-23.0, south=-23.5, east=-46.0, west=-46.5)
+    assert sw == Viewport(north=-23.5, south=-24.0, east=-46.5, west=-47.0)
+    assert se == Viewport(north=-23.5, south=-24.0, east=-46.0, west=-46.5)
+    assert all(q.height == 0.5 and q.width == 0.5 for q in (nw, ne, sw, se))
@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import time
+
+from rpaquintoandar.infrastructure.api.capture_cache import (
+    CapturedRequest,
+    CoordinatesCaptureCache,
+)
+
+
+def _request(age_seconds: float = 0.0) -> CapturedRequest:
+    return CapturedRequest(
+        url="https://apigw.prod.quintoandar.com.br/search/coordinates?x=1",
+        headers={"accept": "application/json", "user-agent": "test"},
+        captured_at=time.time() - age_seconds,
+    )
+
+
+def test_capture_survives_a_new_instance(tmp_path):
+    path = tmp_path / "capture.json"
+    CoordinatesCaptureCache(path, ttl_seconds=3600).put("sao-paulo-sp-brasil", "apartamento", _request())
+
+    cached = CoordinatesCaptureCache(path, ttl_seconds=3600).get("sao-paulo-sp-brasil", "apartamento")
+
+    assert cached is not None
+    assert cached.headers["user-agent"] == "test"
+    assert CoordinatesCaptureCache(path, 3600).get("sao-paulo-sp-brasil", "casa") is None
+
+
+def test_expired_and_invalidated_entries_are_misses(tmp_path):
+    cache = CoordinatesCaptureCache(tmp_path / "capture.json", ttl_seconds=60)
+    cache.put("a", "apartamento", _request(age_seconds=120))
+    cache.put("b", "apartamento", _request())
+
+    cache.invalidate("b", "apartamento")
+
+    assert cache.get("a", "apartamento") is None
+    assert cache.get("b", "apartamento") is None
+
+
+def test_unreadable_file_is_treated_as_empty(tmp_path):
+    path = tmp_path / "capture.json"
+    path.write_text("{not json", encoding="utf-8")
+
+    assert CoordinatesCaptureCache(path, 3600).get("a", "apartamento") is None
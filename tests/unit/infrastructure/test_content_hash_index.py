@@ -0,0 +1,29 @@
+from rpaquintoandar.domain.value_objects import ContentHash
+from rpaquintoandar.infrastructure.persistence import content_hash_index
+from rpaquintoandar.infrastructure.persistence.content_hash_index import (
+    ContentHashIndex,
+    hash_key,
+)
+
+
+def test_load_and_lookup():
+    hashes = [ContentHash.from_text(f"listing-{i}") for i in range(100)]
+    index = ContentHashIndex()
+    index.load(hash_key(h) for h in hashes)
+
+    assert len(index) == 100
+    assert index.nbytes == 800
+    assert all(index.might_contain(h) for h in hashes)
+    assert not index.might_contain(ContentHash.from_text("unseen"))
+
+
+def test_additions_are_merged(monkeypatch):
+    monkeypatch.setattr(content_hash_index, "MERGE_THRESHOLD", 4)
+    index = ContentHashIndex()
+    hashes = [ContentHash.from_text(f"h{i}") for i in range(10)]
+    for h in hashes:
+        index.add(h)
+    index.add(hashes[0])  # already present
+
+    assert len(index) == 10
+    assert all(index.might_contain(h) for h in hashes)
@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+from rpaquintoandar.shared.coordinate_columns import CoordinateColumns, numeric_key
+
+
+def test_add_deduplicates_and_keeps_insertion_order():
+    columns = CoordinateColumns()
+
+    assert columns.add("893044817", -23.5, -46.6)
+    assert columns.add("12", -23.6, -46.7)
+    assert not columns.add("893044817", 0.0, 0.0)
+
+    assert list(columns) == [("893044817", -23.5, -46.6), ("12", -23.6, -46.7)]
+    assert "12" in columns and "13" not in columns
+
+
+def test_non_numeric_and_zero_padded_ids_round_trip():
+    columns = CoordinateColumns()
+    columns.add("007", 1.0, 2.0)
+    columns.add("abc-1", 3.0, 4.0)
+    columns.add("7", 5.0, 6.0)
+
+    assert numeric_key("007") is None
+    assert sorted(sid for sid, _, _ in columns) == ["007", "7", "abc-1"]
+    assert len(columns) == 3
+
+
+def test_table_grows_and_truncate_rebuilds_index():
+    columns = CoordinateColumns()
+    for i in range(5000):
+        columns.add(str(100000 + i * 7), float(i), float(-i))
+
+    assert len(columns) == 5000
+    assert all(str(100000 + i * 7) in columns for i in range(0, 5000, 97))
+    # 24 bytes of columns per row plus a table at most half full
+    assert columns.nbytes <= 5000 * 24 + 16384 * 4
+
+    columns.truncate(10)
+    assert len(columns) == 10
+    assert str(100000 + 9 * 7) in columns
+    assert str(100000 + 10 * 7) not in columns
+    assert columns.add(str(100000 + 10 * 7), 0.0, 0.0)
@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from unittest.mock import AsyncMock
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from rpaquintoandar.domain.value_objects import PriceBand, Viewport
+from rpaquintoandar.infrastructure.api.capture_cache import (
+    CapturedRequest,
+    CoordinatesCaptureCache,
+)
+from rpaquintoandar.infrastructure.api.coordinates_collector import (
+    PRICE_MAX_PARAM,
+    PRICE_MIN_PARAM,
+    CoordinatesCollector,
+    CoordinatesRequestRejected,
+)
+from rpaquintoandar.infrastructure.config.settings_loader import ApiSettings
+
+BASE_URL = (
+    "https://apigw.prod.quintoandar.com.br/house-listing-search/v2/search/coordinates"
+    "?filters.location.viewport.north=-23.0&filters.location.viewport.south=-24.0"
+    "&filters.location.viewport.east=-46.0&filters.location.viewport.west=-47.0"
+)
+
+# One listing on a 0.1-degree grid point inside the box
+LISTINGS = [(f"{i}-{j}", -23.05 - i * 0.1, -46.05 - j * 0.1) for i in range(10) for j in range(10)]
+
+
+def _fake_fetch(cap: int, calls: list[Viewport]):
+    async def fetch(client, url, headers, on_hit):
+        viewport = CoordinatesCollector._viewport_from_url(url)
+        assert viewport is not None
+        calls.append(viewport)
+        inside = [
+            hit
+            for hit in LISTINGS
+            if viewport.south <= hit[1] < viewport.north and viewport.west <= hit[2] < viewport.east
+        ]
+        for hit in inside[:cap]:
+            on_hit(*hit)
+        return min(cap, len(inside)), len(inside)
+
+    return fetch
+
+
+@pytest.mark.asyncio
+async def test_quadtree_splits_only_saturated_tiles(monkeypatch):
+    collector = CoordinatesCollector(AsyncMock(), ApiSettings(coordinates_hit_cap=30))
+    calls: list[Viewport] = []
+    monkeypatch.setattr(collector, "_single_fetch", _fake_fetch(30, calls))
+
+    result = await collector._fetch_ids_from_coordinates(BASE_URL, {}, 1000, frozenset())
+
+    assert sorted(sid for sid, _, _ in result) == sorted(sid for sid, _, _ in LISTINGS)
+    # Root (100 hits) splits into four tiles of 25, none of which is capped
+    assert len(calls) == 5
+    assert calls[0] == Viewport(north=-23.0, south=-24.0, east=-46.0, west=-47.0)
+
+
+@pytest.mark.asyncio
+async def test_quadtree_uses_bounding_box_and_skips_known_ids(monkeypatch):
+    collector = CoordinatesCollector(AsyncMock(), ApiSettings(coordinates_hit_cap=1000))
+    calls: list[Viewport] = []
+    monkeypatch.setattr(collector, "_single_fetch", _fake_fetch(1000, calls))
+    box = Viewport(north=-23.0, south=-23.2, east=-46.0, west=-46.2)
+
+    result = await collector._fetch_ids_from_coordinates(BASE_URL, {}, 1000, {"0-0"}, box)
+
+    assert calls == [box]
+    assert sorted(sid for sid, _, _ in result) == ["0-1", "1-0", "1-1"]
+
+
+@pytest.mark.asyncio
+async def test_quadtree_stops_splitting_at_min_viewport(monkeypatch):
+    settings = ApiSettings(coordinates_hit_cap=1, min_viewport_degrees=0.25)
+    collector = CoordinatesCollector(AsyncMock(), settings)
+    calls: list[Viewport] = []
+    monkeypatch.setattr(collector, "_single_fetch", _fake_fetch(1, calls))
+
+    await collector._fetch_ids_from_coordinates(BASE_URL, {}, 1000, frozenset())
+
+    # 1.0 -> 0.5 -> 0.25 degrees; splitting again would go below the minimum
+    assert len(calls) == 1 + 4 + 16
+    assert min(v.width for v in calls) == 0.25
+
+
+@pytest.mark.asyncio
+async def test_quadtree_fetches_tiles_concurrently(monkeypatch):
+    settings = ApiSettings(coordinates_hit_cap=10, coordinates_concurrency=3)
+    collector = CoordinatesCollector(AsyncMock(), settings)
+    calls: list[Viewport] = []
+    fetch = _fake_fetch(10, calls)
+    running = 0
+    peak = 0
+
+    async def slow_fetch(client, url, headers, on_hit):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.001)
+        running -= 1
+        return await fetch(client, url, headers, on_hit)
+
+    monkeypatch.setattr(collector, "_single_fetch", slow_fetch)
+
+    result = await collector._fetch_ids_from_coordinates(BASE_URL, {}, 1000, frozenset())
+
+    assert len(result) == len(LISTINGS)
+    assert peak == 3
+    await collector.close()
+
+
+def _captured(url: str = BASE_URL) -> CapturedRequest:
+    return CapturedRequest(url=url, headers={}, captured_at=time.time())
+
+
+@pytest.mark.asyncio
+async def test_cached_capture_is_replayed_without_the_browser(tmp_path, monkeypatch):
+    cache = CoordinatesCaptureCache(tmp_path / "capture.json", ttl_seconds=3600)
+    cache.put("sao-paulo-sp-brasil", "apartamento", _captured())
+    browser_factory = AsyncMock()
+    collector = CoordinatesCollector(
+        None, ApiSettings(), capture_cache=cache, browser_factory=browser_factory
+    )
+    monkeypatch.setattr(collector, "_single_fetch", _fake_fetch(10000, []))
+
+    result = await collector.collect_ids("sao-paulo-sp-brasil", target_count=1000)
+
+    assert len(result) == len(LISTINGS)
+    browser_factory.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_rejected_cached_capture_is_captured_again(tmp_path, monkeypatch):
+    stale_url = BASE_URL + "&build=stale"
+    cache = CoordinatesCaptureCache(tmp_path / "capture.json", ttl_seconds=3600)
+    cache.put("sao-paulo-sp-brasil", "apartamento", _captured(stale_url))
+    collector = CoordinatesCollector(None, ApiSettings(), capture_cache=cache)
+    fetch = _fake_fetch(10000, [])
+
+    async def fetch_rejecting_stale(client, url, headers, on_hit):
+        if "build=stale" in url:
+            raise CoordinatesRequestRejected("HTTP 403")
+        return await fetch(client, url, headers, on_hit)
+
+    capture = AsyncMock(return_value=_captured())
+    monkeypatch.setattr(collector, "_single_fetch", fetch_rejecting_stale)
+    monkeypatch.setattr(collector, "_capture_coordinates_request", capture)
+
+    result = await collector.collect_ids("sao-paulo-sp-brasil", target_count=1000)
+
+    assert len(result) == len(LISTINGS)
+    capture.assert_awaited_once()
+    cached = cache.get("sao-paulo-sp-brasil", "apartamento")
+    assert cached is not None and "build=stale" not in cached.url
+
+
+@pytest.mark.asyncio
+async def test_capped_price_bands_are_bisected(monkeypatch):
+    # 100 listings in one building, priced 0, 10k, ..., 990k
+    building = [(str(i), -23.5, -46.5, i * 10000.0) for i in range(100)]
+    settings = ApiSettings(coordinates_hit_cap=30, min_viewport_degrees=1.0)
+    collector = CoordinatesCollector(AsyncMock(), settings)
+    requested: list[PriceBand] = []
+
+    async def fetch(client, url, headers, on_hit):
+        params = parse_qs(urlparse(url).query)
+        low = float(params.get(PRICE_MIN_PARAM, ["0"])[0])
+        high = float(params.get(PRICE_MAX_PARAM, ["inf"])[0])
+        requested.append(PriceBand(low, high))
+        inside = [(sid, lat, lon) for sid, lat, lon, price in building if low <= price < high]
+        for hit in inside[:30]:
+            on_hit(*hit)
+        return min(30, len(inside)), len(inside)
+
+    monkeypatch.setattr(collector, "_single_fetch", fetch)
+    bands = [PriceBand(None, 500000), PriceBand(500000, None)]
+
+    result = await collector._fetch_ids_from_coordinates(BASE_URL, {}, 1000, frozenset(), None, bands)
+
+    assert len(result) == 100
+    # [0, 500k) halves at 250k; the open band first splits at 1M (still capped)
+    # and then at 750k
+    assert len(requested) == 8
+    assert PriceBand(0, 250000) in requested
+    assert PriceBand(500000, 750000) in requested
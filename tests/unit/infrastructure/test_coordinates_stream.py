@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import json
+
+import httpx
+import pytest
+
+from rpaquintoandar.infrastructure.api.coordinates_collector import CoordinatesCollector
+from rpaquintoandar.infrastructure.api.coordinates_stream import CoordinateHitDecoder
+from rpaquintoandar.infrastructure.config.settings_loader import ApiSettings
+
+BODY = json.dumps(
+    {
+        "took": 3,
+        "hits": {
+            "total": {"value": 4210, "relation": "eq"},
+            "hits": [
+                {"_id": "101", "_source": {"location": {"lat": -23.5, "lon": -46.6}}},
+                {"_id": "", "_source": {}},
+                {"_id": "102", "_source": {"location": {"lat": -23.51, "lon": -46.61}, "name": "Pça ]"}},
+            ],
+        },
+    },
+    ensure_ascii=False,
+).encode()
+
+
+def _decode(chunks: list[bytes]) -> tuple[CoordinateHitDecoder, list[tuple[str, float, float]]]:
+    received: list[tuple[str, float, float]] = []
+    decoder = CoordinateHitDecoder(lambda *hit: received.append(hit))
+    for chunk in chunks:
+        decoder.feed(chunk)
+    decoder.close()
+    return decoder, received
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, len(BODY)])
+def test_decodes_hits_across_chunk_boundaries(chunk_size):
+    decoder, received = _decode(
+        [BODY[i : i + chunk_size] for i in range(0, len(BODY), chunk_size)]
+    )
+
+    assert received == [("101", -23.5, -46.6), ("102", -23.51, -46.61)]
+    assert decoder.hits == 3
+    assert decoder.total == 4210
+
+
+def test_total_defaults_to_hit_count_and_truncation_raises():
+    decoder, _ = _decode([b'{"hits": {"hits": [{"_id": "1"}]}}'])
+    assert decoder.total == 1
+
+    with pytest.raises(ValueError):
+        _decode([BODY[: len(BODY) // 2]])
+
+
+@pytest.mark.asyncio
+async def test_single_fetch_streams_response_into_sink():
+    transport = httpx.MockTransport(lambda request: httpx.Response(200, content=BODY))
+    collector = CoordinatesCollector(None, ApiSettings(), client=httpx.AsyncClient(transport=transport))
+    received: list[tuple[str, float, float]] = []
+
+    hits, total = await collector._single_fetch(
+        collector._get_client(), "https://example.test/coordinates", {}, lambda *h: received.append(h)
+    )
+
+    assert (hits, total) == (3, 4210)
+    assert [sid for sid, _, _ in received] == ["101", "102"]
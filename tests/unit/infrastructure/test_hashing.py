@@ -1,4 +1,4 @@
-from rpaquintoandar.shared.hashing import normalize_text, sha256_hash
+from rpaquintoandar.shared.hashing import canonical_json, normalize_text, sha256_hash
 
 
 class TestHashing:
@@ -17,3 +17,7 @@ class TestHashing:
         h1 = sha256_hash("content")
         h2 = sha256_hash("content")
         assert h1 == h2
+
+    def test_canonical_json_ignores_key_order(self):
+        assert canonical_json({"b": 1, "a": [1, 2]}) == canonical_json({"a": [1, 2], "b": 1})
+        assert canonical_json({"a": "ção"}) == '{"a":"ção"}'
@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+import httpx
+import pytest
+
+from rpaquintoandar.infrastructure.api import http_client
+from rpaquintoandar.infrastructure.api.http_client import SharedHttpClient
+from rpaquintoandar.infrastructure.config.settings_loader import HttpSettings
+
+
+@pytest.mark.asyncio
+async def test_client_is_shared_and_falls_back_without_h2(monkeypatch):
+    monkeypatch.setattr(http_client, "H2_AVAILABLE", False)
+    shared = SharedHttpClient(HttpSettings(http2=True))
+
+    assert shared.client is shared.client
+    assert shared.http2 is False
+    await shared.close()
+
+
+@pytest.mark.asyncio
+async def test_hooks_count_requests_by_version_and_status():
+    shared = SharedHttpClient(HttpSettings())
+    request = httpx.Request("GET", "https://www.quintoandar.com.br/")
+
+    await shared._on_request(request)
+    await shared._on_response(
+        httpx.Response(429, request=request, extensions={"http_version": b"HTTP/2"})
+    )
+
+    assert shared.stats.requests == 1
+    assert shared.stats.by_version == {"HTTP/2": 1}
+    assert shared.stats.by_status == {429: 1}
@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import json
+
+import httpx
+import pytest
+
+from rpaquintoandar.domain.entities import Listing
+from rpaquintoandar.infrastructure.api.http_detail_extractor import HttpDetailExtractor
+from rpaquintoandar.infrastructure.api.next_data import (
+    DETAIL_PROJECTION,
+    find_next_data_json,
+    project,
+)
+from rpaquintoandar.infrastructure.config.settings_loader import ScrapingSettings
+
+BUILD_ID = "abc123"
+
+
+def make_html(source_id: str) -> str:
+    next_data = json.dumps(
+        {
+            "buildId": BUILD_ID,
+            "props": {"pageProps": {"initialState": {"house": {"houseInfo": {"id": source_id}}}}},
+        }
+    )
+    return (
+        "<html><head><title>x</title></head><body><div id='__next'></div>"
+        f'<script id="__NEXT_DATA__" type="application/json">{next_data}</script>'
+        "</body></html>"
+    )
+
+
+class FakeFallback:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    async def extract_detail(self, listing: Listing) -> str:
+        self.calls += 1
+        return '{"fallback": true}'
+
+
+def make_extractor(handler, fallback: FakeFallback | None = None) -> HttpDetailExtractor:
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    async def factory():
+        return fallback
+
+    return HttpDetailExtractor(
+        ScrapingSettings(),
+        fallback_factory=factory if fallback else None,
+        client=client,
+    )
+
+
+class TestFindNextDataJson:
+    def test_extracts_script_text(self):
+        html = make_html("1")
+        data = json.loads(find_next_data_json(html))
+        assert data["buildId"] == BUILD_ID
+
+    def test_missing_tag(self):
+        assert find_next_data_json("<html><body>blocked</body></html>") == ""
+
+    def test_truncated_tag(self):
+        assert find_next_data_json('<script id="__NEXT_DATA__">{"a":') == ""
+
+
+@pytest.mark.asyncio
+async def test_learns_build_id_then_uses_data_route(make_listing):
+    requested: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requested.append(request.url.path)
+        if request.url.path.startswith("/_next/data/"):
+            source_id = request.url.params["id"]
+            return httpx.Response(
+                200,
+                json={"pageProps": {"initialState": {"house": {"houseInfo": {"id": source_id}}}}},
+            )
+        source_id = request.url.path.rsplit("/", 1)[-1]
+        return httpx.Response(200, text=make_html(source_id))
+
+    extractor = make_extractor(handler)
+
+    first = await extractor.extract_detail(make_listing("1"))
+    second = await extractor.extract_detail(make_listing("2"))
+
+    assert "buildId" not in json.loads(first)
+    house = json.loads(second)["props"]["pageProps"]["initialState"]["house"]["houseInfo"]
+    assert house["id"] == "2"
+    assert requested == ["/imovel/1", f"/_next/data/{BUILD_ID}/imovel/2.json"]
+    assert extractor.stats.html_hits == 1
+    assert extractor.stats.data_hits == 1
+
+
+@pytest.mark.asyncio
+async def test_stale_build_id_relearns_from_html(make_listing):
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.startswith("/_next/data/"):
+            return httpx.Response(404)
+        return httpx.Response(200, text=make_html("1"))
+
+    extractor = make_extractor(handler)
+    extractor._build_id = "stale"
+
+    result = await extractor.extract_detail(make_listing("1"))
+
+    assert result
+    assert extractor._build_id == BUILD_ID
+    assert extractor.stats.html_hits == 1
+
+
+@pytest.mark.asyncio
+async def test_blocked_response_falls_back_to_browser(make_listing):
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(403, text="<html>captcha</html>")
+
+    fallback = FakeFallback()
+    extractor = make_extractor(handler, fallback)
+
+    result = await extractor.extract_detail(make_listing("1"))
+
+    assert result == '{"fallback": true}'
+    assert fallback.calls == 1
+    assert extractor.stats.fallbacks == 1
+
+
+class TestProject:
+    def test_keeps_only_requested_subtrees(self):
+        data = {
+            "buildId": "x",
+            "props": {
+                "pageProps": {"initialState": {"house": {"houseInfo": {"a": 1}}, "big": [1] * 100}}
+            },
+        }
+        assert project(data, DETAIL_PROJECTION) == {
+            "props": {"pageProps": {"initialState": {"house": {"houseInfo": {"a": 1}}}}}
+        }
+
+    def test_missing_path_yields_empty(self):
+        assert project({"props": {}}, DETAIL_PROJECTION) == {}
+
+    def test_keeps_null_leaves(self):
+        data = {"a": {"b": None}}
+        assert project(data, ("a.b",)) == {"a": {"b": None}}
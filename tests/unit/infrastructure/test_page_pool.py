@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import pytest
+
+from rpaquintoandar.infrastructure.browser.playwright_manager import PlaywrightBrowserManager
+from rpaquintoandar.infrastructure.config.settings_loader import BrowserSettings
+
+
+class FakePage:
+    def __init__(self) -> None:
+        self.closed = False
+
+    def is_closed(self) -> bool:
+        return self.closed
+
+
+class FakeContext:
+    def __init__(self) -> None:
+        self.closed = False
+        self.page_obj = FakePage()
+
+    def set_default_timeout(self, timeout: int) -> None:
+        pass
+
+    async def route(self, pattern: str, handler) -> None:
+        self.route_handler = handler
+
+    async def new_page(self) -> FakePage:
+        return self.page_obj
+
+    async def close(self) -> None:
+        self.closed = True
+        self.page_obj.closed = True
+
+
+class FakeBrowser:
+    def __init__(self) -> None:
+        self.contexts: list[FakeContext] = []
+
+    async def new_context(self, **kwargs) -> FakeContext:
+        context = FakeContext()
+        self.contexts.append(context)
+        return context
+
+
+async def make_manager(pool_size: int = 2, max_uses: int = 3):
+    manager = PlaywrightBrowserManager(
+        BrowserSettings(pool_size=pool_size, page_max_uses=max_uses)
+    )
+    browser = FakeBrowser()
+    manager._browser = browser  # type: ignore[assignment]
+    await manager._warm_pool()
+    return manager, browser
+
+
+@pytest.mark.asyncio
+async def test_pool_reuses_warmed_pages():
+    manager, browser = await make_manager(pool_size=2, max_uses=10)
+
+    seen = set()
+    for _ in range(5):
+        async with manager.page() as page:
+            seen.add(id(page))
+
+    assert len(browser.contexts) == 2
+    assert len(seen) <= 2
+
+
+@pytest.mark.asyncio
+async def test_pool_recycles_after_max_uses():
+    manager, browser = await make_manager(pool_size=1, max_uses=2)
+
+    for _ in range(4):
+        async with manager.page():
+            pass
+
+    assert len(browser.contexts) == 2
+    assert browser.contexts[0].closed is True
+
+
+@pytest.mark.asyncio
+async def test_pool_releases_and_recycles_on_error():
+    manager, browser = await make_manager(pool_size=1, max_uses=10)
+
+    with pytest.raises(RuntimeError):
+        async with manager.page():
+            raise RuntimeError("navigation failed")
+
+    assert browser.contexts[0].closed is True
+
+    async with manager.page() as page:
+        assert page is browser.contexts[1].page_obj
@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from rpaquintoandar.shared.perf_metrics import PhaseRecorder, percentile, phase, recording
+
+
+def test_percentile_nearest_rank():
+    values = [float(v) for v in range(1, 101)]
+
+    assert percentile(values, 50) == 50.0
+    assert percentile(values, 95) == 95.0
+    assert percentile(values, 99) == 99.0
+    assert percentile([], 50) == 0.0
+
+
+def test_phase_is_noop_outside_recording():
+    with phase("navigate"):
+        pass
+
+
+@pytest.mark.asyncio
+async def test_recording_reaches_spawned_tasks():
+    recorder = PhaseRecorder()
+
+    async def item() -> None:
+        with phase("fetch"):
+            await asyncio.sleep(0)
+
+    with recording(recorder):
+        await asyncio.gather(*(item() for _ in range(10)))
+    with phase("fetch"):
+        pass  # outside the block: not recorded
+
+    metrics = recorder.summarize(execution_run_id=7, step_name="extract", step_record_id=3)
+
+    assert [(m.phase, m.samples) for m in metrics] == [("fetch", 10)]
+    assert metrics[0].execution_run_id == 7 and metrics[0].step_record_id == 3
+    assert metrics[0].p50_ms <= metrics[0].p99_ms <= metrics[0].max_ms
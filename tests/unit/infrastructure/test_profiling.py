@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import pstats
+import time
+from pathlib import Path
+
+import pytest
+
+from rpaquintoandar.infrastructure.config.settings_loader import ProfilingSettings
+from rpaquintoandar.shared.profiling import ProfileSession
+
+
+def busy(ms: float) -> int:
+    deadline = time.perf_counter() + ms / 1000
+    total = 0
+    while time.perf_counter() < deadline:
+        total += sum(range(100))
+    return total
+
+
+def test_profiling_off_by_default():
+    assert ProfileSession.from_settings(ProfilingSettings(), run_id=1) is None
+
+
+def test_unknown_mode_is_rejected(tmp_path: Path):
+    with pytest.raises(ValueError, match="profiling mode"):
+        ProfileSession("perf", tmp_path)
+
+
+def test_cprofile_writes_pstats(tmp_path: Path):
+    session = ProfileSession.from_settings(
+        ProfilingSettings(mode="cprofile", output_dir=str(tmp_path)), run_id=42
+    )
+    with session.profile("extract"):
+        busy(5)
+
+    stats = pstats.Stats(str(tmp_path / "42" / "extract.pstats"))
+    assert any(func[2] == "busy" for func in stats.stats)
+
+
+def test_sampling_writes_collapsed_stacks(tmp_path: Path):
+    session = ProfileSession("sampling", tmp_path, sample_interval_ms=1)
+    with session.profile("search"):
+        busy(50)
+
+    lines = (tmp_path / "search.collapsed").read_text().splitlines()
+    assert lines
+    stack, count = lines[0].rsplit(" ", 1)
+    assert "busy (test_profiling.py:" in stack and int(count) > 0
+
+
+def test_tracemalloc_reports_allocations(tmp_path: Path):
+    session = ProfileSession("tracemalloc", tmp_path)
+    with session.profile("export"):
+        blob = [bytes(1000) for _ in range(1000)]
+
+    report = (tmp_path / "export.tracemalloc.txt").read_text()
+    assert report.startswith("current=")
+    assert "test_profiling.py" in report
+    assert (tmp_path / "export.tracemalloc").exists()
+    del blob
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import time
+
+import pytest
+
+from rpaquintoandar.infrastructure.config.settings_loader import (
+    EndpointRateSettings,
+    RateLimitSettings,
+)
+from rpaquintoandar.infrastructure.throttling import (
+    AdaptiveRateLimiter,
+    RateLimiterRegistry,
+    is_throttle_status,
+)
+
+
+def make_limiter(**kwargs) -> AdaptiveRateLimiter:
+    endpoint = EndpointRateSettings(initial_rps=2.0, min_rps=0.5, max_rps=3.0)
+    return AdaptiveRateLimiter("test", endpoint, **kwargs)
+
+
+class TestAdaptiveRateLimiter:
+    def test_additive_increase_capped_at_max(self):
+        limiter = make_limiter(increase_step=0.5)
+        limiter.record_success()
+        assert limiter.rate == pytest.approx(2.5)
+        for _ in range(10):
+            limiter.record_success()
+        assert limiter.rate == pytest.approx(3.0)
+
+    def test_multiplicative_decrease_floored_at_min(self):
+        limiter = make_limiter(decrease_factor=0.5)
+        limiter.record_throttle("HTTP 429")
+        assert limiter.rate == pytest.approx(1.0)
+        for _ in range(10):
+            limiter.record_throttle("HTTP 503")
+        assert limiter.rate == pytest.approx(0.5)
+        assert limiter.snapshot().throttle_events == 11
+
+    def test_record_status_classifies(self):
+        limiter = make_limiter(increase_step=0.1)
+        limiter.record_status(200)
+        limiter.record_status(404)
+        assert limiter.rate == pytest.approx(2.2)
+        limiter.record_status(429)
+        assert limiter.rate == pytest.approx(1.1)
+        assert is_throttle_status(502)
+        assert not is_throttle_status(None)
+
+    @pytest.mark.asyncio
+    async def test_acquire_paces_to_rate(self):
+        endpoint = EndpointRateSettings(initial_rps=50.0, min_rps=1.0, max_rps=50.0)
+        limiter = AdaptiveRateLimiter("fast", endpoint)
+
+        started = time.monotonic()
+        for _ in range(6):
+            await limiter.acquire()
+        elapsed = time.monotonic() - started
+
+        # One token up front, then 5 more at 50/s
+        assert elapsed >= 0.09
+        assert limiter.snapshot().acquired == 6
+
+    @pytest.mark.asyncio
+    async def test_throttle_drains_bucket(self):
+        now = [0.0]
+        endpoint = EndpointRateSettings(initial_rps=40.0, min_rps=20.0, max_rps=40.0, burst=5.0)
+        limiter = AdaptiveRateLimiter("t", endpoint, clock=lambda: now[0])
+        now[0] = 10.0
+        limiter.record_throttle("HTTP 429")
+        await limiter.acquire()
+        # The bucket was emptied, so even a burst-sized limiter had to wait
+        assert limiter.snapshot().waited_seconds > 0
+
+
+class TestRateLimiterRegistry:
+    def test_shares_limiter_per_endpoint(self):
+        registry = RateLimiterRegistry(RateLimitSettings())
+        assert registry.get("detail") is registry.get("detail")
+        assert registry.get("detail") is not registry.get("search")
+        assert registry.get("unknown").rate == EndpointRateSettings().initial_rps
@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import asyncio
+import random
+
+import httpx
+import pytest
+
+from rpaquintoandar.domain.enums import ErrorCategory
+from rpaquintoandar.infrastructure.resilience import (
+    BreakerState,
+    CircuitBreaker,
+    EmptyPayloadError,
+    ListingNotFoundError,
+    RetryPolicy,
+    classify,
+)
+
+
+class Flaky:
+    def __init__(self, errors: list[Exception], result: str = "ok") -> None:
+        self._errors = list(errors)
+        self._result = result
+        self.calls = 0
+
+    async def __call__(self) -> str:
+        self.calls += 1
+        if self._errors:
+            raise self._errors.pop(0)
+        return self._result
+
+
+def make_policy(**kwargs) -> tuple[RetryPolicy, list[float]]:
+    sleeps: list[float] = []
+
+    async def fake_sleep(delay: float) -> None:
+        sleeps.append(delay)
+
+    kwargs.setdefault("rng", random.Random(7))
+    return RetryPolicy(sleep=fake_sleep, **kwargs), sleeps
+
+
+class TestClassify:
+    def test_categories(self):
+        request = httpx.Request("GET", "https://example.com")
+        not_found = httpx.HTTPStatusError(
+            "404", request=request, response=httpx.Response(404, request=request)
+        )
+        assert classify(ListingNotFoundError("1", 404)) == ErrorCategory.NOT_FOUND
+        assert classify(not_found) == ErrorCategory.NOT_FOUND
+        assert classify(EmptyPayloadError("1")) == ErrorCategory.PARSE
+        assert classify(httpx.ReadTimeout("slow")) == ErrorCategory.TIMEOUT
+        assert classify(asyncio.TimeoutError()) == ErrorCategory.TIMEOUT
+        assert classify(httpx.ConnectError("refused")) == ErrorCategory.NETWORK
+        assert classify(RuntimeError("?")) == ErrorCategory.UNKNOWN
+
+
+class TestRetryPolicy:
+    @pytest.mark.asyncio
+    async def test_retries_transient_until_success(self):
+        policy, sleeps = make_policy(max_attempts=3, base_delay_ms=1000)
+        op = Flaky([httpx.ConnectError("x"), EmptyPayloadError("1")])
+
+        assert await policy.run(op, "l-1") == "ok"
+        assert op.calls == 3
+        assert len(sleeps) == 2
+        # Full jitter: each delay within [0, base * 2**(n-1)]
+        assert 0 <= sleeps[0] <= 1.0
+        assert 0 <= sleeps[1] <= 2.0
+
+    @pytest.mark.asyncio
+    async def test_permanent_failure_not_retried(self):
+        policy, sleeps = make_policy(max_attempts=5)
+        op = Flaky([ListingNotFoundError("1", 404)])
+
+        with pytest.raises(ListingNotFoundError):
+            await policy.run(op, "l-1")
+        assert op.calls == 1
+        assert sleeps == []
+
+    @pytest.mark.asyncio
+    async def test_gives_up_after_max_attempts(self):
+        policy, sleeps = make_policy(max_attempts=2)
+        op = Flaky([httpx.ReadTimeout("a"), httpx.ReadTimeout("b"), httpx.ReadTimeout("c")])
+
+        with pytest.raises(httpx.ReadTimeout):
+            await policy.run(op, "l-1")
+        assert op.calls == 2
+        assert len(sleeps) == 1
+
+    def test_backoff_is_capped(self):
+        policy, _ = make_policy(base_delay_ms=1000, max_delay_ms=4000)
+        assert all(policy.backoff(10) <= 4.0 for _ in range(100))
+
+
+class TestCircuitBreaker:
+    def test_opens_when_failure_ratio_reached(self):
+        breaker = CircuitBreaker(window=4, failure_ratio=0.5, min_samples=4)
+        breaker.record_success()
+        breaker.record_failure()
+        breaker.record_success()
+        assert breaker.state is BreakerState.CLOSED
+        breaker.record_failure()
+        assert breaker.state is BreakerState.OPEN
+        assert breaker.times_opened == 1
+
+    @pytest.mark.asyncio
+    async def test_pauses_callers_then_probes(self):
+        breaker = CircuitBreaker(window=2, failure_ratio=1.0, min_samples=2, cooldown_seconds=0.05)
+        breaker.record_failure()
+        breaker.record_failure()
+        assert breaker.state is BreakerState.OPEN
+
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        await breaker.wait_until_closed()
+        assert loop.time() - started >= 0.04
+        assert breaker.state is BreakerState.HALF_OPEN
+
+        # Other workers keep waiting while the probe is in flight
+        waiter = asyncio.create_task(breaker.wait_until_closed())
+        await asyncio.sleep(0)
+        assert not waiter.done()
+
+        breaker.record_success()
+        await asyncio.wait_for(waiter, 1.0)
+        assert breaker.state is BreakerState.CLOSED
+
+    @pytest.mark.asyncio
+    async def test_failed_probe_reopens(self):
+        breaker = CircuitBreaker(window=1, failure_ratio=1.0, min_samples=1, cooldown_seconds=0.01)
+        breaker.record_failure()
+        await breaker.wait_until_closed()
+        breaker.record_failure()
+        assert breaker.state is BreakerState.OPEN
+        assert breaker.times_opened == 2
@@ -0,0 +1,43 @@
+from rpaquintoandar.infrastructure.browser.route_blocker import (
+    TYPICAL_RESOURCE_BYTES,
+    RouteBlocker,
+)
+from rpaquintoandar.infrastructure.config.settings_loader import BrowserSettings
+
+
+class TestRouteBlocker:
+    def test_blocks_heavy_resource_types(self):
+        blocker = RouteBlocker(BrowserSettings())
+        url = "https://www.quintoandar.com.br/img/med/photo.jpg"
+
+        assert blocker.should_block("image", url) is True
+        assert blocker.should_block("font", url) is True
+
+    def test_allows_first_party_document_and_api(self):
+        blocker = RouteBlocker(BrowserSettings())
+
+        assert blocker.should_block("document", "https://www.quintoandar.com.br/imovel/1") is False
+        assert (
+            blocker.should_block(
+                "xhr", "https://apigw.prod.quintoandar.com.br/house-listing-search/v2/search/coordinates"
+            )
+            is False
+        )
+
+    def test_blocks_third_party_and_denylisted_hosts(self):
+        blocker = RouteBlocker(BrowserSettings())
+
+        assert blocker.should_block("script", "https://www.googletagmanager.com/gtm.js") is True
+        assert blocker.should_block("script", "https://cdn.example.com/lib.js") is True
+
+    def test_empty_allowlist_only_applies_denylist(self):
+        blocker = RouteBlocker(BrowserSettings(allowed_hosts=[]))
+
+        assert blocker.should_block("script", "https://cdn.example.com/lib.js") is False
+        assert blocker.should_block("script", "https://connect.facebook.net/sdk.js") is True
+
+    def test_estimated_bytes_saved(self):
+        blocker = RouteBlocker(BrowserSettings())
+        blocker.aborted["image"] += 3
+
+        assert blocker.estimated_bytes_saved == 3 * TYPICAL_RESOURCE_BYTES["image"]